@@ -41,7 +41,7 @@ import { Profile, Sandbox } from "./models";
 
 let client: LanguageClient;
 
-function getClientOptions(): LanguageClientOptions {
+function getClientOptions(storagePath?: string): LanguageClientOptions {
     return {
         // Register the server for plain text documents
         documentSelector: [
@@ -51,11 +51,15 @@ function getClientOptions(): LanguageClientOptions {
         synchronize: {
             // Notify the server about file changes to '.yaml files contain in the workspace
             fileEvents: workspace.createFileSystemWatcher("**/*.yaml"),
+            // Notify the server about changes of the extension settings
+            configurationSection: "torque",
         },
+        // The server keeps its index of workspace resources there
+        initializationOptions: { storagePath },
     };
 }
 
-function startLangServerTCP(addr: number): LanguageClient {
+function startLangServerTCP(addr: number, storagePath?: string): LanguageClient {
     const serverOptions: ServerOptions = () => {
         return new Promise((resolve /*, reject */) => {
             const clientSocket = new net.Socket();
@@ -71,21 +75,22 @@ function startLangServerTCP(addr: number): LanguageClient {
     return new LanguageClient(
         `tcp lang server (port ${addr})`,
         serverOptions,
-        getClientOptions()
+        getClientOptions(storagePath)
     );
 }
 
 function startLangServer(
     command: string,
     args: string[],
-    cwd: string
+    cwd: string,
+    storagePath?: string
 ): LanguageClient {
     const serverOptions: ServerOptions = {
         args,
         command,
         options: { cwd },
     };
-    return new LanguageClient(command, serverOptions, getClientOptions());
+    return new LanguageClient(command, serverOptions, getClientOptions(storagePath));
 }
 
 async function activateYamlFeatures(context: ExtensionContext) {
@@ -94,15 +99,17 @@ async function activateYamlFeatures(context: ExtensionContext) {
 }
 
 export async function activate(context: ExtensionContext) {
+    const storagePath = context.storageUri?.fsPath;
+
     if (context.extensionMode === ExtensionMode.Development) {
         // Development - Run the server manually
-        client = startLangServerTCP(2087);
+        client = startLangServerTCP(2087, storagePath);
     } else {
         // Production - Client is going to run the server (for use within `.vsix` package)
         const cwd = path.join(__dirname, "..", "out");
         
         const python = await installLSWithProgress(context);
-        client = startLangServer(python, ["-m", "server"], cwd);
+        client = startLangServer(python, ["-m", "server"], cwd, storagePath);
     }
 
     context.subscriptions.push(client.start());
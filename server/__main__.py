@@ -1,9 +1,13 @@
 import argparse
 import logging
+import os
+import tracemalloc
 
 from .server import torque_ls
 
-logging.basicConfig(filename="torque_ls.log", level=logging.INFO, filemode="w")
+# seconds during which the server is profiled from its start, a
+# tracemalloc snapshot is also taken if PYTHONTRACEMALLOC is set
+PROFILE_STARTUP_ENV = "TORQUE_LS_PROFILE_STARTUP"
 
 
 def add_arguments(parser):
@@ -17,10 +21,23 @@ def add_arguments(parser):
 
 
 def main():
+    # configured here and not on import, since worker processes
+    # import this module as well and must not truncate the log
+    logging.basicConfig(filename="torque_ls.log", level=logging.INFO, filemode="w")
+
     parser = argparse.ArgumentParser()
     add_arguments(parser)
     args = parser.parse_args()
 
+    profile_startup = os.environ.get(PROFILE_STARTUP_ENV, "")
+    if profile_startup:
+        try:
+            torque_ls.start_profiling(
+                duration=float(profile_startup), memory=tracemalloc.is_tracing()
+            )
+        except ValueError:
+            logging.warning(f"Invalid {PROFILE_STARTUP_ENV}: '{profile_startup}'")
+
     if args.tcp:
         torque_ls.start_tcp(args.host, args.port)
     else:
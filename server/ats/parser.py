@@ -1,6 +1,6 @@
-from typing import List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-import yaml
+from server.ats import yaml_loader
 from server.ats.trees.app import AppTree
 from server.ats.trees.blueprint import BlueprintTree
 from server.ats.trees.blueprint_v2 import BlueprintV2Tree
@@ -51,18 +51,43 @@ class ParserError(Exception):
         return f"Parser issue with message '{self.message}' on position {self.start_pos} - {self.end_pos}"
 
 
+class IncrementalParseError(Exception):
+    """Raised when an edit cannot be applied to the existing tree
+    and the whole document has to be parsed again"""
+
+
 class UnprocessedNode(YamlNode):
     def add(self):
         return UnprocessedNode()
 
+    def add_error(self, error: NodeError) -> None:
+        # unknown children are not part of the tree, neither are their errors
+        pass
+
 
 class Parser:
-    def __init__(self, document: str):
+    def __init__(
+        self,
+        document: str,
+        header: Dict[str, Any] = None,
+        root: YamlNode = None,
+        tokens: List[Token] = None,
+    ):
         self.document = self._remove_invalid_characters(document)
-        try:
-            self.tree = self._get_tree()
-        except ValueError as ve:
-            raise ParserError(str(ve), (0,0), (0,0))
+        # tokens scanned from the document can be reused only
+        # if no characters were replaced
+        self.tokens: List[Token] = tokens if tokens and self.document == document else []
+        if root is not None:
+            self.tree = root
+        else:
+            if header is None:
+                if not self.tokens:
+                    self.tokens = yaml_loader.scan(self.document)
+                header = self.read_header(self.document, self.tokens)
+            try:
+                self.tree = self._get_tree(header)
+            except ValueError as ve:
+                raise ParserError(str(ve), (0,0), (0,0))
 
         self.nodes_stack: List[YamlNode] = []
         self.tokens_stack: List[Token] = []
@@ -70,6 +95,16 @@ class Parser:
         self.is_array_item: bool = False
         self.processing_map_element: bool = False
 
+    @staticmethod
+    def read_header(document: str, tokens: List[Token]) -> Dict[str, Any]:
+        """Returns the top-level scalar values of the document the tree is
+        selected by. The first lines of the document are enough when they
+        have both kind and spec_version, otherwise tokens are read"""
+        header = yaml_loader.read_header_lines(document)
+        if "kind" in header and "spec_version" in header:
+            return header
+        return yaml_loader.read_header(tokens)
+
     def _remove_invalid_characters(self, document: str):
         return document.replace("\t", "  ")
 
@@ -147,12 +182,13 @@ class Parser:
         self.nodes_stack.append(child_node)
 
     def _process_token(self, token: Token) -> None:
-        if (
-            self.nodes_stack
-            and isinstance(self.nodes_stack[-1], PropertyNode)
-            and isinstance(token, (KeyToken, BlockEndToken))
-        ):
+        handler = self._token_handlers.get(type(token))
+        if handler is not None:
+            handler(self, token)
 
+    def _close_property(self, token: Token) -> None:
+        """KeyToken and BlockEndToken close the property on top of the stack"""
+        if self.nodes_stack and isinstance(self.nodes_stack[-1], PropertyNode):
             self.nodes_stack[-1].end_pos = self.get_token_end(token)
             self.nodes_stack.pop()
 
@@ -160,326 +196,585 @@ class Parser:
             if isinstance(self.tokens_stack[-1], ValueToken):
                 self.tokens_stack.pop()
 
+    def _process_stream_start(self, token: StreamStartToken) -> None:
         # beginning of document
-        if isinstance(token, StreamStartToken):
-            self.tree.start_pos = self.get_token_start(token)
-            self.tokens_stack.append(token)
-            return
+        self.tree.start_pos = self.get_token_start(token)
+        self.tokens_stack.append(token)
+
+    def _process_stream_end(self, token: StreamEndToken) -> None:
+        self.tree.end_pos = self.get_token_start(token)
+        # since there could be unclosed nodes due to errors
+        # we need to set end_pos for them as well
+        while self.nodes_stack:
+            node: YamlNode = self.nodes_stack.pop()
+            node.end_pos = self.get_token_start(token)
+
+    def _process_block_entry(self, token: BlockEntryToken) -> None:
+        # Check if before we didn't have empty array element
+        if isinstance(self.tokens_stack[-1], BlockEntryToken):
+            extra_token = self.tokens_stack.pop()
+            self._handle_hanging_dash(extra_token)
+
+        if isinstance(self.nodes_stack[-1], MappingNode):
+            # We are processing the first element of array but sequence wasn't created yet
+            val: YamlNode = self.nodes_stack[-1].get_value()
+            val.start_pos = self.get_token_start(token)
+            self.nodes_stack.append(val)
+
+        self.tokens_stack.append(token)
+
+        self.is_array_item = True
+        # last node in stack must implement add() method
+        try:
+            node = self.nodes_stack[-1].add()
+            self.nodes_stack.append(node)
+
+            if isinstance(node, ObjectNode):
+                node.start_pos = self.get_token_end(token)
 
-        if isinstance(token, BlockEntryToken):
-            # Check if before we didn't have empty array element
-            if isinstance(self.tokens_stack[-1], BlockEntryToken):
-                extra_token = self.tokens_stack.pop()
-                self._handle_hanging_dash(extra_token)
+        except Exception:
+            raise ParserError("Wrong structure of document", token=token)
+            # raise Exception(f"Unable to add item to the node's container : {e}")
 
-            if isinstance(self.nodes_stack[-1], MappingNode):
-                # We are processing the first element of array but sequence wasn't created yet
-                val: YamlNode = self.nodes_stack[-1].get_value()
-                val.start_pos = self.get_token_start(token)
-                self.nodes_stack.append(val)
+    def _process_block_mapping_start(self, token: BlockMappingStartToken) -> None:
+        # the beginning of the object or mapping
+        last_node = self.nodes_stack[-1]
 
+        if isinstance(last_node, MappingNode) and not isinstance(
+            self.tokens_stack[-1], BlockEntryToken
+        ):
             self.tokens_stack.append(token)
+            value_node = last_node.get_value()
+            self.nodes_stack.append(value_node)
+            value_node.start_pos = self.get_token_start(token)
+
+            if self.is_array_item:
+                self.is_array_item = False
 
-            self.is_array_item = True
-            # last node in stack must implement add() method
-            try:
-                node = self.nodes_stack[-1].add()
-                self.nodes_stack.append(node)
-
-                if isinstance(node, ObjectNode):
-                    node.start_pos = self.get_token_end(token)
-
-            except Exception:
-                raise ParserError("Wrong structure of document", token=token)
-                # raise Exception(f"Unable to add item to the node's container : {e}")
-
-        if isinstance(token, StreamEndToken):
-            self.tree.end_pos = self.get_token_start(token)
-            # since there could be unclosed nodes due to errors
-            # we need to set end_pos for them as well
-            while self.nodes_stack:
-                node: YamlNode = self.nodes_stack.pop()
-                node.end_pos = self.get_token_start(token)
             return
 
-        # the beginning of the object or mapping
-        if isinstance(token, BlockMappingStartToken):
-            last_node = self.nodes_stack[-1]
+        self.tokens_stack.append(token)
+        last_node.start_pos = self.get_token_start(token)
 
-            if isinstance(last_node, MappingNode) and not isinstance(
-                self.tokens_stack[-1], BlockEntryToken
-            ):
-                self.tokens_stack.append(token)
-                value_node = last_node.get_value()
-                self.nodes_stack.append(value_node)
-                value_node.start_pos = self.get_token_start(token)
+    def _process_block_sequence_start(self, token: BlockSequenceStartToken) -> None:
+        self.tokens_stack.append(token)
 
-                if self.is_array_item:
-                    self.is_array_item = False
+    def _process_block_end(self, token: BlockEndToken) -> None:
+        self._close_property(token)
+        top = self.tokens_stack.pop()
 
-                return
-            
-            self.tokens_stack.append(token)
-            last_node.start_pos = self.get_token_start(token)
+        # Handle sequence with last empty element
+        if isinstance(top, BlockEntryToken):
+            self._handle_hanging_dash(top)
+            top = self.tokens_stack.pop()
 
-        if isinstance(token, BlockSequenceStartToken):
-            self.tokens_stack.append(token)
-            return
+        # TODO: refactor condition
+        if isinstance(
+            top, (BlockMappingStartToken, BlockSequenceStartToken)
+        ) and isinstance(
+            self.tokens_stack[-1], (ValueToken, BlockEntryToken, StreamStartToken)
+        ):
+            node = self.nodes_stack.pop()
+            end_pos = self.get_token_end(token)
+            node.end_pos = end_pos
 
-        if isinstance(token, BlockEndToken):
-            top = self.tokens_stack.pop()
+            if len(self.nodes_stack) > 1 and isinstance(self.nodes_stack[-2], MapNode):
+                self.nodes_stack[-1].end_pos = end_pos
+                self.nodes_stack.pop()
+                self.processing_map_element = False
 
-            # Handle sequence with last empty element
-            if isinstance(top, BlockEntryToken):
-                self._handle_hanging_dash(top)
-                top = self.tokens_stack.pop()
+            self.tokens_stack.pop()
 
-            # TODO: refactor condition
-            if isinstance(
-                top, (BlockMappingStartToken, BlockSequenceStartToken)
-            ) and isinstance(
-                self.tokens_stack[-1], (ValueToken, BlockEntryToken, StreamStartToken)
-            ):
+        elif isinstance(top, ValueToken):
+            if self.is_array_item:
+                # case when mapping didn't have value after ':'
+                # inputs:
+                #   API_PORT: 9090
+                #   PORT:
+
+                # remove last Node and ValueToken and BlockEndToken as well
                 node = self.nodes_stack.pop()
-                end_pos = self.get_token_end(token)
-                node.end_pos = end_pos
-                
-                if len(self.nodes_stack) > 1 and isinstance(self.nodes_stack[-2], MapNode):
-                    self.nodes_stack[-1].end_pos = end_pos
-                    self.nodes_stack.pop()
-                    self.processing_map_element = False
+                node.end_pos = self.get_token_end(token)
+                if not isinstance(
+                    self.tokens_stack[-1],
+                    (BlockMappingStartToken, BlockSequenceStartToken),
+                ):
+                    raise Exception(
+                        "Wrong structure of document"
+                    )  # TODO: provide better message
+                self.tokens_stack.pop()
 
+                if not isinstance(self.tokens_stack[-1], BlockEntryToken):
+                    raise Exception(
+                        "Wrong structure of document"
+                    )  # TODO: provide better message
                 self.tokens_stack.pop()
+                self.is_array_item = False
 
-            elif isinstance(top, ValueToken):
-                if self.is_array_item:
-                    # case when mapping didn't have value after ':'
-                    # inputs:
-                    #   API_PORT: 9090
-                    #   PORT:
-
-                    # remove last Node and ValueToken and BlockEndToken as well
-                    node = self.nodes_stack.pop()
-                    node.end_pos = self.get_token_end(token)
-                    if not isinstance(
-                        self.tokens_stack[-1],
-                        (BlockMappingStartToken, BlockSequenceStartToken),
-                    ):
-                        raise Exception(
-                            "Wrong structure of document"
-                        )  # TODO: provide better message
-                    self.tokens_stack.pop()
+            elif isinstance(self.nodes_stack[-1], (UnprocessedNode, SequenceNode)):
+                # In means that we just finished processing a sequence without indentation
+                # which means document didn't have BlockSequenceStartToken at the beginning of the block
+                # So, this BlockEndToken is related to previous object => we need to remove not only the
+                # List node but also the previous one
 
-                    if not isinstance(self.tokens_stack[-1], BlockEntryToken):
-                        raise Exception(
-                            "Wrong structure of document"
-                        )  # TODO: provide better message
-                    self.tokens_stack.pop()
-                    self.is_array_item = False
-
-                elif isinstance(self.nodes_stack[-1], (UnprocessedNode, SequenceNode)):
-                    # In means that we just finished processing a sequence without indentation
-                    # which means document didn't have BlockSequenceStartToken at the beginning of the block
-                    # So, this BlockEndToken is related to previous object => we need to remove not only the
-                    # List node but also the previous one
-
-                    # first remove sequence node from stack
-                    seq_node = self.nodes_stack.pop()
-                    # in this case it's ok the end pos will be the same for both objects
-                    seq_node.end_pos = self.get_token_end(token)
-
-                    # check if we have property on top
-                    if isinstance(self.nodes_stack[-1], PropertyNode):
-                        self.nodes_stack[-1].end_pos = self.get_token_end(token)
-                        self.nodes_stack.pop()
-
-                    # then check if after ValueToken removal we have any start token on the top of the tokens stack
-                    if not isinstance(
-                        self.tokens_stack[-1],
-                        (BlockMappingStartToken, BlockSequenceStartToken),
-                    ):
-                        raise Exception(
-                            "Wrong structure of document"
-                        )  # TODO: provide better message
-
-                    # and remove it from the token stack
-                    self.tokens_stack.pop()
-                    # and node itself as well
-                    prev_node = self.nodes_stack.pop()
-                    prev_node.end_pos = self.get_token_end(token)
-
-                    if isinstance(self.tokens_stack[-1], (ValueToken, BlockEntryToken)):
-                        # remove value token opening it
-                        self.tokens_stack.pop()
-
-                else:
-                    # We expected a value for property inside object but it wasn't found after ValueToken
-                    # It means BlockEndToken closes the parent
-                    # Close expected node
-                    node = self.nodes_stack.pop()
-                    node.end_pos = self.get_token_end(token)
-                    # Close parent node
+                # first remove sequence node from stack
+                seq_node = self.nodes_stack.pop()
+                # in this case it's ok the end pos will be the same for both objects
+                seq_node.end_pos = self.get_token_end(token)
+
+                # check if we have property on top
+                if isinstance(self.nodes_stack[-1], PropertyNode):
                     self.nodes_stack[-1].end_pos = self.get_token_end(token)
                     self.nodes_stack.pop()
 
-        if isinstance(token, KeyToken):
-            # if sequence doesnt have indentation => there is no BlockEndToken at the end
-            # and in such case KeyToken will go just after the ValueToken opening the sequence
-            # It also covers issues when object has empty property
-            if isinstance(self.tokens_stack[-1], ValueToken):
-                # in this case we need first correctly finalize sequence node
-                node = self.nodes_stack.pop()
-                node.end_pos = self.get_token_start(token)
-                self.tokens_stack.pop()  # remove ValueToken
+                # then check if after ValueToken removal we have any start token on the top of the tokens stack
+                if not isinstance(
+                    self.tokens_stack[-1],
+                    (BlockMappingStartToken, BlockSequenceStartToken),
+                ):
+                    raise Exception(
+                        "Wrong structure of document"
+                    )  # TODO: provide better message
 
-                # and also handle property if exist
-                if isinstance(self.nodes_stack[-1], PropertyNode):
-                    prop = self.nodes_stack.pop()
-                    prop.end_pos = self.get_token_end(token)
+                # and remove it from the token stack
+                self.tokens_stack.pop()
+                # and node itself as well
+                prev_node = self.nodes_stack.pop()
+                prev_node.end_pos = self.get_token_end(token)
 
-            # Case when key followed after sequence with no indentation
-            # and the last element of this sequence was empty
-            if self.is_array_item and isinstance(
-                self.tokens_stack[-1], BlockEntryToken
-            ):
-                self._handle_hanging_dash(self.tokens_stack[-1])
-                self.tokens_stack.pop()  # remove BlockEntryToken
-                node = self.nodes_stack.pop()  # remove sequence
+                if isinstance(self.tokens_stack[-1], (ValueToken, BlockEntryToken)):
+                    # remove value token opening it
+                    self.tokens_stack.pop()
+
+            else:
+                # We expected a value for property inside object but it wasn't found after ValueToken
+                # It means BlockEndToken closes the parent
+                # Close expected node
+                node = self.nodes_stack.pop()
                 node.end_pos = self.get_token_end(token)
+                # Close parent node
+                self.nodes_stack[-1].end_pos = self.get_token_end(token)
+                self.nodes_stack.pop()
 
-                if isinstance(self.tokens_stack[-1], ValueToken):
-                    self.tokens_stack.pop()
+    def _process_key(self, token: KeyToken) -> None:
+        self._close_property(token)
+        # if sequence doesnt have indentation => there is no BlockEndToken at the end
+        # and in such case KeyToken will go just after the ValueToken opening the sequence
+        # It also covers issues when object has empty property
+        if isinstance(self.tokens_stack[-1], ValueToken):
+            # in this case we need first correctly finalize sequence node
+            node = self.nodes_stack.pop()
+            node.end_pos = self.get_token_start(token)
+            self.tokens_stack.pop()  # remove ValueToken
+
+            # and also handle property if exist
+            if isinstance(self.nodes_stack[-1], PropertyNode):
+                prop = self.nodes_stack.pop()
+                prop.end_pos = self.get_token_end(token)
+
+        # Case when key followed after sequence with no indentation
+        # and the last element of this sequence was empty
+        if self.is_array_item and isinstance(self.tokens_stack[-1], BlockEntryToken):
+            self._handle_hanging_dash(self.tokens_stack[-1])
+            self.tokens_stack.pop()  # remove BlockEntryToken
+            node = self.nodes_stack.pop()  # remove sequence
+            node.end_pos = self.get_token_end(token)
 
-                # and also handle property if exist
-                if isinstance(self.nodes_stack[-1], PropertyNode):
-                    prop = self.nodes_stack.pop()
-                    prop.end_pos = self.get_token_end(token)
+            if isinstance(self.tokens_stack[-1], ValueToken):
+                self.tokens_stack.pop()
 
-            if isinstance(self.nodes_stack[-1], MapNode):
-                mapping = self.nodes_stack[-1].add()
-                self.nodes_stack.append(mapping)
-                mapping.start_pos = self.get_token_start(token)
-                self.processing_map_element = True
+            # and also handle property if exist
+            if isinstance(self.nodes_stack[-1], PropertyNode):
+                prop = self.nodes_stack.pop()
+                prop.end_pos = self.get_token_end(token)
+
+        if isinstance(self.nodes_stack[-1], MapNode):
+            mapping = self.nodes_stack[-1].add()
+            self.nodes_stack.append(mapping)
+            mapping.start_pos = self.get_token_start(token)
+            self.processing_map_element = True
+
+        self.tokens_stack.append(token)
+
+    def _process_value(self, token: ValueToken) -> None:
+        self.tokens_stack.append(token)
+
+    def _process_scalar(self, token: ScalarToken) -> None:
+        # scalar is either a value or a key (or an element of sequence)
+        # depending on the token opening it
+        top_type = type(self.tokens_stack[-1])
+        if top_type is ValueToken:
+            self._process_value_scalar(token)
+        elif top_type is KeyToken or top_type is BlockEntryToken:
+            self._process_key_scalar(token)
+
+    def _process_value_scalar(self, token: ScalarToken) -> None:
+        node = self.nodes_stack[-1]
+        if isinstance(node, UnprocessedNode):
+            self.nodes_stack.pop()
+            self.tokens_stack.pop()
+            return
 
-            self.tokens_stack.append(token)
+        if not isinstance(node, MappingNode):
+            raise ParserError(message="Expected mapping value here", token=token)
+        try:
+            value_node = node.get_value(expected_type=TextNode)
+        except ValueError:
+            raise ParserError(
+                message="Scalar cannot be accepted here. Object expected",
+                token=token,
+            )
+        self.nodes_stack.append(value_node)
+
+        self._process_scalar_token(token)
+        self.tokens_stack.pop()
+
+        if self.is_array_item:
+            self.is_array_item = False
+
+    def _process_key_scalar(self, token: ScalarToken) -> None:
+        node = self.nodes_stack[-1]
+
+        if not self.is_array_item:
+            if isinstance(node, MappingNode):
+                key_node = node.get_key()
+                self.nodes_stack.append(key_node)
+                self._process_scalar_token(token)
+                self.tokens_stack.pop()
+            else:
+                self._process_object_child(token)
             return
 
-        if isinstance(token, ValueToken):
-            self.tokens_stack.append(token)
+        if isinstance(node, UnprocessedNode) and isinstance(
+            self.tokens_stack[-1], BlockEntryToken
+        ):
+            self.nodes_stack.pop()
+            self.is_array_item = False
+            self.tokens_stack.pop()
             return
 
-        if isinstance(token, ScalarToken) and isinstance(
-            self.tokens_stack[-1], ValueToken
+        # process object first
+        if not isinstance(node, (MappingNode, TextNode)) and isinstance(
+            self.tokens_stack[-1], KeyToken
         ):
-            node = self.nodes_stack[-1]
-            if isinstance(node, UnprocessedNode):
-                self.nodes_stack.pop()
-                self.tokens_stack.pop()
-                return
+            self.is_array_item = False
+            self._process_object_child(token)
+            return
 
-            if not isinstance(node, MappingNode):
-                raise ParserError(message="Expected mapping value here", token=token)
-            try:
-                value_node = node.get_value(expected_type=TextNode)
-            except ValueError:
-                raise ParserError(
-                    message="Scalar cannot be accepted here. Object expected",
-                    token=token,
-                )
-            self.nodes_stack.append(value_node)
+        if isinstance(node, MappingNode):
+            key_node = node.get_key()
+            self.nodes_stack.append(key_node)
+
+        if isinstance(self.tokens_stack[-1], BlockEntryToken):
+            # case when element in sequence doesn't have value and colon:
+            # inputs:
+            #   - A
+            #   - B
+            last_node: YamlNode = self.nodes_stack[-1]  # store TextNode before deleting
+            if last_node.get_shortened_form_property() is not None:
+                last_node.end_pos = self.get_token_end(token)
+                _ = self.nodes_stack.pop()
+                self.nodes_stack.append(last_node.get_shortened_form_property())
 
             self._process_scalar_token(token)
-            self.tokens_stack.pop()
 
-            if self.is_array_item:
-                self.is_array_item = False
-            return
+            self.nodes_stack[-1].end_pos = last_node.end_pos
+            self.nodes_stack[-1].start_pos = last_node.start_pos
 
-        if isinstance(token, ScalarToken) and isinstance(
-            self.tokens_stack[-1], (KeyToken, BlockEntryToken)
-        ):
-            node = self.nodes_stack[-1]
+            if isinstance(node, MappingNode):
+                # Sequence was processed as a list of Mapping Nodes
+                _ = self.nodes_stack.pop()
 
-            if not self.is_array_item:
-                if isinstance(node, MappingNode):
-                    key_node = node.get_key()
-                    self.nodes_stack.append(key_node)
-                    self._process_scalar_token(token)
-                    self.tokens_stack.pop()
-                else:
-                    self._process_object_child(token)
-                return
-            
-            else:
-                if isinstance(node, UnprocessedNode) and isinstance(
-                    self.tokens_stack[-1], BlockEntryToken
-                ):
-                    self.nodes_stack.pop()
-                    self.is_array_item = False
-                    self.tokens_stack.pop()
-                    return
+            self.is_array_item = False
 
-                # process object first
-                if not isinstance(node, (MappingNode, TextNode)) and isinstance(self.tokens_stack[-1], KeyToken):
-                    self.is_array_item = False
-                    self._process_object_child(token)
-                    return
+        else:
+            self._process_scalar_token(token)
 
-                if isinstance(node, MappingNode):
-                    key_node = node.get_key()
-                    self.nodes_stack.append(key_node)
+        self.tokens_stack.pop()
+
+    # the parser is a state machine driven by the type of the token and the
+    # tokens and nodes on top of the stacks, other tokens are ignored
+    _token_handlers = {
+        StreamStartToken: _process_stream_start,
+        StreamEndToken: _process_stream_end,
+        BlockEntryToken: _process_block_entry,
+        BlockMappingStartToken: _process_block_mapping_start,
+        BlockSequenceStartToken: _process_block_sequence_start,
+        BlockEndToken: _process_block_end,
+        KeyToken: _process_key,
+        ValueToken: _process_value,
+        ScalarToken: _process_scalar,
+    }
 
-                if isinstance(self.tokens_stack[-1], BlockEntryToken):
-                    # case when element in sequence doesn't have value and colon:
-                    # inputs:
-                    #   - A
-                    #   - B
-                    last_node: YamlNode = self.nodes_stack[-1]  # store TextNode before deleting
-                    if last_node.get_shortened_form_property() is not None:
-                        last_node.end_pos = self.get_token_end(token)
-                        _ = self.nodes_stack.pop()
-                        self.nodes_stack.append(last_node.get_shortened_form_property())
+    def parse(self) -> BaseTree:
+        if not self.tokens:
+            self.tokens = yaml_loader.scan(self.document)
 
+        if self.tree:
+            self.nodes_stack.append(self.tree)
 
-                    self._process_scalar_token(token)
+            handlers = self._token_handlers
+            for token in self.tokens:
+                handler = handlers.get(type(token))
+                if handler is not None:
+                    handler(self, token)
 
-                    self.nodes_stack[-1].end_pos = last_node.end_pos
-                    self.nodes_stack[-1].start_pos = last_node.start_pos
+        return self.tree
 
-                    if isinstance(node, MappingNode):
-                        # Sequence was processed as a list of Mapping Nodes
-                        _ = self.nodes_stack.pop()
+    @classmethod
+    def reparse(
+        cls,
+        tree: BaseTree,
+        old_document: str,
+        document: str,
+        start_line: int,
+        end_line: int,
+    ) -> BaseTree:
+        """Updates the tree of old_document after its lines from start_line
+        to end_line (inclusive) were replaced, resulting in document.
+
+        Only the smallest block containing the edit is tokenized and parsed
+        again. Its subtree is spliced into the tree and the positions of
+        the nodes located after the block are shifted.
+        Raises IncrementalParseError if the edit cannot be applied locally"""
+        if "\t" in document or "\r" in document or "\t" in old_document:
+            raise IncrementalParseError("Unsupported characters in document")
+
+        old_lines = old_document.split("\n")
+        lines = document.split("\n")
+        delta = len(lines) - len(old_lines)
 
-                    self.is_array_item = False
+        if (
+            start_line > end_line
+            or end_line >= len(old_lines)
+            or old_lines[:start_line] != lines[:start_line]
+            or old_lines[end_line + 1 :] != lines[end_line + 1 + delta :]
+        ):
+            raise IncrementalParseError("Edit does not match the documents")
 
-                else:
-                    self._process_scalar_token(token)
+        found = cls._find_edited_block(tree, start_line, end_line, old_lines)
+        if found is None:
+            raise IncrementalParseError("Edit is not located inside a block")
 
-                self.tokens_stack.pop()
+        mapping, old_block_end = found
+        key_line, key_col = mapping.key.start_pos
+        block_end = cls._get_block_end(lines, key_line, key_col)
 
-    def parse(self) -> BaseTree:
-        data = yaml.scan(self.document, Loader=yaml.FullLoader)
+        if block_end != old_block_end + delta:
+            raise IncrementalParseError("Edit changes the structure of document")
 
-        if self.tree:
-            self.nodes_stack.append(self.tree)
+        old_value: YamlNode = mapping.value
+        root, errors = cls._parse_block(type(old_value), lines, key_line, block_end)
 
-            for token in data:
-                self._process_token(token)
+        # positions of the first token after the block
+        old_next_pos = cls._get_next_token_pos(old_lines, old_block_end)
+        next_pos = cls._get_next_token_pos(lines, block_end)
+        sub_end = (block_end + 1, 0)
+        cls._move_positions(
+            root, errors, lambda pos: next_pos if pos == sub_end else pos
+        )
 
-        return self.tree
+        if old_block_end + 1 < len(old_lines):
+            if delta:
+                cls._move_positions(
+                    tree,
+                    tree.errors,
+                    lambda pos: (pos[0] + delta, pos[1])
+                    if pos[0] > old_block_end
+                    else pos,
+                    skip=old_value,
+                )
+        elif old_next_pos != next_pos:
+            cls._move_positions(
+                tree,
+                tree.errors,
+                lambda pos: next_pos if pos == old_next_pos else pos,
+                skip=old_value,
+            )
+
+        root.parent = old_value.parent
+        mapping.value = root
+        cls._replace_errors(tree, errors, old_value, (key_line + 1, 0))
+
+        return tree
+
+    @classmethod
+    def _find_edited_block(
+        cls, node: YamlNode, start_line: int, end_line: int, lines: List[str]
+    ) -> Optional[Tuple[MappingNode, int]]:
+        """Returns the deepest mapping which value is a block containing
+        the edited lines and the last line of this block"""
+        for child in node.get_children():
+            if (
+                not isinstance(child, YamlNode)
+                or child.start_pos is None
+                or child.end_pos is None
+                or child.start_pos[0] > start_line
+                or child.end_pos[0] < end_line
+            ):
+                continue
+
+            found = cls._find_edited_block(child, start_line, end_line, lines)
+            if found is not None:
+                return found
+
+            if (
+                isinstance(child, MappingNode)
+                and child.key is not None
+                and child.key.start_pos is not None
+                and child.key.start_pos[0] < start_line
+                and isinstance(child.value, (ObjectNode, SequenceNode))
+                and child.value.start_pos is not None
+                # block must start on its own line with bigger indentation
+                and child.value.start_pos[0] > child.key.start_pos[0]
+                and child.value.start_pos[1] > child.key.start_pos[1]
+            ):
+                block_end = cls._get_block_end(lines, *child.key.start_pos)
+                if end_line <= block_end:
+                    return child, block_end
 
-    def _get_tree(self) -> BaseTree:
+        return None
+
+    @staticmethod
+    def _get_block_end(lines: List[str], key_line: int, key_col: int) -> int:
+        """Returns the last line of the block nested in the key.
+        The block ends before the first line (not blank or comment)
+        which indentation is not bigger than the key's column"""
+        for i in range(key_line + 1, len(lines)):
+            stripped = lines[i].lstrip(" ")
+            if not stripped or stripped.startswith("#"):
+                continue
+            if len(lines[i]) - len(stripped) <= key_col:
+                return i - 1
+
+        return len(lines) - 1
+
+    @staticmethod
+    def _get_next_token_pos(lines: List[str], block_end: int) -> Tuple[int, int]:
+        if block_end + 1 < len(lines):
+            line = lines[block_end + 1]
+            return block_end + 1, len(line) - len(line.lstrip(" "))
+
+        # end of stream
+        return len(lines) - 1, len(lines[-1])
+
+    @classmethod
+    def _parse_block(
+        cls, node_type: type, lines: List[str], key_line: int, block_end: int
+    ) -> Tuple[YamlNode, List[NodeError]]:
+        # block is parsed as a separate document with the same
+        # line numbers and columns it has in the original one,
+        # its errors are collected by a tree of its own
+        block = "\n" * (key_line + 1) + "\n".join(lines[key_line + 1 : block_end + 1])
+        block += "\n"
+
+        expected_token = (
+            BlockSequenceStartToken
+            if issubclass(node_type, SequenceNode)
+            and not issubclass(node_type, MapNode)
+            else BlockMappingStartToken
+        )
+
+        try:
+            sink = BaseTree()
+            parser = cls(block, root=node_type(parent=sink))
+            parser.tokens = yaml_loader.scan(parser.document)
+            # make sure the block is valid yaml
+            yaml_loader.check(parser.document, parser.tokens)
+
+            if len(parser.tokens) < 2 or not isinstance(
+                parser.tokens[1], expected_token
+            ):
+                raise IncrementalParseError("Block has unexpected type")
+
+            parser.nodes_stack.append(parser.tree)
+            parser._process_token(parser.tokens[0])
+            # the block starts with its first token, not with the stream
+            parser.tree.start_pos = cls.get_token_start(parser.tokens[1])
+
+            for token in parser.tokens[1:-1]:
+                parser._process_token(token)
+
+            # the block must be closed by its own tokens, otherwise the
+            # parsing state would depend on the rest of the document
+            if parser.nodes_stack or parser.tokens_stack or parser.is_array_item:
+                raise IncrementalParseError("Block is not closed properly")
+
+            parser._process_token(parser.tokens[-1])
+
+        except IncrementalParseError:
+            raise
+        except Exception as e:
+            raise IncrementalParseError(f"Unable to parse block: {e}") from e
+
+        return parser.tree, sink.errors
+
+    @classmethod
+    def _move_positions(
+        cls,
+        tree: YamlNode,
+        errors: List[NodeError],
+        move: Callable[[Tuple[int, int]], Tuple[int, int]],
+        skip: YamlNode = None,
+    ) -> None:
+        """Applies move function to positions of all nodes in the tree
+        and of the errors except the ones of the skipped subtree"""
+        nodes = [tree]
+
+        while nodes:
+            node = nodes.pop()
+            if node is skip or not isinstance(node, YamlNode):
+                continue
+
+            if node.start_pos is not None:
+                node.start_pos = move(node.start_pos)
+            if node.end_pos is not None:
+                node.end_pos = move(node.end_pos)
+
+            nodes.extend(node.get_children())
+
+        for error in errors:
+            if skip is None or not cls._is_inside(error.node, skip):
+                error.start_pos = move(error.start_pos)
+                error.end_pos = move(error.end_pos)
+
+    @classmethod
+    def _replace_errors(
+        cls,
+        tree: BaseTree,
+        new_errors: List[NodeError],
+        old_node: YamlNode,
+        block_start: Tuple[int, int],
+    ) -> None:
+        """Replaces errors of the old subtree in the errors of the tree
+        with the new ones keeping the order of the document"""
+        errors = [e for e in tree.errors if not cls._is_inside(e.node, old_node)]
+        index = next(
+            (i for i, e in enumerate(errors) if e.start_pos >= block_start),
+            len(errors),
+        )
+        errors[index:index] = new_errors
+        tree.errors[:] = errors
+
+    @staticmethod
+    def _is_inside(node: Optional[YamlNode], ancestor: YamlNode) -> bool:
+        while node is not None:
+            if node is ancestor:
+                return True
+            node = node.parent
+        return False
+
+    def _get_tree(self, header: Dict[str, Any]) -> BaseTree:
         trees = {
             "application": AppTree,
             "blueprint": BlueprintTree,
             "TerraForm": ServiceTree,
         }
 
-        yaml_obj = yaml.load(self.document, Loader=yaml.FullLoader)
-        spec_version = yaml_obj.get("spec_version", None)
+        spec_version = header.get("spec_version", None)
 
         if spec_version == 1:
-            doc_type = yaml_obj.get("kind", "")
+            doc_type = header.get("kind", "")
             if doc_type not in trees:
                 raise ValueError(
                     f"Unable to initialize tree from document kind '{doc_type}'"
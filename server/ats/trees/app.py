@@ -1,5 +1,4 @@
 from abc import ABC
-from dataclasses import dataclass
 
 from server.ats.trees.common import (
     BaseTree,
@@ -9,27 +8,28 @@ from server.ats.trees.common import (
     SequenceNode,
     TextNode,
     TreeWithOutputs,
+    node_dataclass,
 )
 
 
-@dataclass
+@node_dataclass
 class DebuggingNode(ObjectNode):
     allow_direct_access: ScalarNode = None
     connection_protocol: ScalarNode = None
 
 
-@dataclass
+@node_dataclass
 class SpecNode(ObjectNode):
-    @dataclass
+    @node_dataclass
     class KubernetesSpecNode(ObjectNode):
         cpu: TextNode = None
         ram: TextNode = None
 
-    @dataclass
+    @node_dataclass
     class AwsSpecNode(ObjectNode):
         instance_type: TextNode = None
 
-    @dataclass
+    @node_dataclass
     class AzureSpecNode(ObjectNode):
         vm_size: TextNode = None
 
@@ -38,7 +38,7 @@ class SpecNode(ObjectNode):
     kubernetes: KubernetesSpecNode = None
 
 
-@dataclass
+@node_dataclass
 class IngressHealthCheckNode(ObjectNode):
     healthy_threshold: ScalarNode = None
     interval: ScalarNode = None
@@ -47,7 +47,8 @@ class IngressHealthCheckNode(ObjectNode):
     timeout: ScalarNode = None
     unhealthy_threshold: ScalarNode = None
 
-    def _get_field_mapping(self) -> {str: str}:
+    @classmethod
+    def _get_field_mapping(cls) -> {str: str}:
         mapping = super()._get_field_mapping()
         mapping.update(
             {
@@ -59,18 +60,19 @@ class IngressHealthCheckNode(ObjectNode):
         return mapping
 
 
-@dataclass
+@node_dataclass
 class PortInfoNode(ObjectNode):
     port: TextNode = None
     path: TextNode = None
 
 
-@dataclass
+@node_dataclass
 class PortInfoInternalNode(PortInfoNode):
     ingress_healthcheck: IngressHealthCheckNode = None
     port_range: TextNode = None
 
-    def _get_field_mapping(self) -> {str: str}:
+    @classmethod
+    def _get_field_mapping(cls) -> {str: str}:
         mapping = super()._get_field_mapping()
         mapping.update(
             {"port-range": "port_range", "ingress-healthcheck": "ingress_healthcheck"}
@@ -78,42 +80,42 @@ class PortInfoInternalNode(PortInfoNode):
         return mapping
 
 
-@dataclass
+@node_dataclass
 class ExternalPortInfoMappingNode(ResourceMappingNode):
     value: PortInfoNode = None
 
 
-@dataclass
+@node_dataclass
 class InternalPortInfoMappingNode(ResourceMappingNode):
     value: PortInfoInternalNode = None
 
 
-@dataclass
+@node_dataclass
 class InfrastructureNode(ObjectNode):
-    @dataclass
+    @node_dataclass
     class ComputeNode(ObjectNode):
         spec: SpecNode = None
 
-    @dataclass
+    @node_dataclass
     class ConnectivityNode(ObjectNode):
-        @dataclass
+        @node_dataclass
         class ExternalPortsSequenceNode(SequenceNode):
             node_type = ExternalPortInfoMappingNode
 
-        @dataclass
+        @node_dataclass
         class InternalPortsSequenceNode(SequenceNode):
             node_type = InternalPortInfoMappingNode
 
         external: ExternalPortsSequenceNode = None
         internal: InternalPortsSequenceNode = None
 
-    @dataclass
+    @node_dataclass
     class InfraPermissionsNode(ObjectNode):
-        @dataclass
+        @node_dataclass
         class InfraAwsPermissionsNode(ObjectNode):
             iam_instance_profile: TextNode = None
 
-        @dataclass
+        @node_dataclass
         class InfraAzurePermissionsNode(ObjectNode):
             managed_identity_id: TextNode = None
 
@@ -125,17 +127,17 @@ class InfrastructureNode(ObjectNode):
     permissions: InfraPermissionsNode = None
 
 
-@dataclass
+@node_dataclass
 class ConfigurationNode(ObjectNode):
-    @dataclass
+    @node_dataclass
     class InitializationNode(ObjectNode):
         script: ScalarNode = None
 
-    @dataclass
+    @node_dataclass
     class StartNode(InitializationNode):
         command: ScalarNode = None
 
-    @dataclass
+    @node_dataclass
     class HealthcheckNode(InitializationNode):
         timeout: ScalarNode = None
         wait_for_ports: TextNode = None
@@ -145,29 +147,29 @@ class ConfigurationNode(ObjectNode):
     healthcheck: HealthcheckNode = None
 
 
-@dataclass
+@node_dataclass
 class AmiImageNode(ObjectNode):
     id: TextNode = None
     region: ScalarNode = None
     username: TextNode = None
 
 
-@dataclass
+@node_dataclass(mixin=True)
 class AzureImageProps(ABC):
     subscription_id: TextNode = None
     resource_group: TextNode = None
     image: TextNode = None
 
 
-@dataclass
+@node_dataclass
 class AzureImageNode(ObjectNode):
-    @dataclass
+    @node_dataclass
     class AzureGalleryImageNode(AzureImageProps, ObjectNode):
         shared_image_gallery: TextNode = None
         image_definition: TextNode = None
         image_version: TextNode = None
 
-    @dataclass
+    @node_dataclass
     class AzureCustomImageNode(AzureImageProps, ObjectNode):
         image: TextNode = None
 
@@ -178,7 +180,7 @@ class AzureImageNode(ObjectNode):
     custom: TextNode = None
 
 
-@dataclass
+@node_dataclass
 class DockerImageNode(ObjectNode):
     name: TextNode = None
     pull_secret: TextNode = None
@@ -186,24 +188,24 @@ class DockerImageNode(ObjectNode):
     username: TextNode = None
 
 
-@dataclass
+@node_dataclass
 class AmiSequenceNode(SequenceNode):
     node_type = AmiImageNode
 
 
-@dataclass
+@node_dataclass
 class AzureSequenceNode(SequenceNode):
     node_type = AzureImageNode
 
 
-@dataclass
+@node_dataclass
 class DockerImagesSequence(SequenceNode):
     node_type = DockerImageNode
 
 
-@dataclass
+@node_dataclass
 class SourceNode(ObjectNode):
-    @dataclass
+    @node_dataclass
     class ImageNode(ObjectNode):
         ami: AmiSequenceNode = None
         azure_image: AzureSequenceNode = None
@@ -213,7 +215,7 @@ class SourceNode(ObjectNode):
     os_type: ScalarNode = None
 
 
-@dataclass
+@node_dataclass
 class AppTree(TreeWithOutputs, BaseTree):
     configuration: ConfigurationNode = None
     source: SourceNode = None
@@ -1,4 +1,3 @@
-from dataclasses import dataclass
 from typing import List, Union
 
 from server.ats.trees.common import (
@@ -13,16 +12,17 @@ from server.ats.trees.common import (
     TextMappingSequence,
     TextNode,
     TextNodesSequence,
+    node_dataclass,
 )
 
 
-@dataclass
+@node_dataclass
 class InfrastructureNode(ObjectNode):
-    @dataclass
+    @node_dataclass
     class ConnectivityNode(ObjectNode):
-        @dataclass
+        @node_dataclass
         class VirtualNetwork(ObjectNode):
-            @dataclass
+            @node_dataclass
             class SubnetsNode(ObjectNode):
                 gateway: TextNodesSequence = None
                 management: TextNodesSequence = None
@@ -38,7 +38,7 @@ class InfrastructureNode(ObjectNode):
     connectivity: ConnectivityNode = None
 
 
-@dataclass
+@node_dataclass
 class RuleNode(ObjectNode):
     path: TextNode = None
     host: TextNode = None
@@ -52,9 +52,9 @@ class RuleNode(ObjectNode):
     stickiness: TextNode = None
 
 
-@dataclass
+@node_dataclass
 class ListenerNode(ObjectNode):
-    @dataclass
+    @node_dataclass
     class RulesSequenceNode(SequenceNode):
         node_type = RuleNode
 
@@ -65,9 +65,9 @@ class ListenerNode(ObjectNode):
     rules: RulesSequenceNode = None
 
 
-@dataclass
+@node_dataclass
 class IngressNode(ObjectNode):
-    @dataclass
+    @node_dataclass
     class ListenersSequenceNode(SequenceNode):
         node_type = ListenerNode
 
@@ -75,7 +75,7 @@ class IngressNode(ObjectNode):
     listeners: ListenersSequenceNode = None
 
 
-@dataclass
+@node_dataclass
 class BlueprintFullInputNode(ObjectNode):
     display_style: ScalarNode = None
     description: ScalarNode = None
@@ -84,7 +84,7 @@ class BlueprintFullInputNode(ObjectNode):
     possible_values: ScalarNodesSequence = None
 
 
-@dataclass
+@node_dataclass
 class BlueprintInputNode(MappingNode):
     key: ScalarNode = None
     value: Union[BlueprintFullInputNode, ScalarNode] = None
@@ -105,12 +105,12 @@ class BlueprintInputNode(MappingNode):
         return []
 
 
-@dataclass
+@node_dataclass
 class BlueprintInputsSequence(SequenceNode):
     node_type = BlueprintInputNode
 
 
-@dataclass
+@node_dataclass
 class ServiceResourceNode(ObjectNode):
     input_values: TextMappingSequence = None
     depends_on: ScalarNodesSequence = None
@@ -122,13 +122,13 @@ class ServiceResourceNode(ObjectNode):
         return self._get_seq_nodes("input_values")
 
 
-@dataclass
+@node_dataclass
 class ApplicationResourceNode(ServiceResourceNode):
     target: ScalarNode = None
     instances: TextNode = None  # yes, numeric
 
 
-@dataclass
+@node_dataclass
 class BlueprintResourceMappingNode(MappingNode):
     key: ScalarNode = None
     value: ServiceResourceNode = None
@@ -154,32 +154,32 @@ class BlueprintResourceMappingNode(MappingNode):
         return self.value.get_inputs()
 
 
-@dataclass
+@node_dataclass
 class ApplicationNode(BlueprintResourceMappingNode):
     value: ApplicationResourceNode = None
 
 
-@dataclass
+@node_dataclass
 class ServiceNode(BlueprintResourceMappingNode):
     value: ServiceResourceNode = None
 
 
-@dataclass
+@node_dataclass
 class BlueprintTree(BaseTree):
-    @dataclass
+    @node_dataclass
     class MetadataNode(ObjectNode):
         description: ScalarNode = None
         tags: ScalarMappingsSequence = None
 
-    @dataclass
+    @node_dataclass
     class AppsSequence(SequenceNode):
         node_type = ApplicationNode
 
-    @dataclass
+    @node_dataclass
     class ServicesSequence(SequenceNode):
         node_type = ServiceNode
 
-    @dataclass
+    @node_dataclass
     class DebuggingNode(ObjectNode):
         bastion_availability: ScalarNode = None
         direct_access: ScalarNode = None
@@ -1,5 +1,4 @@
-from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, KeysView, List, Optional
 
 from server.ats.trees.common import (
     BaseTree,
@@ -13,10 +12,11 @@ from server.ats.trees.common import (
     TextMappingSequence,
     TextNode,
     TextNodesSequence,
+    node_dataclass,
 )
 
 
-@dataclass
+@node_dataclass
 class BlueprintV2InputObject(ObjectNode):
     input_type: ScalarNode = None
     display_style: ScalarNode = None
@@ -25,7 +25,8 @@ class BlueprintV2InputObject(ObjectNode):
     sensitive: ScalarNode = None
     allowed_values: ScalarNodesSequence = None
 
-    def _get_field_mapping(self) -> Dict[str, str]:
+    @classmethod
+    def _get_field_mapping(cls) -> Dict[str, str]:
         mapping = super()._get_field_mapping()
         mapping.update(
             {
@@ -37,38 +38,38 @@ class BlueprintV2InputObject(ObjectNode):
         return mapping
 
 
-@dataclass
+@node_dataclass
 class BluetpintV2InputNode(MappingNode):
     key: ScalarNode = None
     value: BlueprintV2InputObject = None
 
 
-@dataclass
+@node_dataclass
 class BlueprintV2OutputObject(ObjectNode):
     value: TextNode = None
     kind: ScalarNode = None
     quick: ScalarNode = None
 
 
-@dataclass
+@node_dataclass
 class BlueprintV2OutputNode(MappingNode):
     key: ScalarNode = None
     value: BlueprintV2OutputObject = None
 
 
-@dataclass
+@node_dataclass
 class ScriptSource(ObjectNode):
     path: ScalarNode = None
     store: ScalarNode = None
 
 
-@dataclass
+@node_dataclass
 class ScriptObject(ObjectNode):
     source: ScriptSource = None
     arguments: TextNode = None
 
 
-@dataclass
+@node_dataclass
 class ScriptOutputsObject(ScriptObject):
     outputs: ScalarNodesSequence = None
 
@@ -76,14 +77,15 @@ class ScriptOutputsObject(ScriptObject):
         return self._get_seq_nodes("outputs")
 
 
-@dataclass
+@node_dataclass
 class GrainSpecScripts(ObjectNode):
     pre_tf_init: ScriptObject = None
     pre_tf_destroy: ScriptObject = None
     post_helm_install: ScriptOutputsObject = None
     post_kubernetes_install: ScriptOutputsObject = None
 
-    def _get_field_mapping(self) -> Dict[str, str]:
+    @classmethod
+    def _get_field_mapping(cls) -> Dict[str, str]:
         mapping = super()._get_field_mapping()
         mapping.update(
             {
@@ -96,7 +98,7 @@ class GrainSpecScripts(ObjectNode):
         return mapping
 
 
-@dataclass
+@node_dataclass
 class CommandObject(ObjectNode):
     command: TextNode = None
     name: ScalarNode = None
@@ -106,14 +108,14 @@ class CommandObject(ObjectNode):
         return self.command
 
 
-@dataclass
+@node_dataclass
 class CommandsSequence(SequenceNode):
     node_type = CommandObject
 
 
-@dataclass
+@node_dataclass
 class ActivitiesObject(ObjectNode):
-    @dataclass
+    @node_dataclass
     class ActivityObject(ObjectNode):
         commands: CommandsSequence = None
 
@@ -121,25 +123,26 @@ class ActivitiesObject(ObjectNode):
     destroy: ActivityObject = None
 
 
-@dataclass
+@node_dataclass
 class SpecSourceNode(ObjectNode):
     store: ScalarNode = None
     path: ScalarNode = None
 
 
-@dataclass
+@node_dataclass
 class SpecSourcesSequence(SequenceNode):
     node_type = SpecSourceNode
 
 
-@dataclass
+@node_dataclass
 class GrainSpecNode(ObjectNode):
-    @dataclass
+    @node_dataclass
     class GrainSpecTag(ObjectNode):
         auto_tag: ScalarNode = None
         disable_tags_for: ScalarNodesSequence = None
 
-        def _get_field_mapping(self) -> Dict[str, str]:
+        @classmethod
+        def _get_field_mapping(cls) -> Dict[str, str]:
             mapping = super()._get_field_mapping()
             mapping.update(
                 {
@@ -149,7 +152,7 @@ class GrainSpecNode(ObjectNode):
             )
             return mapping
 
-    @dataclass
+    @node_dataclass
     class SpecHostNode(ObjectNode):
         region: TextNode = None
         service_account: TextNode = None
@@ -157,7 +160,8 @@ class GrainSpecNode(ObjectNode):
         image: TextNode = None
         kubernetes: TextNode = None
 
-        def _get_field_mapping(self) -> Dict[str, str]:
+        @classmethod
+        def _get_field_mapping(cls) -> Dict[str, str]:
             mapping = super()._get_field_mapping()
             mapping.update(
                 {
@@ -172,7 +176,8 @@ class GrainSpecNode(ObjectNode):
     def get_inputs(self):
         return self._get_seq_nodes("inputs")
 
-    def _get_field_mapping(self) -> Dict[str, str]:
+    @classmethod
+    def _get_field_mapping(cls) -> Dict[str, str]:
         mapping = super()._get_field_mapping()
         mapping.update({"env-vars": "env_vars"})
         return mapping
@@ -194,7 +199,7 @@ class GrainSpecNode(ObjectNode):
     agent: SpecHostNode = None
 
 
-@dataclass
+@node_dataclass
 class GrainObject(ObjectNode):
     kind: ScalarNode = None
     spec: GrainSpecNode = None
@@ -228,7 +233,8 @@ class GrainObject(ObjectNode):
 
         return result
 
-    def _get_field_mapping(self) -> Dict[str, str]:
+    @classmethod
+    def _get_field_mapping(cls) -> Dict[str, str]:
         mapping = super()._get_field_mapping()
         mapping.update(
             {
@@ -239,7 +245,7 @@ class GrainObject(ObjectNode):
         return mapping
 
 
-@dataclass
+@node_dataclass
 class GrainNode(MappingNode):
     key: ScalarNode = None
     value: GrainObject = None
@@ -251,17 +257,17 @@ class GrainNode(MappingNode):
 
 
 # Maps:
-@dataclass
+@node_dataclass
 class GrainsMap(MapNode):
     node_type = GrainNode
 
 
-@dataclass
+@node_dataclass
 class BluetpintV2InputsMap(MapNode):
     node_type = BluetpintV2InputNode
 
 
-@dataclass
+@node_dataclass
 class BlueprintV2OutputsMap(MapNode):
     node_type = BlueprintV2OutputNode
 
@@ -269,7 +275,7 @@ class BlueprintV2OutputsMap(MapNode):
 # The Blueprint Spec2 Tree
 
 
-@dataclass
+@node_dataclass
 class BlueprintV2Tree(BaseTree):
     spec_version: ScalarNode = None
     description: ScalarNode = None
@@ -281,8 +287,17 @@ class BlueprintV2Tree(BaseTree):
     def input_list(self):
         return self._get_seq_nodes("inputs")
 
-    def get_grains_names(self):
-        return [node.key.text for node in self.grains.nodes]
+    def get_grains_names(self) -> KeysView:
+        grains = self._get_map("grains")
+        return grains.get_keys() if grains else {}.keys()
+
+    def get_grain(self, name: str) -> Optional[GrainNode]:
+        grains = self._get_map("grains")
+        return grains.get_mapping_by_key(name) if grains else None
+
+    def get_inputs_names(self) -> KeysView:
+        inputs = self._get_map("inputs")
+        return inputs.get_keys() if inputs else {}.keys()
 
     @property
     def grain_nodes(self):
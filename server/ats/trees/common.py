@@ -1,7 +1,8 @@
 import re
+import sys
 from abc import ABC
-from dataclasses import dataclass, field
-from typing import Any, ClassVar, List, Optional, Tuple
+from dataclasses import dataclass, field, fields
+from typing import Any, ClassVar, Dict, KeysView, List, Optional, Tuple, Union
 
 from pygls.lsp import types
 
@@ -46,21 +47,182 @@ class NodeError(Exception):
     start_pos: Tuple[int, int]
     end_pos: Tuple[int, int]
     message: str
+    # the node the error was added to
+    node: Optional[Any] = field(default=None, compare=False, repr=False)
 
+    def __reduce__(self):
+        # exceptions are unpickled from their args, which are
+        # not set when the error is created with keywords
+        return type(self), (self.start_pos, self.end_pos, self.message, self.node)
 
-@dataclass
+# fields with this metadata are stored in the slots packed into an integer
+PACKED_POSITION = {"packed": True}
+_COL_BITS = 32
+_COL_MASK = (1 << _COL_BITS) - 1
+
+# classes are recreated to get slots, methods calling super() are then
+# fixed by rebinding their __class__ cell which is writable since Python 3.7
+_SLOTS_SUPPORTED = sys.version_info >= (3, 7)
+
+
+class _PackedPosition:
+    """Stores a (line, column) position as a single integer in a slot"""
+
+    __slots__ = ("_get", "_set")
+
+    def __init__(self, slot) -> None:
+        self._get = slot.__get__
+        self._set = slot.__set__
+
+    def __get__(self, node, owner=None):
+        if node is None:
+            return self
+        packed = self._get(node)
+        if packed is None:
+            return None
+        return packed >> _COL_BITS, packed & _COL_MASK
+
+    def __set__(self, node, pos) -> None:
+        self._set(node, pos if pos is None else pos[0] << _COL_BITS | pos[1])
+
+
+class NodeSchema:
+    """Field resolution table of a node class, built once by node_dataclass.
+        fields: names of the dataclass fields
+        children: names of the fields holding child nodes
+        attrs: field names by the names used in documents (including aliases)
+        types: annotated types of the fields
+        members: types of the Union fields
+        allow_vars: allow_vars of the fields holding text nodes
+    """
+
+    def __init__(self, cls: type) -> None:
+        self.fields = tuple(f.name for f in fields(cls))
+        non_child = getattr(cls, "non_child_attributes", ())
+        self.children = tuple(name for name in self.fields if name not in non_child)
+
+        get_mapping = getattr(cls, "_get_field_mapping", None)
+        self.attrs: Dict[str, str] = dict(get_mapping()) if get_mapping else {}
+        self.attrs.update((name, name) for name in self.fields)
+
+        self.types: Dict[str, Any] = {f.name: f.type for f in fields(cls)}
+        self.members: Dict[str, tuple] = {}
+        self.allow_vars: Dict[str, bool] = {}
+        for name, field_type in self.types.items():
+            if getattr(field_type, "__origin__", None) is Union:
+                self.members[name] = field_type.__args__
+            # only node classes have a schema
+            elif "_schema" in getattr(field_type, "__dict__", {}) and issubclass(
+                field_type, TextNode
+            ):
+                self.allow_vars[name] = field_type.allow_vars
+
+        self._resolved: Dict[Tuple[str, Optional[type]], type] = {}
+
+    def resolve(self, name: str, expected: type = None) -> type:
+        """Returns the class a field is initialized with.
+        Union fields are initialized with the first member of the expected
+        type or with the first member if the type is not provided"""
+        try:
+            return self._resolved[name, expected]
+        except KeyError:
+            pass
+
+        field_type = self.types[name]
+        members = self.members.get(name)
+        if expected is not None and expected != field_type:
+            if members:
+                result = next((m for m in members if issubclass(m, expected)), None)
+            elif isinstance(field_type, type) and issubclass(field_type, expected):
+                result = field_type
+            else:
+                raise ValueError(
+                    f"Mapping value cannot be initiated with type '{expected}'"
+                )
+        else:
+            result = members[0] if members else field_type
+
+        self._resolved[name, expected] = result
+        return result
+
+
+def node_dataclass(cls=None, *, mixin: bool = False):
+    """Dataclass decorator of the tree nodes.
+
+    Instances of nodes keep their fields in slots instead of a __dict__.
+    Several bases with slots can't be combined, so mixins keep the __dict__
+    and their fields get slots in the classes they are combined with."""
+
+    def wrap(cls):
+        cls = dataclass(cls)
+        cls._schema = NodeSchema(cls)
+        return _add_slots(cls) if _SLOTS_SUPPORTED and not mixin else cls
+
+    return wrap if cls is None else wrap(cls)
+
+
+def _add_slots(cls: type) -> type:
+    declared = set()
+    for base in cls.__mro__[1:]:
+        declared.update(base.__dict__.get("__slots__", ()))
+
+    cls_dict = dict(cls.__dict__)
+    slots = []
+    packed = []
+    for f in fields(cls):
+        # defaults (also of redeclared fields) would hide the slots
+        cls_dict.pop(f.name, None)
+        name = f"_{f.name}" if f.metadata.get("packed") else f.name
+        if name not in declared:
+            slots.append(name)
+            if name != f.name:
+                packed.append((f.name, name))
+
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+    cls_dict["__slots__"] = tuple(slots)
+
+    new_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    new_cls.__qualname__ = cls.__qualname__
+    for name, slot in packed:
+        setattr(new_cls, name, _PackedPosition(new_cls.__dict__[slot]))
+
+    # zero-argument super() must refer to the new class
+    for value in cls_dict.values():
+        value = getattr(value, "__func__", value)
+        funcs = (
+            [value.fget, value.fset, value.fdel]
+            if isinstance(value, property)
+            else [value]
+        )
+        for func in funcs:
+            for cell in getattr(func, "__closure__", None) or ():
+                try:
+                    if cell.cell_contents is cls:
+                        cell.cell_contents = new_cls
+                except ValueError:  # empty cell
+                    pass
+
+    return new_cls
+
+
+@node_dataclass
 class YamlNode(ABC):
-    non_child_attributes: ClassVar[list] = ["start_pos", "end_pos", "parent", "errors"]
+    non_child_attributes: ClassVar[list] = ["start_pos", "end_pos", "parent"]
+    # set by node_dataclass
+    _schema: ClassVar[NodeSchema]
 
-    start_pos: tuple = None
-    end_pos: tuple = None
+    start_pos: tuple = field(default=None, metadata=PACKED_POSITION)
+    end_pos: tuple = field(default=None, metadata=PACKED_POSITION)
     parent: Optional[Any] = field(compare=False, default=None, repr=False)
-    errors: List[NodeError] = field(default_factory=list)
 
     def add_error(self, error: NodeError) -> None:
-        self.errors.append(error)
-        if self.parent is not None:
-            self.parent.add_error(error)
+        """Adds the error of this node to the errors of its tree"""
+        error.node = self
+        root = self
+        while root.parent is not None:
+            root = root.parent
+        root.errors.append(error)
 
     def accept(self, visitor):
         visitor.visit_node(self)
@@ -72,7 +234,7 @@ class YamlNode(ABC):
         return None
 
 
-@dataclass
+@node_dataclass
 class SequenceNode(YamlNode):
     node_type: ClassVar[type] = YamlNode
 
@@ -90,7 +252,7 @@ class SequenceNode(YamlNode):
         return self.nodes
 
 
-@dataclass
+@node_dataclass
 # Could be extended by VariableNote (for $VAR), PathNode(for artifacts), DoubleQuoted, SingleQuoted etc
 class TextNode(YamlNode):
     allow_vars: ClassVar[bool] = True
@@ -113,6 +275,7 @@ class TextNode(YamlNode):
         pass
 
 
+@node_dataclass
 class ScalarNode(TextNode):
     allow_vars = False
 
@@ -131,7 +294,7 @@ class ScalarNode(TextNode):
             ))
 
 
-@dataclass
+@node_dataclass
 class MappingNode(YamlNode):  # TODO: actually all torque nodes must inherit this
     key: ScalarNode = None
     value: YamlNode = None
@@ -139,7 +302,7 @@ class MappingNode(YamlNode):  # TODO: actually all torque nodes must inherit thi
 
     def get_key(self):
         if self.key is None:
-            key_class = self.__dataclass_fields__["key"].type
+            key_class = self._schema.types["key"]
             self.key = key_class(parent=self)
 
         return self.key
@@ -150,10 +313,7 @@ class MappingNode(YamlNode):  # TODO: actually all torque nodes must inherit thi
         When value has Union typing annotation it will try to initialize it with provided expected_type
         If expected_type is not provided, first type from Union will be used"""
         if self.value is None:
-            value_class = self.__dataclass_fields__["value"].type
-            result_class = self._get_annotated_class(
-                value_class=value_class, expected=expected_type
-            )
+            result_class = self._schema.resolve("value", expected_type)
             self.value = result_class(parent=self.key)
 
         return self.value
@@ -167,47 +327,57 @@ class MappingNode(YamlNode):  # TODO: actually all torque nodes must inherit thi
 
         return children
 
-    def _get_annotated_class(self, value_class: type, expected: type = None) -> type:
-        try:
-            possible_types = value_class.__args__  # check if it's union
-
-        except AttributeError:
-            possible_types = None
-
-        result_class = None
-        if expected is not None and expected != value_class:
-            if possible_types:
-                for pt in possible_types:
-                    if issubclass(pt, expected):
-                        result_class = pt
-                        break
-            elif isinstance(value_class, type) and issubclass(value_class, expected):
-                result_class = value_class
-            else:
-                raise ValueError(
-                    f"Mapping value cannot be initiated with type '{expected}'"
-                )
-
-        else:
-            result_class = value_class if not possible_types else possible_types[0]
 
-        return result_class
+@node_dataclass
+class MapNode(SequenceNode):
+    """Sequence of mappings which are also looked up by their keys.
 
+    Mappings are indexed by key in the order they were added, the first
+    mapping of a repeated key is the one found. Mappings added since the
+    last lookup (their keys are assigned after they are added) are
+    indexed by the next lookup"""
 
-# For now it's just a child of sequence node.
-# will see in the future if we need to have a real map here
-@dataclass
-class MapNode(SequenceNode):
+    non_child_attributes: ClassVar[list] = SequenceNode.non_child_attributes + [
+        "_keys",
+        "_indexed",
+    ]
     node_type: ClassVar[type] = MappingNode
 
-    def get_mapping_by_key(self, key: str ) -> MappingNode:
-        for node in self.nodes:
-            if node.key and node.key.text == key:
-                return node
-        return None 
+    _keys: Dict[str, MappingNode] = field(
+        default=None, compare=False, repr=False
+    )
+    # number of nodes already in the index
+    _indexed: int = field(default=0, compare=False, repr=False)
+
+    def get_mapping_by_key(self, key: str) -> MappingNode:
+        return self._get_index().get(key)
+
+    def get_keys(self) -> KeysView:
+        """Returns the keys of the mappings, without repetitions"""
+        return self._get_index().keys()
+
+    def _get_index(self) -> Dict[str, MappingNode]:
+        nodes = self.nodes
+        if self._keys is None or self._indexed > len(nodes):
+            # nodes were removed
+            self._keys = {}
+            self._indexed = 0
+
+        if self._indexed < len(nodes):
+            keys = self._keys
+            for node in nodes[self._indexed :]:
+                if node.key is not None:
+                    keys.setdefault(node.key.text, node)
+            self._indexed = len(nodes)
 
+        return self._keys
 
+
+@node_dataclass
 class PropertyNode(MappingNode):
+    # set for properties holding text nodes
+    allow_vars: bool = field(default=False, compare=False, repr=False)
+
     @property
     def identifier(self):
         if self.key:
@@ -215,15 +385,17 @@ class PropertyNode(MappingNode):
 
     def get_value(self, expected_type: type = None):
         if self.value is None:
-            value_class = self.parent.__dataclass_fields__[self.identifier].type
-            result_class = self._get_annotated_class(
-                value_class=value_class, expected=expected_type
-            )
+            result_class = self.parent._schema.resolve(self.identifier, expected_type)
             self.value = result_class(parent=self.key)
 
         return self.value
 
     def __getattr__(self, name: str) -> Any:
+        if name.startswith("__"):
+            # special attributes (like the ones looked up by pickle or copy)
+            # must not be resolved through the value
+            raise AttributeError(name)
+
         if self.value is None:
             return None
         val = getattr(self.value, name, None)
@@ -231,8 +403,8 @@ class PropertyNode(MappingNode):
         if val is not None:
             return val
         else:
-            value_class = self.parent.__dataclass_fields__[self.identifier].type
-            if name not in value_class.__dataclass_fields__:
+            value_class = self.parent._schema.types[self.identifier]
+            if name not in value_class._schema.fields:
                 raise AttributeError(
                     f"Value of PropertyNode '{self.identifier}' does not not have attribute '{name}'"
                 )
@@ -240,24 +412,26 @@ class PropertyNode(MappingNode):
             return None
 
 
-@dataclass
+@node_dataclass
 class ObjectNode(YamlNode, ABC):
-    def _get_field_mapping(self) -> {str: str}:
+    @classmethod
+    def _get_field_mapping(cls) -> {str: str}:
+        """Names of fields by their names in documents when they differ,
+        used once to build the schema of the class"""
         return {}
 
     def _check_attr(self, attr_name) -> str:
-        attr = (
-            attr_name
-            if attr_name in self.__dict__
-            else self._get_field_mapping().get(attr_name, None)
-        )
+        attr = self._schema.attrs.get(attr_name)
         if attr is None:
             raise AttributeError(f"There is no attribute with name {attr_name}")
 
         return attr
 
     def __getattr__(self, attr_name) -> Any:
-        attr = self._check_attr(attr_name)  
+        if attr_name.startswith("__"):
+            raise AttributeError(attr_name)
+
+        attr = self._check_attr(attr_name)
         return getattr(self, attr)
 
 
@@ -275,11 +449,10 @@ class ObjectNode(YamlNode, ABC):
             child = PropertyNode(parent=self)
             child.get_key().text = attr
 
-            # Get type of the child according to its annotation
-            child_cls = self.__dataclass_fields__.get(attr).type
-
-            if issubclass(child_cls, TextNode):
-                child.allow_vars = child_cls.allow_vars
+            # text nodes allow variables according to their annotated type
+            allow_vars = self._schema.allow_vars.get(attr)
+            if allow_vars is not None:
+                child.allow_vars = allow_vars
             try:
                 setattr(self, attr, child)
             except Exception:
@@ -290,18 +463,15 @@ class ObjectNode(YamlNode, ABC):
     def get_children(self):
         """Returns all child nodes. Nodes are actually
         attributes which are not excluded and do not equal None"""
-        fields = vars(self)
         return [
-            val
-            for key, val in fields.items()
-            if val and key not in self.non_child_attributes
+            val for val in map(self.__getattribute__, self._schema.children) if val
         ]
 
     def _get_seq_nodes(self, property_name) -> List[Any]:
         if not hasattr(self, property_name):
             raise AttributeError
 
-        if not issubclass(self.__dataclass_fields__[property_name].type, SequenceNode):
+        if not issubclass(self._schema.types[property_name], SequenceNode):
             return ValueError(f"Property '{property_name}' is not sequence")
 
         prop: PropertyNode = getattr(self, property_name, None)
@@ -312,8 +482,16 @@ class ObjectNode(YamlNode, ABC):
         seq: SequenceNode = prop.value
         return seq.nodes
 
+    def _get_map(self, property_name) -> Optional[MapNode]:
+        prop: PropertyNode = getattr(self, property_name, None)
 
-@dataclass
+        if prop is None or prop.value is None:
+            return None
+
+        return prop.value
+
+
+@node_dataclass
 class ScalarNodesSequence(SequenceNode):
     """
     Container for simple text arrays
@@ -323,12 +501,12 @@ class ScalarNodesSequence(SequenceNode):
     node_type = ScalarNode
 
 
-@dataclass
+@node_dataclass
 class TextNodesSequence(SequenceNode):
     node_type = TextNode
 
 
-@dataclass
+@node_dataclass
 class ResourceMappingNode(MappingNode):
     key: ScalarNode = None
 
@@ -337,31 +515,35 @@ class ResourceMappingNode(MappingNode):
         return self.key
 
 
-@dataclass
+@node_dataclass
 class TextMapping(MappingNode):
     key: ScalarNode = None
     value: TextNode = None
     allow_vars = True
 
 
-@dataclass
+@node_dataclass
 class TextMappingSequence(SequenceNode):
     node_type = TextMapping
 
 
-@dataclass
+@node_dataclass
 class ScalarMappingNode(MappingNode):
     key: ScalarNode = None
     value: ScalarNode = None
 
 
-@dataclass
+@node_dataclass
 class ScalarMappingsSequence(SequenceNode):
     node_type = ScalarMappingNode
 
 
-@dataclass
+@node_dataclass
 class BaseTree(ObjectNode):
+    non_child_attributes: ClassVar[list] = YamlNode.non_child_attributes + ["errors"]
+
+    # errors of all the nodes of the tree, in the order they were added
+    errors: List[NodeError] = field(default_factory=list)
     inputs: ScalarMappingsSequence = None
     kind: ScalarNode = None
     spec_version: ScalarNode = None
@@ -370,7 +552,7 @@ class BaseTree(ObjectNode):
         return self._get_seq_nodes("inputs")
 
 
-@dataclass
+@node_dataclass(mixin=True)
 class TreeWithOutputs(ObjectNode, ABC):
     outputs: ScalarNodesSequence = None
 
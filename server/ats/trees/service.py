@@ -1,5 +1,3 @@
-from dataclasses import dataclass
-
 from server.ats.trees.common import (
     BaseTree,
     ObjectNode,
@@ -8,17 +6,18 @@ from server.ats.trees.common import (
     TextMappingSequence,
     TextNode,
     TreeWithOutputs,
+    node_dataclass,
 )
 
 
-@dataclass
+@node_dataclass
 class ModuleNode(ObjectNode):
     source: TextNode = None
     enable_auto_tagging: ScalarNode = None
     exclude_from_tagging: ScalarNodesSequence = None
 
 
-@dataclass
+@node_dataclass
 class VariablesNode(ObjectNode):
     var_file: ScalarNode = None
     values: TextMappingSequence = None
@@ -27,13 +26,13 @@ class VariablesNode(ObjectNode):
         return self._get_seq_nodes("values")
 
 
-@dataclass
+@node_dataclass
 class PermissionsNode(ObjectNode):
-    @dataclass
+    @node_dataclass
     class AzurePermissionsNode(ObjectNode):
         managed_identity_id: TextNode = None
 
-    @dataclass
+    @node_dataclass
     class AwsPermissionsNode(ObjectNode):
         role_arn: TextNode = None
         external_id: TextNode = None
@@ -42,7 +41,7 @@ class PermissionsNode(ObjectNode):
     aws: AwsPermissionsNode = None
 
 
-@dataclass
+@node_dataclass
 class ServiceTree(BaseTree, TreeWithOutputs):
     module: ModuleNode = None
     terraform_version: TextNode = None
@@ -0,0 +1,58 @@
+import re
+from typing import Dict, List, Set, Tuple
+
+from server.ats.trees.common import TextNode, YamlNode
+
+# variables of spec 1 as validated: ${name} anywhere or $name as the whole text
+_VARIABLE = re.compile(r"\$\{.+?\}|^\$.+?$")
+# names of spec 1 variables used anywhere in the text
+_USED_NAME = re.compile(r"\$\{([^{}]*?)\}|\$([\w-]+)")
+# expressions of spec 2
+_EXPRESSION = re.compile(r"\{\{([^{}]*)\}\}")
+
+
+class VariablesIndex:
+    """References to variables in the text nodes of a tree, collected in
+    a single walk over the tree:
+        names: names used as $name or ${name}
+        inputs: inputs used in {{ .inputs.name }} expressions
+        references: by text node, start, end and text of the ${name} and
+            $name variables as they are validated
+    """
+
+    def __init__(self, tree: YamlNode) -> None:
+        self.names: Set[str] = set()
+        self.inputs: Set[str] = set()
+        self._references: Dict[int, List[Tuple[int, int, str]]] = {}
+
+        nodes = [tree]
+        while nodes:
+            node = nodes.pop()
+            if isinstance(node, TextNode):
+                self._add_text(node)
+            nodes.extend(node.get_children())
+
+    def get_references(self, node: TextNode) -> List[Tuple[int, int, str]]:
+        return self._references.get(id(node), [])
+
+    def _add_text(self, node: TextNode) -> None:
+        text = node.text
+        if "$" in text:
+            references = [(m.start(), m.end(), m.group()) for m in _VARIABLE.finditer(text)]
+            if references:
+                self._references[id(node)] = references
+
+            for braced, name in _USED_NAME.findall(text):
+                if braced:
+                    self.names.add(braced)
+                else:
+                    # $name is also a use of every name it starts with up
+                    # to a dash, like $name-suffix
+                    parts = name.split("-")
+                    self.names.update("-".join(parts[: i + 1]) for i in range(len(parts)))
+
+        if "{{" in text:
+            for expression in _EXPRESSION.findall(text):
+                expression = expression.split("|")[0].strip()
+                if expression.startswith(".inputs."):
+                    self.inputs.add(expression[len(".inputs.") :])
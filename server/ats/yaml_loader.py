@@ -0,0 +1,352 @@
+import re
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import yaml
+from yaml.composer import ComposerError
+from yaml.events import (
+    AliasEvent,
+    DocumentEndEvent,
+    DocumentStartEvent,
+    Event,
+    NodeEvent,
+)
+from yaml.constructor import FullConstructor
+from yaml.parser import Parser as EventParser
+from yaml.resolver import Resolver
+from yaml.tokens import (
+    BlockEndToken,
+    BlockMappingStartToken,
+    BlockSequenceStartToken,
+    FlowEntryToken,
+    FlowMappingEndToken,
+    FlowMappingStartToken,
+    FlowSequenceEndToken,
+    FlowSequenceStartToken,
+    KeyToken,
+    ScalarToken,
+    Token,
+    ValueToken,
+)
+
+# scanner and constructor of libyaml, None if PyYAML is built without it
+CFullLoader = getattr(yaml, "CFullLoader", None)
+
+_LINE_BREAKS = "\n\r\x85\u2028\u2029"
+
+# top-level key with a single word value, plain or quoted, and a comment
+# (after a space, otherwise '#' is a part of a plain value)
+_HEADER_LINE = re.compile(
+    r"""([A-Za-z_][\w-]*):[ ]+(?:(\w[\w.#-]*)|'([\w.-]*)'|"([\w.-]*)")(?:[ ]+#.*)?[ ]*$"""
+)
+
+# change of the nesting level by the token type
+_DEPTH_CHANGES = {
+    BlockMappingStartToken: 1,
+    BlockSequenceStartToken: 1,
+    FlowMappingStartToken: 1,
+    FlowSequenceStartToken: 1,
+    BlockEndToken: -1,
+    FlowMappingEndToken: -1,
+    FlowSequenceEndToken: -1,
+}
+# tokens following the value indicator of a key without a value
+_EMPTY_VALUE_TOKENS = (KeyToken, BlockEndToken, FlowEntryToken, FlowMappingEndToken)
+_NOT_SCALAR = object()
+
+_resolver = Resolver()
+_constructor = FullConstructor()
+
+
+def scan(document: str) -> List[Token]:
+    """Returns the tokens of the document.
+
+    Tokens are scanned by libyaml when it is available and are the same as
+    the ones of the pure Python scanner, including their marks. Errors are
+    always raised by the Python parser so their messages don't depend on
+    the installation. The error raised is the first one of the stream,
+    like in yaml.load: an error of the parser or of the composer found
+    before the error of the scanner is raised instead of it."""
+    if _use_libyaml(document):
+        try:
+            tokens = _scan_c(document)
+        except yaml.YAMLError:
+            pass
+        else:
+            _align_tokens(document, tokens)
+            return tokens
+
+    try:
+        return list(yaml.scan(document, Loader=yaml.FullLoader))
+    except yaml.YAMLError:
+        # tokens are parsed as they are scanned, so the events stop at
+        # the first error of the stream
+        _check_events(yaml.parse(document, Loader=yaml.FullLoader))
+        raise
+
+
+def load(stream: Union[str, IO]) -> Any:
+    """Loads the document like yaml.load with FullLoader, using libyaml
+    when it is available"""
+    if hasattr(stream, "read"):
+        stream = stream.read()
+
+    if not _use_libyaml(stream):
+        return yaml.load(stream, Loader=yaml.FullLoader)
+
+    try:
+        return yaml.load(stream, Loader=CFullLoader)
+    except yaml.YAMLError:
+        return yaml.load(stream, Loader=yaml.FullLoader)
+
+
+def check(document: str, tokens: List[Token]) -> None:
+    """Raises the error yaml.load would raise for the scanned document
+    without constructing it: errors of the parser and of the composer
+    (undefined and duplicate anchors, more than one document).
+
+    Events are parsed by libyaml when it is available, otherwise from
+    the already scanned tokens. Errors have the messages and marks of
+    the pure Python parser"""
+    if not _use_libyaml(document):
+        events = _parse_tokens(tokens)
+    else:
+        try:
+            _check_events(_parse_c(document))
+            return
+        except yaml.YAMLError:
+            events = yaml.parse(document, Loader=yaml.FullLoader)
+
+    _check_events(events)
+
+
+def read_header(tokens: List[Token]) -> Dict[str, Any]:
+    """Returns the top-level keys of the scanned document whose values
+    are scalars, with the values yaml.load would construct for them.
+    Other keys are left out, and so is everything when the document is
+    not a mapping. Nested values are never constructed"""
+    header = {}
+    depth = 0
+
+    for index, token in enumerate(tokens):
+        token_type = type(token)
+        change = _DEPTH_CHANGES.get(token_type)
+        if change is not None:
+            if depth == 0 and token_type not in (
+                BlockMappingStartToken,
+                FlowMappingStartToken,
+            ):
+                break
+            depth += change
+            if depth == 0:
+                break
+        elif depth == 1 and token_type is KeyToken:
+            key = tokens[index + 1]
+            if type(key) is not ScalarToken:
+                continue
+
+            value = _read_value(tokens, index + 2)
+            if value is _NOT_SCALAR:
+                # the last value of a repeated key wins, like in yaml.load
+                header.pop(key.value, None)
+            else:
+                header[key.value] = value
+
+    return header
+
+
+def read_header_lines(document: str) -> Dict[str, Any]:
+    """Returns the top-level keys and values of the first lines of the
+    document which are simple 'key: value' lines, comments or empty.
+    Reading stops at the first line of any other kind, so only the
+    beginning of the document is read. Values are the ones yaml.load
+    would construct"""
+    header = {}
+    # a plain value may continue on the next indented line
+    open_key = None
+    start = 0
+
+    while start < len(document):
+        end = document.find("\n", start)
+        if end == -1:
+            end = len(document)
+        line = document[start:end].rstrip("\r")
+        start = end + 1
+
+        if not line.strip():
+            continue
+        if line[0] == "#":
+            open_key = None
+            continue
+
+        match = _HEADER_LINE.match(line)
+        if match is None:
+            if line[0] == " " and open_key is not None:
+                del header[open_key]
+            break
+
+        key, plain, single_quoted, double_quoted = match.groups()
+        if plain is not None:
+            header[key] = _construct_scalar(plain, plain=True)
+            open_key = key
+        else:
+            header[key] = single_quoted if double_quoted is None else double_quoted
+            open_key = None
+
+    return header
+
+
+def _read_value(tokens: List[Token], index: int) -> Any:
+    # value of a key whose scalar ends just before the index
+    if type(tokens[index]) is not ValueToken:
+        return None
+
+    token = tokens[index + 1]
+    if type(token) is ScalarToken:
+        return _construct_scalar(token.value, token.plain)
+    if isinstance(token, _EMPTY_VALUE_TOKENS):
+        return None
+    # collections, aliases, anchored or tagged scalars
+    return _NOT_SCALAR
+
+
+def _construct_scalar(value: str, plain: bool) -> Any:
+    tag = _resolver.resolve(yaml.ScalarNode, value, (plain, not plain))
+    construct = _constructor.yaml_constructors.get(tag)
+    if construct is None:
+        return value
+    return construct(_constructor, yaml.ScalarNode(tag, value))
+
+
+def _use_libyaml(document: str) -> bool:
+    # libyaml accepts tabs in places where the Python scanner raises
+    # an error, e.g. inside plain scalars
+    return CFullLoader is not None and "\t" not in document
+
+
+def _scan_c(document: str) -> List[Token]:
+    # same as yaml.scan without a generator around every token
+    loader = CFullLoader(document)
+    try:
+        tokens = []
+        get_token = loader.get_token
+        token = get_token()
+        while token is not None:
+            tokens.append(token)
+            token = get_token()
+        return tokens
+    finally:
+        loader.dispose()
+
+
+def _align_tokens(document: str, tokens: List[Token]) -> None:
+    """Makes tokens of libyaml equal to the ones of the Python scanner"""
+    for token in tokens:
+        # plain scalars don't have a style
+        if type(token) is ScalarToken and token.style == "":
+            token.style = None
+
+    # libyaml moves to a new line at the end of a document which does not
+    # end with a line break, the closing tokens are then one line below
+    if not document or document[-1] in _LINE_BREAKS:
+        return
+
+    last_break = max(document.rfind(char) for char in _LINE_BREAKS)
+    eof_line = sum(document.count(char) for char in _LINE_BREAKS)
+    eof_line -= document.count("\r\n")
+    eof_column = len(document) - last_break - 1
+
+    for token in reversed(tokens):
+        if token.end_mark.index != len(document):
+            break
+        token.start_mark = _align_mark(token.start_mark, eof_line, eof_column)
+        token.end_mark = _align_mark(token.end_mark, eof_line, eof_column)
+
+
+def _align_mark(mark: yaml.Mark, eof_line: int, eof_column: int) -> yaml.Mark:
+    if mark.line == eof_line + 1 and mark.column == 0:
+        return yaml.Mark(mark.name, mark.index, eof_line, eof_column, None, None)
+    return mark
+
+
+class _TokensParser(EventParser):
+    """Parser of yaml events reading already scanned tokens"""
+
+    def __init__(self, tokens: List[Token]) -> None:
+        super().__init__()
+        self.tokens = tokens
+        self.index = 0
+
+    def check_token(self, *choices) -> bool:
+        if self.index < len(self.tokens):
+            return not choices or isinstance(self.tokens[self.index], choices)
+        return False
+
+    def peek_token(self) -> Optional[Token]:
+        if self.index < len(self.tokens):
+            return self.tokens[self.index]
+        return None
+
+    def get_token(self) -> Optional[Token]:
+        token = self.peek_token()
+        self.index += 1
+        return token
+
+
+def _parse_tokens(tokens: List[Token]) -> Iterator[Event]:
+    parser = _TokensParser(tokens)
+    event = parser.get_event()
+    while event is not None:
+        yield event
+        event = parser.get_event()
+
+
+def _parse_c(document: str) -> Iterator[Event]:
+    loader = CFullLoader(document)
+    try:
+        event = loader.get_event()
+        while event is not None:
+            yield event
+            event = loader.get_event()
+    finally:
+        loader.dispose()
+
+
+def _check_events(events: Iterable[Event]) -> None:
+    # same checks as the Composer of PyYAML, without building nodes
+    anchors = {}
+    root_mark = None
+
+    for event in events:
+        if isinstance(event, DocumentStartEvent) and root_mark is not None:
+            raise ComposerError(
+                "expected a single document in the stream",
+                root_mark,
+                "but found another document",
+                event.start_mark,
+            )
+        if isinstance(event, DocumentEndEvent):
+            anchors = {}
+            continue
+        if not isinstance(event, NodeEvent):
+            continue
+
+        if root_mark is None:
+            root_mark = event.start_mark
+
+        if isinstance(event, AliasEvent):
+            if event.anchor not in anchors:
+                raise ComposerError(
+                    None,
+                    None,
+                    "found undefined alias %r" % event.anchor,
+                    event.start_mark,
+                )
+        elif event.anchor is not None:
+            if event.anchor in anchors:
+                raise ComposerError(
+                    "found duplicate anchor %r; first occurrence" % event.anchor,
+                    anchors[event.anchor],
+                    "second occurrence",
+                    event.start_mark,
+                )
+            anchors[event.anchor] = event.start_mark
@@ -10,7 +10,7 @@ from server.ats.trees.blueprint import (
     BlueprintResourceMappingNode,
     BlueprintTree,
 )
-from server.ats.trees.common import BaseTree, ScalarNode, YamlNode
+from server.ats.trees.common import ScalarNode, YamlNode
 from server.completers.base import Completer
 from server.utils.applications import ApplicationsManager as applications
 from server.utils.common import get_line_before_position, get_path_to_pos
@@ -33,12 +33,10 @@ class BlueprintResourceCompleter(Completer):
 
         items = []
         for res, res_details in resources.items():
-            tree = res_details.get("tree", None)
-
-            if not tree:
+            if not res_details["valid"]:
                 continue
 
-            props = self._build_resource_completion(res, tree)
+            props = self._build_resource_completion(res, res_details)
             label = res
 
             if self.path[-1] == self._get_resource_sequence():
@@ -89,19 +87,19 @@ class BlueprintResourceCompleter(Completer):
             else services.get_available_resources(root)
         )
 
-    def _build_resource_completion(self, resource_name: str, tree: BaseTree) -> str:
+    def _build_resource_completion(self, resource_name: str, details: dict) -> str:
         tab = "  "
         output = f"{resource_name}:\n"
-        if tree.kind.text == "application":
+        if details["kind"] == "application":
             output += tab * 2 + "instances: 1\n"
 
-        inputs = tree.get_inputs()
+        inputs = details["inputs"]
         if inputs:
             output += tab * 2 + "input_values:\n"
-            for input in inputs:
-                if input.value:
-                    output += tab * 3 + f"- {input.key.text}: {input.value.text}\n"
+            for name, value in inputs.items():
+                if value is not None:
+                    output += tab * 3 + f"- {name}: {value}\n"
                 else:
-                    output += tab * 3 + f"- {input.key.text}: \n"
+                    output += tab * 3 + f"- {name}: \n"
 
         return output
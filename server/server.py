@@ -15,50 +15,63 @@
 # limitations under the License.                                           #
 ############################################################################
 import asyncio
+import functools
 import json
 import logging
 import os
 import pathlib
 import shlex
-import subprocess
-import sys
 import textwrap
+import uuid
 from json import JSONDecodeError
 from typing import List, Optional
 from urllib.parse import unquote, urlparse
 from urllib.request import url2pathname
 
 import tabulate
-import yaml
 from pygls.lsp.methods import (CODE_LENS, COMPLETION, DOCUMENT_LINK,
+                               INITIALIZE, INITIALIZED, SHUTDOWN,
                                TEXT_DOCUMENT_DID_CHANGE,
+                               TEXT_DOCUMENT_DID_CLOSE,
                                TEXT_DOCUMENT_DID_OPEN,
+                               WORKSPACE_DID_CHANGE_CONFIGURATION,
                                WORKSPACE_DID_CHANGE_WATCHED_FILES)
 from pygls.lsp.types import (CodeLens, CodeLensOptions, CodeLensParams,
                              Command, CompletionItem, CompletionItemKind,
                              CompletionList, CompletionOptions,
                              CompletionParams, ConfigurationItem,
-                             ConfigurationParams, Diagnostic,
+                             ConfigurationParams,
+                             DidChangeConfigurationParams,
                              DidChangeTextDocumentParams,
                              DidChangeWorkspaceFoldersParams,
+                             DidCloseTextDocumentParams,
                              DidOpenTextDocumentParams, DocumentLink,
-                             DocumentLinkParams, MessageType, Position, Range,
+                             DocumentLinkParams, InitializedParams,
+                             InitializeParams,
+                             MessageType, Position, Range,
                              workspace)
-from pygls.lsp.types.basic_structures import TextEdit
+from pygls.lsp.types.basic_structures import (TextEdit, WorkDoneProgressBegin,
+                                              WorkDoneProgressEnd,
+                                              WorkDoneProgressReport)
 from pygls.server import LanguageServer
+from pygls.workspace import Document
 
-from server.ats.parser import Parser, ParserError
-from server.ats.trees.app import AppTree
 from server.ats.trees.blueprint import BlueprintInputNode
-from server.ats.trees.common import BaseTree, PropertyNode
 from server.completers.resolver import CompletionResolver
 from server.constants import (AWS_REGIONS, AZURE_REGIONS,
                               BLUEPRINT_SOURCE_TYPE_MAP)
 from server.utils import common
+from server.utils.analysis import AnalysisCache, DocumentAnalysis, build_analysis
 from server.utils.applications import ApplicationsManager as applications
+from server.utils.cache import TTLCache
+from server.utils.cli import CLI_TIMEOUT, MAX_CLI_PROCESSES, WORKER_EXECUTION, CliRunner
 from server.utils.common import get_repo_root_path, is_var_allowed
+from server.utils.indexer import ResourceStore, index_resources
+from server.utils.scheduler import DocumentScheduler
+from server.utils.profiling import ProfilingSession, get_log_directory
 from server.utils.services import ServicesManager as services
-from server.validation.factory import ValidatorFactory
+from server.utils.stats import ServerStats
+from server.utils.workers import PROCESS_EXECUTOR, WorkerPools
 
 DEBOUNCE_DELAY = 0.3
 
@@ -75,8 +88,89 @@ class TorqueLanguageServer(LanguageServer):
     CMD_GET_SANDBOX = "get_sandbox"
     CMD_END_SANDBOX = "end_sandbox"
     CMD_GET_BLUEPRINT = "get_blueprint"
+    CMD_SERVER_STATS = "torque/serverStats"
+    CMD_START_PROFILING = "torque/startProfiling"
+    CMD_STOP_PROFILING = "torque/stopProfiling"
     latest_opened_document = None
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = ServerStats()
+        self.analyses = AnalysisCache(self.stats)
+        self.validations = DocumentScheduler(delay=DEBOUNCE_DELAY)
+        self.workers = WorkerPools()
+        self.cli = CliRunner(log=self.show_message_log)
+        self.listings = TTLCache(stats=self.stats, name="listings")
+        self.indexing: Optional[asyncio.Task] = None
+        self.stats_logging: Optional[asyncio.Task] = None
+        self.profiling: Optional[ProfilingSession] = None
+        self._profiling_timer: Optional[asyncio.TimerHandle] = None
+        self.storage_path: Optional[str] = None
+
+    def feature(self, feature_name, options=None):
+        """Registers the handler recording the latency of its calls"""
+        register = super().feature(feature_name, options)
+        return lambda f: register(self.stats.wrap(feature_name, f, self._request_done))
+
+    def command(self, command_name):
+        """Registers the handler recording the latency of its calls"""
+        register = super().command(command_name)
+        # the request starting a session is not one of its requests
+        done = None if command_name == self.CMD_START_PROFILING else self._request_done
+        return lambda f: register(self.stats.wrap(command_name, f, done))
+
+    def start_profiling(
+        self, duration: float = None, requests: int = None, memory: bool = False
+    ) -> ProfilingSession:
+        """Starts a profiling session of the event loop thread and the
+        workers, ended after the duration (in seconds) or the number of
+        requests if given. Must be called by the event loop thread"""
+        if self.profiling is not None:
+            raise ValueError("A profiling session is already running")
+        for name, value in (("duration", duration), ("requests", requests)):
+            # NaN is not >= 0 either
+            if value is not None and (
+                isinstance(value, bool) or not isinstance(value, (int, float)) or not value >= 0
+            ):
+                raise ValueError(f"Invalid profiling {name}: {value!r}")
+
+        self.profiling = ProfilingSession(get_log_directory(), memory, requests)
+        self.workers.profiling = self.profiling
+        self.profiling.start()
+        if duration:
+            self._profiling_timer = self.loop.call_later(duration, self.stop_profiling)
+        return self.profiling
+
+    def stop_profiling(self) -> List[str]:
+        """Ends the profiling session, returns the paths of the written files"""
+        session, self.profiling = self.profiling, None
+        if session is None:
+            return []
+
+        if self._profiling_timer is not None:
+            self._profiling_timer.cancel()
+            self._profiling_timer = None
+        self.workers.profiling = None
+
+        paths = session.stop()
+        self.show_message_log(f"Profiling session written to {', '.join(paths)}")
+        return paths
+
+    def _request_done(self):
+        if self.profiling is not None and self.profiling.request_done():
+            self.stop_profiling()
+
+    def get_stats(self) -> dict:
+        return self.stats.snapshot(
+            {
+                "documents": len(self.workspace.documents) if self.workspace else 0,
+                "validations_pending": self.validations.pending,
+                "workers_pending": self.workers.pending,
+                "cli_running": self.cli.running,
+                "indexing": int(self.indexing is not None and not self.indexing.done()),
+            }
+        )
+
 
 torque_ls = TorqueLanguageServer()
 
@@ -89,113 +183,213 @@ def _is_torque_file(file_uri):
     )
 
 
-def _diagnose_tree_errors(tree: BaseTree) -> list:
-    diagnostics = []
-    for error in tree.errors:
-        d = Diagnostic(
-            range=Range(
-                start=Position(line=error.start_pos[0], character=error.start_pos[1]),
-                end=Position(line=error.end_pos[0], character=error.end_pos[1]),
-            ),
-            message=error.message,
+async def _get_analysis(server: TorqueLanguageServer, uri: str) -> DocumentAnalysis:
+    text_doc = server.workspace.get_document(uri)
+    return await server.analyses.get_async(text_doc, server.workers)
+
+
+def _validate(ls: LanguageServer, params, delay: float = None):
+    """Schedules validation of the document. Pending validation
+    of the same document is cancelled"""
+    _schedule_validation(ls, params.text_document.uri, delay)
+
+
+def _schedule_validation(ls: LanguageServer, uri: str, delay: float = None):
+    version = ls.workspace.get_document(uri).version
+
+    ls.validations.schedule(
+        uri, lambda: _validate_document(ls, uri, version), delay=delay
+    )
+
+
+async def _validate_document(ls: LanguageServer, uri: str, version: Optional[int]):
+    text_doc = ls.workspace.get_document(uri)
+    if text_doc.version != version:
+        return
+
+    analysis = await ls.analyses.get_async(text_doc, ls.workers)
+    if analysis.version != version:
+        return
+
+    # validators get a snapshot since the document may change meanwhile
+    snapshot = Document(uri, source=analysis.source, version=analysis.version)
+    diagnostics = await ls.analyses.validate_async(analysis, snapshot, ls.workers)
+
+    # do not publish results for an outdated version of the document
+    if ls.workspace.get_document(uri).version != version:
+        return
+
+    ls.publish_diagnostics(text_doc.uri, diagnostics)
+    _reload_resource(uri, analysis)
+
+
+def _reload_resource(uri: str, analysis: DocumentAnalysis):
+    resource_name = pathlib.Path(uri).name.replace(".yaml", "")
+
+    if analysis.kind == "application":
+        applications.reload_resource_details(
+            resource_name=resource_name,
+            resource_source=analysis.source,
+            resource_tree=analysis.tree,
+        )
+
+    elif analysis.kind == "TerraForm":
+        services.reload_resource_details(
+            resource_name=resource_name,
+            resource_source=analysis.source,
+            resource_tree=analysis.tree,
+        )
+
+
+async def _load_settings(server: TorqueLanguageServer):
+    try:
+        config = await server.get_configuration_async(
+            ConfigurationParams(
+                items=[
+                    ConfigurationItem(
+                        scope_uri="", section=TorqueLanguageServer.CONFIGURATION_SECTION
+                    )
+                ]
+            )
         )
-        diagnostics.append(d)
-    return diagnostics
+        settings = config[0] or {}
+    except Exception as ex:
+        logging.warning(f"Unable to get settings: {ex}")
+        return
 
+    delay = settings.get("validationDelay", None)
+    if isinstance(delay, (int, float)) and delay >= 0:
+        server.validations.delay = delay / 1000
+
+    max_workers = settings.get("maxWorkers", None)
+    server.workers.configure(
+        settings.get("parserExecutor", None) or PROCESS_EXECUTOR,
+        max_workers if isinstance(max_workers, int) and max_workers > 0 else None,
+    )
+
+    cli_timeout = settings.get("cliTimeout", None)
+    if isinstance(cli_timeout, bool) or not isinstance(cli_timeout, (int, float)) or cli_timeout < 0:
+        cli_timeout = CLI_TIMEOUT
+    max_processes = settings.get("maxCliProcesses", None)
+    server.cli.configure(
+        # 0 means no timeout
+        cli_timeout or None,
+        max_processes if isinstance(max_processes, int) and max_processes > 0 else MAX_CLI_PROCESSES,
+        settings.get("cliExecution", None) or WORKER_EXECUTION,
+    )
 
-def _validate(ls: LanguageServer, params):
-    text_doc = ls.workspace.get_document(params.text_document.uri)
+    listings_ttl = settings.get("listingsCacheTtl", None)
+    if isinstance(listings_ttl, (int, float)) and listings_ttl >= 0:
+        server.listings.ttl = listings_ttl
 
-    source = text_doc.source
-    diagnostics = _validate_yaml(source) if source else []
+    stats_interval = settings.get("statsLogInterval", None)
+    if server.stats_logging:
+        server.stats_logging.cancel()
+        server.stats_logging = None
+    if isinstance(stats_interval, (int, float)) and stats_interval > 0:
+        server.stats_logging = asyncio.ensure_future(_log_stats(server, stats_interval))
 
-    if not diagnostics:
+
+async def _log_stats(server: TorqueLanguageServer, interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        logging.info("Server stats: %s", json.dumps(server.get_stats()))
+
+
+async def _index_workspace(server: TorqueLanguageServer):
+    root = server.workspace.root_path
+    if not root:
+        return
+
+    token = None
+    capabilities = server.client_capabilities.window
+    if capabilities and capabilities.work_done_progress:
+        token = str(uuid.uuid4())
         try:
-            tree = Parser(source).parse()
-            validator = ValidatorFactory.get_validator(tree, text_doc)
-            if validator is not None:
-                diagnostics += validator.validate()
-            diagnostics += _diagnose_tree_errors(tree)
-        except ParserError as e:
-            diagnostics.append(
-                Diagnostic(
-                    range=Range(
-                        start=Position(line=e.start_pos[0], character=e.start_pos[1]),
-                        end=Position(line=e.end_pos[0], character=e.end_pos[1]),
-                    ),
-                    message=e.message,
-                )
-            )
-        except ValueError as e:
-            diagnostics.append(
-                Diagnostic(
-                    range=Range(
-                        start=Position(line=0, character=0),
-                        end=Position(line=0, character=0),
-                    ),
-                    message=str(e),
-                )
+            await server.progress.create_async(token)
+            server.progress.begin(
+                token, WorkDoneProgressBegin(title="Indexing Torque resources", percentage=0)
             )
         except Exception as ex:
-            import sys
+            logging.warning(f"Unable to report indexing progress: {ex}")
+            token = None
+
+    reported = [0]
+
+    def report(done: int, total: int):
+        percentage = done * 100 // total
+        if token and percentage > reported[0]:
+            reported[0] = percentage
+            server.progress.report(
+                token,
+                WorkDoneProgressReport(message=f"{done}/{total}", percentage=percentage),
+            )
 
-            print(
-                "Error on line {}".format(sys.exc_info()[-1].tb_lineno),
-                type(ex).__name__,
-                ex,
+    count = 0
+    try:
+        with server.stats.timed("index"):
+            count = await index_resources(
+                root,
+                [applications, services],
+                server.workers.parse,
+                report,
+                ResourceStore(server.storage_path) if server.storage_path else None,
             )
-            logging.error(
-                "Error on line {}".format(sys.exc_info()[-1].tb_lineno),
-                type(ex).__name__,
-                ex,
+        server.stats.count("index.resources", count)
+    except asyncio.CancelledError:
+        raise
+    except Exception as ex:
+        logging.exception(f"Workspace indexing failed: {ex}")
+    finally:
+        if token:
+            server.progress.end(
+                token, WorkDoneProgressEnd(message=f"Indexed {count} resources")
             )
-    ls.publish_diagnostics(text_doc.uri, diagnostics)
 
+    # blueprints validated against a partial index
+    for uri in list(server.workspace.documents):
+        if "/blueprints/" in uri:
+            server.analyses.invalidate(uri)
+            _schedule_validation(server, uri, delay=0)
 
-def _validate_yaml(source):
-    """Validates yaml file."""
-    diagnostics = []
 
-    try:
-        yaml.load(source, Loader=yaml.FullLoader)
-    except yaml.MarkedYAMLError as ex:
-        mark = ex.problem_mark
-        d = Diagnostic(
-            range=Range(
-                start=Position(line=mark.line - 1, character=mark.column - 1),
-                end=Position(line=mark.line - 1, character=mark.column),
-            ),
-            message=ex.problem,
-            source=type(torque_ls).__name__,
-        )
+@torque_ls.feature(INITIALIZE)
+def initialize(server: TorqueLanguageServer, params: InitializeParams):
+    options = params.initialization_options or {}
+    server.storage_path = options.get("storagePath", None)
+
+
+@torque_ls.feature(INITIALIZED)
+async def initialized(server: TorqueLanguageServer, params: InitializedParams):
+    await _load_settings(server)
+    server.indexing = asyncio.ensure_future(_index_workspace(server))
 
-        diagnostics.append(d)
 
-    return diagnostics
+@torque_ls.feature(SHUTDOWN)
+def shutdown(server: TorqueLanguageServer, *args):
+    if server.indexing:
+        server.indexing.cancel()
+    if server.stats_logging:
+        server.stats_logging.cancel()
+    server.stop_profiling()
+    server.validations.cancel_all()
+    server.workers.shutdown(wait=False)
+    server.cli.shutdown()
+
+
+@torque_ls.feature(WORKSPACE_DID_CHANGE_CONFIGURATION)
+async def configuration_changed(
+    server: TorqueLanguageServer, params: DidChangeConfigurationParams
+):
+    await _load_settings(server)
 
 
 @torque_ls.feature(TEXT_DOCUMENT_DID_CHANGE)
 def did_change(server: TorqueLanguageServer, params: DidChangeTextDocumentParams):
     """Text document did change notification."""
     if _is_torque_file(params.text_document.uri):
+        server.analyses.changed(params.text_document.uri, params.content_changes)
         _validate(server, params)
-        text_doc = server.workspace.get_document(params.text_document.uri)
-
-        source = text_doc.source
-        yaml_obj = yaml.load(source, Loader=yaml.FullLoader)  # todo: refactor
-        doc_type = yaml_obj.get("kind", "")
-
-        if doc_type == "application":
-            app_name = pathlib.Path(params.text_document.uri).name.replace(".yaml", "")
-            applications.reload_resource_details(
-                resource_name=app_name, resource_source=source
-            )
-
-        elif doc_type == "TerraForm":
-            srv_name = pathlib.Path(params.text_document.uri).name.replace(".yaml", "")
-            services.reload_resource_details(
-                resource_name=srv_name, resource_source=source
-            )
 
 
 @torque_ls.feature(TEXT_DOCUMENT_DID_OPEN)
@@ -205,7 +399,14 @@ async def did_open(server: TorqueLanguageServer, params: DidOpenTextDocumentPara
         server.latest_opened_document = params.text_document
         server.show_message("Detected a Torque file", msg_type=MessageType.Log)
         server.workspace.put_document(params.text_document)
-        _validate(server, params)
+        _validate(server, params, delay=0)
+
+
+@torque_ls.feature(TEXT_DOCUMENT_DID_CLOSE)
+def did_close(server: TorqueLanguageServer, params: DidCloseTextDocumentParams):
+    """Text document did close notification."""
+    server.validations.cancel(params.text_document.uri)
+    server.analyses.invalidate(params.text_document.uri)
 
 
 @torque_ls.feature(WORKSPACE_DID_CHANGE_WATCHED_FILES)
@@ -219,23 +420,15 @@ async def workspace_changed(
             if "/applications/" in change.uri or "/services/" in change.uri:
                 if change.type != workspace.FileChangeType.Deleted:
                     text_doc = server.workspace.get_document(change.uri)
-                    source = text_doc.source
-                    yaml_obj = yaml.load(
-                        source, Loader=yaml.FullLoader
-                    )  # todo: refactor
-                    doc_type = yaml_obj.get("kind", "")
-
-                    if doc_type == "application":
-                        app_name = pathlib.Path(change.uri).name.replace(".yaml", "")
-                        applications.reload_resource_details(
-                            resource_name=app_name, resource_source=source
-                        )
-
-                    elif doc_type == "TerraForm":
-                        srv_name = pathlib.Path(change.uri).name.replace(".yaml", "")
-                        services.reload_resource_details(
-                            resource_name=srv_name, resource_source=source
-                        )
+                    _reload_resource(
+                        change.uri,
+                        await server.workers.parse(
+                            build_analysis,
+                            text_doc.uri,
+                            text_doc.version,
+                            text_doc.source,
+                        ),
+                    )
                 else:
                     if "/applications/" in change.uri:
                         app_name = pathlib.Path(change.uri).name.replace(".yaml", "")
@@ -255,17 +448,20 @@ async def workspace_changed(
             "/blueprints/" in server.latest_opened_document.uri
             and not current_file_changed
         ):
-            print("validating")
+            # resources used by the blueprint have changed,
+            # so the previous validation results are outdated
+            server.analyses.invalidate(server.latest_opened_document.uri)
             _validate(
                 server,
                 DidOpenTextDocumentParams(text_document=server.latest_opened_document),
+                delay=0,
             )
     except Exception as ex:
         logging.error(ex)
 
 
 @torque_ls.feature(COMPLETION, CompletionOptions(resolve_provider=False))
-def completions(
+async def completions(
     server: TorqueLanguageServer, params: Optional[CompletionParams] = None
 ) -> CompletionList:
     """Returns completion items."""
@@ -273,33 +469,27 @@ def completions(
         return CompletionList(is_incomplete=True, items=[])
 
     doc = server.workspace.get_document(params.text_document.uri)
+    analysis = await server.analyses.get_async(doc, server.workers)
 
-    try:
-        yaml_obj = yaml.load(doc.source, Loader=yaml.FullLoader)
-        if yaml_obj and isinstance(yaml_obj, dict):
-            doc_type = yaml_obj.get("kind", None)
-        else:
-            return CompletionList(is_incomplete=True, items=[])
-    except yaml.MarkedYAMLError:
+    if not analysis.header:
         return CompletionList(is_incomplete=True, items=[])
+    doc_type = analysis.kind
 
-    try:
-        tree = Parser(doc.source).parse()
-    except Exception as ex:
-        import sys
-
-        logging.error(
-            "Error on line {}".format(sys.exc_info()[-1].tb_lineno),
-            type(ex).__name__,
-            ex,
-        )
+    if analysis.tree is None:
+        if analysis.tree_error is not None:
+            logging.error(
+                "Unable to parse document: %s %s",
+                type(analysis.tree_error).__name__,
+                analysis.tree_error,
+            )
         return CompletionList(is_incomplete=True, items=[])
+    tree = analysis.tree
 
     words = common.preceding_words(doc, params.position)
     last_word = words[-1] if words else ""
 
     root = get_repo_root_path(doc.path)
-    path = common.get_path_to_pos(tree, params.position)
+    path = analysis.get_path_to_pos(params.position)
 
     if doc_type is None:
         try:
@@ -314,7 +504,7 @@ def completions(
         return CompletionList(is_incomplete=True, items=completions)
 
     if last_word.endswith("$") or last_word.endswith(":"):
-        if is_var_allowed(tree, params.position):
+        if is_var_allowed(tree, params.position, path):
             inputs_names_list = [i_node.key.text for i_node in tree.get_inputs()]
             if doc_type == "blueprint":
                 inputs_names_list.append("torque")
@@ -585,35 +775,25 @@ def completions(
 
 
 @torque_ls.feature(CODE_LENS, CodeLensOptions(resolve_provider=False))
-def code_lens(
+async def code_lens(
     server: TorqueLanguageServer, params: Optional[CodeLensParams] = None
 ) -> Optional[List[CodeLens]]:
     if "/blueprints/" in params.text_document.uri:
-        doc = server.workspace.get_document(params.text_document.uri)
-
-        try:
-            yaml_obj = yaml.load(doc.source, Loader=yaml.FullLoader)
-        except yaml.MarkedYAMLError:
-            yaml_obj = None
-
-        try:
-            if yaml_obj:
-                bp_tree = Parser(doc.source).parse()
-                # disable for spec2
-                # if bp_tree.kind is None:
-                #     return
-        except ParserError as ex:
-            return
-
-        except Exception as ex:
-            import sys
-
-            logging.error(
-                "Error on line {}".format(sys.exc_info()[-1].tb_lineno),
-                type(ex).__name__,
-                ex,
-            )
-            return None
+        analysis = await _get_analysis(server, params.text_document.uri)
+
+        if analysis.header:
+            if analysis.parser_error is not None:
+                return
+            if analysis.tree_error is not None:
+                logging.error(
+                    "Unable to parse document: %s %s",
+                    type(analysis.tree_error).__name__,
+                    analysis.tree_error,
+                )
+                return None
+            # disable for spec2
+            # if analysis.tree.kind is None:
+            #     return
 
         # def to_bool(val: str):
         #     return val.lower() == "true"
@@ -695,13 +875,8 @@ async def lsp_document_link(
     await asyncio.sleep(DEBOUNCE_DELAY)
 
     doc = server.workspace.get_document(params.text_document.uri)
-    try:
-        yaml_obj = yaml.load(doc.source, Loader=yaml.FullLoader)
-        if yaml_obj and isinstance(yaml_obj, dict):
-            doc_type = yaml_obj.get("kind", "")
-        else:
-            return links
-    except yaml.MarkedYAMLError:
+    analysis = await server.analyses.get_async(doc, server.workers)
+    if not analysis.header:
         return links
 
     root = get_repo_root_path(doc.path)
@@ -709,6 +884,7 @@ async def lsp_document_link(
     return links
 
 
+@functools.lru_cache(maxsize=None)
 def _fetch_version():
     with open(os.path.join("server/version.txt")) as version_file:
         version_from_file = version_file.read().strip()
@@ -716,51 +892,42 @@ def _fetch_version():
     return version_from_file
 
 
-def _run_torque_cli_command(
+async def _run_torque_cli_command(
     server: TorqueLanguageServer,
     command: str,
     log_command: bool = True,
     log_output: bool = False,
     log_error: bool = True,
-    **kwargs,
+    use_timeout: bool = True,
+    cwd: str = None,
 ):
 
     if log_command:
         server.show_message_log(f"Running command: {command}", MessageType.Info)
 
-    cmd_list = [sys.executable, "-m"] + shlex.split(command)
+    module, *args = shlex.split(command)
 
     env_override = os.environ.copy()
     env_override["TORQUE_USERAGENT"] = f"Torque-IDE-VSCode/{_fetch_version()}"
 
     try:
-        res = subprocess.run(
-            cmd_list,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            # universal_newlines=True,
+        return await server.cli.run_module(
+            module,
+            args,
+            log_output=log_output,
+            log_error=log_error,
+            use_timeout=use_timeout,
             env=env_override,
-            **kwargs,
+            cwd=cwd,
         )
 
+    except asyncio.CancelledError:
+        server.show_message_log(f"Command cancelled: {command}", MessageType.Warning)
+        raise
     except Exception as ex:
         server.show_message_log(f"Error running command: {ex}", MessageType.Error)
         raise ex
 
-    if log_output:
-        server.show_message_log(
-            f"Command output: {res.stdout.decode('utf-8')}", MessageType.Info
-        )
-        # logging.debug(f"Command output: {res.stdout.decode('utf-8')}")
-    if log_error and res.stderr:
-        server.show_message_log(
-            f"Command error: {res.stderr.decode('utf-8')}", MessageType.Error
-        )
-        # logging.debug(f"Command error: {res.stderr.decode('utf-8')}")
-
-    return res.stdout.decode("utf-8"), res.stderr.decode("utf-8")
-
 
 async def _get_profile(server: TorqueLanguageServer):
     try:
@@ -780,6 +947,55 @@ async def _get_profile(server: TorqueLanguageServer):
     return active_profile
 
 
+async def _get_listing(
+    server: TorqueLanguageServer, listing: str, profile: str, command: str
+):
+    """Returns stdout and stderr of a listing command. Successful results
+    are cached per profile, see TTLCache"""
+    return await server.listings.get(
+        (listing, profile),
+        lambda: _run_torque_cli_command(server, command),
+        is_cacheable=lambda res: not res[1],
+    )
+
+
+def _invalidate_listings(server: TorqueLanguageServer, profile: str, listing: str = None):
+    server.listings.invalidate(
+        lambda key: key[1] == profile and (listing is None or key[0] == listing)
+    )
+
+
+@torque_ls.command(TorqueLanguageServer.CMD_SERVER_STATS)
+def server_stats(server: TorqueLanguageServer, *args):
+    """Latencies of the handlers and stages, counters, cache
+    hit ratios and queue depths"""
+    return server.get_stats()
+
+
+@torque_ls.command(TorqueLanguageServer.CMD_START_PROFILING)
+def start_profiling(server: TorqueLanguageServer, *args):
+    """Starts profiling the server. Optional arguments: the duration (in
+    seconds) and the number of requests after which the session ends,
+    and whether to take a tracemalloc snapshot"""
+    arguments = list(args[0]) if args and args[0] else []
+    duration, requests, memory = (arguments + [None, None, False])[:3]
+    try:
+        session = server.start_profiling(
+            duration=duration, requests=requests, memory=bool(memory)
+        )
+    except ValueError as ex:
+        server.show_message(str(ex), MessageType.Error)
+        return None
+
+    return {"directory": session.directory, "name": session.name}
+
+
+@torque_ls.command(TorqueLanguageServer.CMD_STOP_PROFILING)
+def stop_profiling(server: TorqueLanguageServer, *args):
+    """Ends the profiling session, returns the paths of the written files"""
+    return server.stop_profiling()
+
+
 @torque_ls.command(TorqueLanguageServer.CMD_START_SANDBOX)
 async def start_sandbox(server: TorqueLanguageServer, *args):
     if len(args[0]) == 0:
@@ -835,7 +1051,13 @@ async def start_sandbox(server: TorqueLanguageServer, *args):
                 command += f" -b {branch_args}"
 
         cwd = server.workspace.root_path if dev_mode else None
-        stdout, stderr = _run_torque_cli_command(server, command, cwd=cwd)
+        # in dev mode the command waits until the sandbox is ready
+        try:
+            stdout, stderr = await _run_torque_cli_command(
+                server, command, use_timeout=not dev_mode, cwd=cwd
+            )
+        finally:
+            _invalidate_listings(server, active_profile, "env")
         stdout = stdout.split("\n") if stdout else []
         stderr = stderr.split("\n") if stderr else []
         sandbox_id = ""
@@ -884,7 +1106,7 @@ async def get_profiles(server: TorqueLanguageServer, *_):
     keys = ["profile", "account", "space"]
 
     try:
-        stdout, _ = _run_torque_cli_command(
+        stdout, _ = await _run_torque_cli_command(
             server, "torque --disable-version-check configure list"
         )
 
@@ -928,8 +1150,10 @@ async def list_sandboxes(server: TorqueLanguageServer, *_):
     sbs = []
 
     try:
-        stdout, stderr = _run_torque_cli_command(
+        stdout, stderr = await _get_listing(
             server,
+            "env",
+            active_profile,
             f"torque --disable-version-check --profile {active_profile} env list --output=json",
         )
 
@@ -961,8 +1185,10 @@ async def list_blueprints(server: TorqueLanguageServer, *_):
         return
 
     try:
-        stdout, stderr = _run_torque_cli_command(
+        stdout, stderr = await _get_listing(
             server,
+            "bp",
+            active_profile,
             f"torque --disable-version-check --profile {active_profile} bp list --output=json --detail",
         )
 
@@ -1008,7 +1234,9 @@ async def torque_login(server: TorqueLanguageServer, *args):
         elif params.token:
             command = command + f" -t {params.token}"
 
-        _, stderr = _run_torque_cli_command(server, command, log_command=False)
+        _, stderr = await _run_torque_cli_command(server, command, log_command=False)
+        # the profile may point to another account or space now
+        _invalidate_listings(server, params.profile)
 
         # exit_code = 1 if "Login Failed" in stderr else 0
         # if exit_code != 0:
@@ -1034,9 +1262,10 @@ async def remove_profile(server: TorqueLanguageServer, *args):
 
     profile_name = args[0][0]
     try:
-        _, _ = _run_torque_cli_command(
+        _, _ = await _run_torque_cli_command(
             server, f"torque --disable-version-check configure remove {profile_name}"
         )
+        _invalidate_listings(server, profile_name)
         server.show_message(f"Profile '{profile_name}' deleted.")
         return True
     except Exception as ex:
@@ -1067,7 +1296,7 @@ async def get_blueprint(server: TorqueLanguageServer, *args):
     # source = BLUEPRINT_SOURCE_TYPE_MAP.get(source_type, None)
 
     try:
-        stdout, stderr = _run_torque_cli_command(
+        stdout, stderr = await _run_torque_cli_command(
             server,
             f"torque --disable-version-check --profile {active_profile} bp get '{bp_name}' --repo {repo_name} --output=json --detail",
         )
@@ -1101,7 +1330,7 @@ async def get_sandbox(server: TorqueLanguageServer, *args):
 
     sb_id = args[0].pop()
     try:
-        stdout, stderr = _run_torque_cli_command(
+        stdout, stderr = await _run_torque_cli_command(
             server,
             f"torque --disable-version-check --profile {active_profile} env get {sb_id} --output=json --detail",
         )
@@ -1137,10 +1366,13 @@ async def end_sandbox(server: TorqueLanguageServer, *args):
     sb_id = args[0].pop()
 
     try:
-        stdout, stderr = _run_torque_cli_command(
-            server,
-            f"torque --disable-version-check --profile {active_profile} env end {sb_id}",
-        )
+        try:
+            stdout, stderr = await _run_torque_cli_command(
+                server,
+                f"torque --disable-version-check --profile {active_profile} env end {sb_id}",
+            )
+        finally:
+            _invalidate_listings(server, active_profile, "env")
 
         if stderr:
             server.show_message(
@@ -1182,7 +1414,7 @@ async def validate_blueprint(server: TorqueLanguageServer, *args):
     server.show_message(info_msg)
     server.show_message_log(info_msg)
     try:
-        _, stderr = _run_torque_cli_command(
+        _, stderr = await _run_torque_cli_command(
             server,
             f'torque --disable-version-check --profile {active_profile} bp validate "{blueprint_path}" --output=json',
             log_error=False,
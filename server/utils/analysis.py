@@ -0,0 +1,367 @@
+import asyncio
+import logging
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+from pygls.lsp.types import (
+    Diagnostic,
+    Position,
+    Range,
+    TextDocumentContentChangeEvent,
+)
+from pygls.workspace import Document
+from server.ats import yaml_loader
+from server.ats.parser import IncrementalParseError, Parser, ParserError
+from server.ats.trees.common import BaseTree, YamlNode
+from server.utils.common import PositionIndex
+from server.utils.stats import ServerStats
+from server.utils.workers import WorkerPools
+from server.validation.factory import ValidatorFactory
+from yaml.tokens import Token
+
+
+class DocumentAnalysis:
+    """Results of analysing a single version of a document.
+
+    The header (top-level scalar values), the token stream and the tree are
+    built once and then shared by validation, completions, code lens and
+    document links. The document itself is never constructed.
+    """
+
+    def __init__(
+        self,
+        uri: str,
+        version: Optional[int],
+        source: str,
+        header: Dict[str, Any] = None,
+        tree: BaseTree = None,
+    ) -> None:
+        self.uri = uri
+        self.version = version
+        self.source = source
+
+        self.header: Optional[Dict[str, Any]] = header
+        self.tree: Optional[BaseTree] = tree
+        self.diagnostics: Optional[List[Diagnostic]] = None
+        # number of validations using the tree, which is not
+        # updated in place meanwhile
+        self.readers = 0
+        self._tokens: Optional[List[Token]] = None
+        self._positions: Optional[PositionIndex] = None
+
+        self.yaml_error: Optional[yaml.MarkedYAMLError] = None
+        self.parser_error: Optional[ParserError] = None
+        self.tree_error: Optional[Exception] = None
+
+        if tree is None:
+            self._analyze()
+
+    def _analyze(self) -> None:
+        if not self.source:
+            return
+
+        try:
+            # syntax errors are found from the tokens, without
+            # constructing the document
+            tokens = yaml_loader.scan(self.source)
+            yaml_loader.check(self.source, tokens)
+        except yaml.MarkedYAMLError as ex:
+            self.yaml_error = ex
+            return
+
+        self.header = Parser.read_header(self.source, tokens)
+        try:
+            parser = Parser(self.source, header=self.header, tokens=tokens)
+            self.tree = parser.parse()
+            self._tokens = parser.tokens
+        except ParserError as e:
+            self.parser_error = e
+        except Exception as ex:
+            self.tree_error = ex
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # tokens are scanned and positions indexed again on demand
+        state["_tokens"] = None
+        state["_positions"] = None
+        return state
+
+    @property
+    def tokens(self) -> List[Token]:
+        if self._tokens is None:
+            try:
+                self._tokens = yaml_loader.scan(self.source)
+            except yaml.YAMLError:
+                self._tokens = []
+        return self._tokens
+
+    def get_path_to_pos(self, pos: Position) -> List[YamlNode]:
+        """Returns the deepest node of the tree containing the
+        position and its parents, starting from the tree"""
+        if self.tree is None:
+            return []
+
+        if self._positions is None:
+            self._positions = PositionIndex(self.tree)
+        return self._positions.get_path(pos)
+
+    @property
+    def kind(self) -> Optional[str]:
+        if self.header:
+            return self.header.get("kind", None)
+        return None
+
+    def is_up_to_date(self, document: Document) -> bool:
+        return self.version == document.version and self.source == document.source
+
+    def apply_edit(
+        self, document: Document, start_line: int, end_line: int
+    ) -> Optional["DocumentAnalysis"]:
+        """Returns the analysis of the document after its lines from
+        start_line to end_line (in this analysis' source) were replaced.
+        Only the changed block of this analysis' tree is parsed again.
+        The tree is updated in place, so this analysis must not be used
+        afterwards. Returns None if the edit cannot be applied"""
+        if self.tree is None:
+            return None
+
+        try:
+            tree = Parser.reparse(
+                self.tree, self.source, document.source, start_line, end_line
+            )
+        except IncrementalParseError as e:
+            logging.debug("Document will be parsed again: %s", e)
+            return None
+
+        # the edit is inside a nested block, so the top-level
+        # values (kind, spec_version) are the same
+        return DocumentAnalysis(
+            document.uri,
+            document.version,
+            document.source,
+            header=self.header,
+            tree=tree,
+        )
+
+    def validate(self, document: Document) -> List[Diagnostic]:
+        """Returns diagnostics of the document.
+        Validators run only once per analysed version"""
+        if self.diagnostics is None:
+            self.diagnostics = self._get_diagnostics(document)
+
+        return self.diagnostics
+
+    def _get_diagnostics(self, document: Document) -> List[Diagnostic]:
+        if self.yaml_error is not None:
+            return _diagnose_yaml_error(self.yaml_error)
+
+        if self.parser_error is not None:
+            e = self.parser_error
+            return [
+                Diagnostic(
+                    range=Range(
+                        start=Position(line=e.start_pos[0], character=e.start_pos[1]),
+                        end=Position(line=e.end_pos[0], character=e.end_pos[1]),
+                    ),
+                    message=e.message,
+                )
+            ]
+
+        diagnostics = []
+        try:
+            if self.tree_error is not None:
+                raise self.tree_error
+
+            if self.tree is None:
+                return diagnostics
+
+            validator = ValidatorFactory.get_validator(self.tree, document)
+            if validator is not None:
+                diagnostics += validator.validate()
+            diagnostics += _diagnose_tree_errors(self.tree)
+        except ValueError as e:
+            diagnostics.append(
+                Diagnostic(
+                    range=Range(
+                        start=Position(line=0, character=0),
+                        end=Position(line=0, character=0),
+                    ),
+                    message=str(e),
+                )
+            )
+        except Exception as ex:
+            _log_exception(ex)
+
+        return diagnostics
+
+
+class AnalysisCache:
+    """Keeps the latest analysis of every open document.
+
+    Changes of a document are only recorded when they arrive. The analysis
+    is updated on the next access, re-parsing only the edited lines if
+    they are known. Hits of the cache and times of the parse and
+    validate stages are recorded in stats."""
+
+    def __init__(self, stats: ServerStats = None) -> None:
+        self.stats = stats or ServerStats()
+        self._analyses: Dict[str, DocumentAnalysis] = {}
+        # lines edited since the cached analysis: (start, end, lines delta)
+        # where start and end are lines of the analysed source
+        self._edits: Dict[str, Optional[Tuple[int, int, int]]] = {}
+        # dropped when the document is invalidated, so builds which
+        # started before do not store their results
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def get_async(
+        self, document: Document, workers: WorkerPools
+    ) -> DocumentAnalysis:
+        """Returns the analysis of the current version of the document.
+        A document which cannot be re-parsed incrementally is analysed
+        by the workers"""
+        uri = document.uri
+        lock = self._locks.setdefault(uri, asyncio.Lock())
+
+        # builds of the same document are serialized, so every
+        # build starts from the result of the previous one
+        async with lock:
+            analysis = self._analyses.get(uri, None)
+
+            if analysis is not None and analysis.is_up_to_date(document):
+                self.stats.count("analysis.hit")
+                return analysis
+
+            self.stats.count("analysis.miss")
+            analysis = self._apply_edit(document, analysis)
+            if analysis is None:
+                # waiting for a worker included
+                with self.stats.timed("parse"):
+                    analysis = await workers.parse(
+                        build_analysis, uri, document.version, document.source
+                    )
+
+            if self._locks.get(uri) is lock:
+                self._analyses[uri] = analysis
+            return analysis
+
+    async def validate_async(
+        self, analysis: DocumentAnalysis, document: Document, workers: WorkerPools
+    ) -> List[Diagnostic]:
+        """Validates the analysis in the thread pool. Its tree is not
+        updated incrementally until the validation is finished"""
+        loop = asyncio.get_event_loop()
+
+        self.stats.count(
+            "diagnostics.hit" if analysis.diagnostics is not None else "diagnostics.miss"
+        )
+        future = workers.submit(self.stats.wrap("validate", analysis.validate), document)
+        analysis.readers += 1
+        future.add_done_callback(
+            lambda _: loop.call_soon_threadsafe(self._release, analysis)
+        )
+
+        return await asyncio.wrap_future(future)
+
+    @staticmethod
+    def _release(analysis: DocumentAnalysis) -> None:
+        analysis.readers -= 1
+
+    def _apply_edit(
+        self, document: Document, analysis: Optional[DocumentAnalysis]
+    ) -> Optional[DocumentAnalysis]:
+        edit = self._edits.pop(document.uri, None)
+
+        if analysis is None or edit is None or analysis.readers:
+            return None
+
+        with self.stats.timed("parse.incremental"):
+            analysis = analysis.apply_edit(document, edit[0], edit[1])
+        self.stats.count(
+            "parse.incremental.hit" if analysis is not None else "parse.incremental.miss"
+        )
+        return analysis
+
+    def changed(
+        self, uri: str, changes: List[TextDocumentContentChangeEvent]
+    ) -> None:
+        """Records changes of the document received with didChange"""
+        edit = self._edits.get(uri, (None, None, 0))
+
+        for change in changes:
+            change_range = getattr(change, "range", None)
+            if edit is None or change_range is None:
+                edit = None
+                break
+
+            edit = _merge_edits(
+                edit,
+                change_range.start.line,
+                change_range.end.line,
+                change.text.count("\n") - (change_range.end.line - change_range.start.line),
+            )
+
+        self._edits[uri] = edit
+
+    def invalidate(self, uri: str) -> None:
+        self._analyses.pop(uri, None)
+        self._edits.pop(uri, None)
+        self._locks.pop(uri, None)
+
+
+def build_analysis(uri: str, version: Optional[int], source: str) -> DocumentAnalysis:
+    """Analyses the document source. Used by the process pool"""
+    return DocumentAnalysis(uri, version, source)
+
+
+def _merge_edits(
+    edit: Tuple[int, int, int], start_line: int, end_line: int, delta: int
+) -> Tuple[int, int, int]:
+    """Merges the edit of lines start_line - end_line of the current
+    document into the edit of the analysed source"""
+    start, end, total_delta = edit
+
+    if start is None:
+        return start_line, end_line, delta
+
+    if end_line > end + total_delta:
+        end = end_line - total_delta
+
+    return min(start, start_line), end, total_delta + delta
+
+
+def _diagnose_tree_errors(tree: BaseTree) -> list:
+    diagnostics = []
+    for error in tree.errors:
+        d = Diagnostic(
+            range=Range(
+                start=Position(line=error.start_pos[0], character=error.start_pos[1]),
+                end=Position(line=error.end_pos[0], character=error.end_pos[1]),
+            ),
+            message=error.message,
+        )
+        diagnostics.append(d)
+    return diagnostics
+
+
+def _diagnose_yaml_error(ex: yaml.MarkedYAMLError) -> list:
+    mark = ex.problem_mark
+    return [
+        Diagnostic(
+            range=Range(
+                start=Position(line=mark.line - 1, character=mark.column - 1),
+                end=Position(line=mark.line - 1, character=mark.column),
+            ),
+            message=ex.problem,
+            source="TorqueLanguageServer",
+        )
+    ]
+
+
+def _log_exception(ex: Exception) -> None:
+    logging.error(
+        "Error on line %s: %s %s",
+        sys.exc_info()[-1].tb_lineno,
+        type(ex).__name__,
+        ex,
+    )
@@ -0,0 +1,100 @@
+import asyncio
+import logging
+from time import monotonic
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from server.utils.stats import ServerStats
+
+LISTING_TTL = 30  # seconds
+LISTING_MAX_STALE = 600  # seconds
+
+
+class TTLCache:
+    """Caches results of slow calls (e.g. backend listings) per key.
+
+    A result younger than ttl is returned as is. An older one is still
+    returned immediately while a single refresh runs in the background,
+    until it becomes older than max_stale. Concurrent requests for a key
+    without a usable result share one call, so the number of backend calls
+    is bounded however often results are requested. Requests served from
+    the cache are counted in stats as '<name>.hit', others as '<name>.miss'."""
+
+    def __init__(
+        self,
+        ttl: float = LISTING_TTL,
+        max_stale: float = LISTING_MAX_STALE,
+        stats: ServerStats = None,
+        name: str = "cache",
+    ) -> None:
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.stats = stats or ServerStats()
+        self.name = name
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self._generations: Dict[Hashable, int] = {}
+
+    async def get(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+        is_cacheable: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """Returns the cached result or the result of fetch().
+        Results rejected by is_cacheable are returned but not stored"""
+        if self.ttl > 0:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = monotonic() - entry[0]
+                if age < self.ttl:
+                    self.stats.count(f"{self.name}.hit")
+                    return entry[1]
+                if age < self.max_stale:
+                    if key not in self._calls:
+                        self._call(key, fetch, is_cacheable)
+                    self.stats.count(f"{self.name}.hit")
+                    return entry[1]
+
+        self.stats.count(f"{self.name}.miss")
+        call = self._calls.get(key)
+        if call is None:
+            call = self._call(key, fetch, is_cacheable)
+
+        # cancelling one of the waiting requests does not cancel the call
+        return await asyncio.shield(call)
+
+    def invalidate(self, match: Callable[[Hashable], bool] = None) -> None:
+        """Drops the results of keys accepted by match (all if not provided).
+        Calls already running for these keys do not store their results"""
+        for key in set(self._entries) | set(self._calls):
+            if match is None or match(key):
+                self._entries.pop(key, None)
+                self._calls.pop(key, None)
+                self._generations[key] = self._generations.get(key, 0) + 1
+
+    def _call(self, key, fetch, is_cacheable) -> asyncio.Future:
+        generation = self._generations.get(key, 0)
+        call = asyncio.ensure_future(self._fetch(key, generation, fetch, is_cacheable))
+        call.add_done_callback(self._log_error)
+        self._calls[key] = call
+        return call
+
+    async def _fetch(self, key, generation, fetch, is_cacheable) -> Any:
+        try:
+            result = await fetch()
+        finally:
+            if self._generations.get(key, 0) == generation:
+                self._calls.pop(key, None)
+
+        if self._generations.get(key, 0) == generation and (
+            is_cacheable is None or is_cacheable(result)
+        ):
+            self._entries[key] = (monotonic(), result)
+
+        return result
+
+    @staticmethod
+    def _log_error(call: asyncio.Future) -> None:
+        # also retrieves errors of background refreshes nobody waits for
+        if not call.cancelled() and call.exception() is not None:
+            logging.warning(f"Cached call failed: {call.exception()}")
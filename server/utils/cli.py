@@ -0,0 +1,355 @@
+import asyncio
+import functools
+import io
+import logging
+import multiprocessing
+import os
+import runpy
+import subprocess
+import sys
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from multiprocessing.connection import Connection
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pygls.lsp.types import MessageType
+
+MAX_CLI_PROCESSES = 4
+CLI_TIMEOUT = 300  # seconds
+
+SUBPROCESS_EXECUTION = "subprocess"
+WORKER_EXECUTION = "worker"
+
+
+class CliCommandTimeout(Exception):
+    def __init__(self, timeout: float):
+        super().__init__(f"Command did not complete in {timeout} seconds")
+        self.timeout = timeout
+
+
+class _HelperStopped(OSError):
+    """The helper worker stopped before receiving the command"""
+
+
+def _run_module(
+    module: str, args: List[str], env: Optional[Dict[str, str]], cwd: Optional[str]
+) -> Tuple[str, str]:
+    """Runs the module as 'python -m' would do in the current process and
+    returns its stdout and stderr. Arguments, environment and working
+    directory are restored afterwards"""
+    saved_argv = sys.argv
+    saved_env = dict(os.environ)
+    saved_cwd = os.getcwd()
+    stdout, stderr = io.StringIO(), io.StringIO()
+
+    try:
+        sys.argv = [module] + list(args)
+        if env is not None:
+            os.environ.clear()
+            os.environ.update(env)
+        if cwd:
+            os.chdir(cwd)
+
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                runpy.run_module(module, run_name="__main__", alter_sys=True)
+            except SystemExit as ex:
+                if ex.code is not None and not isinstance(ex.code, int):
+                    print(ex.code, file=sys.stderr)
+            except Exception:
+                traceback.print_exc()
+    finally:
+        sys.argv = saved_argv
+        os.environ.clear()
+        os.environ.update(saved_env)
+        os.chdir(saved_cwd)
+
+    return stdout.getvalue(), stderr.getvalue()
+
+
+def _serve_commands(conn: Connection) -> None:
+    """Main loop of a helper worker"""
+    # stdout of the server is the LSP channel, nothing may be written there
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdin = io.StringIO()
+
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            return
+
+        conn.send(_run_module(*request))
+
+
+class _HelperWorker:
+    """Long-lived process running one command at a time. Modules
+    imported by a command are kept for the next ones"""
+
+    def __init__(self) -> None:
+        ctx = multiprocessing.get_context("spawn")
+        self._conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_serve_commands, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def call(self, *request) -> Tuple[str, str]:
+        try:
+            self._conn.send(request)
+        except OSError as ex:
+            raise _HelperStopped(str(ex))
+        try:
+            return self._conn.recv()
+        except (EOFError, OSError):
+            raise RuntimeError("Helper worker stopped while running the command")
+
+    def stop(self) -> None:
+        if self.process.is_alive():
+            self.process.terminate()
+        self._conn.close()
+
+
+class CliRunner:
+    """Runs CLI commands without blocking the event loop.
+
+    Commands run in subprocesses or, in worker execution mode, in helper
+    workers which import the CLI once and then only pay for the command
+    itself. The number of simultaneously running commands is limited, the
+    rest wait for a free slot. Subprocess output lines are sent to the log
+    as soon as they are printed. A command is killed when it times out or
+    when the coroutine awaiting it is cancelled."""
+
+    def __init__(
+        self,
+        log: Callable[[str, MessageType], None],
+        max_processes: int = MAX_CLI_PROCESSES,
+        timeout: Optional[float] = CLI_TIMEOUT,
+        execution: str = WORKER_EXECUTION,
+    ) -> None:
+        self._log = log
+        self.max_processes = max_processes
+        self.timeout = timeout
+        self.execution = execution
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._helpers: List[_HelperWorker] = []
+        self.running = 0
+
+    def configure(
+        self, timeout: Optional[float], max_processes: int, execution: str
+    ) -> None:
+        if execution not in (SUBPROCESS_EXECUTION, WORKER_EXECUTION):
+            logging.warning(f"Unknown CLI execution mode '{execution}'")
+            execution = SUBPROCESS_EXECUTION
+
+        self.timeout = timeout
+        if execution != self.execution:
+            self.execution = execution
+            self.shutdown()
+
+        if max_processes != self.max_processes:
+            self.max_processes = max_processes
+            # running commands release the slots of the old semaphore
+            self._semaphore = None
+
+    async def run_module(
+        self,
+        module: str,
+        args: List[str],
+        log_output: bool = False,
+        log_error: bool = True,
+        use_timeout: bool = True,
+        env: Dict[str, str] = None,
+        cwd: str = None,
+    ) -> Tuple[str, str]:
+        """Runs 'python -m module args' in the configured execution mode
+        and returns stdout and stderr of the command"""
+        if self.execution == WORKER_EXECUTION:
+            async with self._get_semaphore():
+                self.running += 1
+                try:
+                    stdout, stderr = await self._call_helper(
+                        module, args, self.timeout if use_timeout else None, env, cwd
+                    )
+                except OSError as ex:
+                    logging.warning(f"Helper worker is not available, using subprocesses: {ex}")
+                    self.execution = SUBPROCESS_EXECUTION
+                else:
+                    if log_output:
+                        self._log_lines(stdout.encode().split(b"\n"), MessageType.Info)
+                    if log_error:
+                        self._log_lines(stderr.encode().split(b"\n"), MessageType.Error)
+                    return stdout, stderr
+                finally:
+                    self.running -= 1
+
+        return await self.run(
+            [sys.executable, "-m", module] + list(args),
+            log_output=log_output,
+            log_error=log_error,
+            use_timeout=use_timeout,
+            env=env,
+            cwd=cwd,
+        )
+
+    def shutdown(self) -> None:
+        """Stops idle helper workers"""
+        for helper in self._helpers:
+            helper.stop()
+        self._helpers = []
+
+    async def _call_helper(self, module, args, timeout, env, cwd) -> Tuple[str, str]:
+        if self._helpers:
+            try:
+                return await self._call(self._helpers.pop(), module, args, timeout, env, cwd)
+            except _HelperStopped:
+                # the helper died while idle, the command is run by a new one
+                pass
+
+        # raises OSError if a helper cannot be started
+        return await self._call(_HelperWorker(), module, args, timeout, env, cwd)
+
+    async def _call(self, helper, module, args, timeout, env, cwd) -> Tuple[str, str]:
+        future = asyncio.get_event_loop().run_in_executor(
+            None, helper.call, module, args, env, cwd
+        )
+
+        try:
+            result = await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            helper.stop()
+            raise CliCommandTimeout(timeout)
+        except (asyncio.CancelledError, RuntimeError, _HelperStopped):
+            # the helper is still busy with the command or died
+            helper.stop()
+            raise
+
+        self._helpers.append(helper)
+        return result
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_processes)
+
+        return self._semaphore
+
+    async def run(
+        self,
+        args: List[str],
+        log_output: bool = False,
+        log_error: bool = True,
+        use_timeout: bool = True,
+        env: Dict[str, str] = None,
+        cwd: str = None,
+    ) -> Tuple[str, str]:
+        """Runs the command in a subprocess and returns
+        stdout and stderr of the command"""
+        timeout = self.timeout if use_timeout else None
+
+        async with self._get_semaphore():
+            self.running += 1
+            try:
+                return await self._run(args, log_output, log_error, timeout, env, cwd)
+            finally:
+                self.running -= 1
+
+    async def _run(self, args, log_output, log_error, timeout, env, cwd):
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *args,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=env,
+                cwd=cwd,
+            )
+        except NotImplementedError:
+            # the event loop does not support subprocesses (Windows selector loop)
+            stdout, stderr = await asyncio.get_event_loop().run_in_executor(
+                None,
+                functools.partial(self._run_blocking, args, timeout, env, cwd),
+            )
+            if log_output:
+                self._log_lines(stdout.split(b"\n"), MessageType.Info)
+            if log_error:
+                self._log_lines(stderr.split(b"\n"), MessageType.Error)
+
+            return (
+                stdout.decode("utf-8", errors="replace"),
+                stderr.decode("utf-8", errors="replace"),
+            )
+
+        output = asyncio.gather(
+            self._read(proc.stdout, MessageType.Info if log_output else None),
+            self._read(proc.stderr, MessageType.Error if log_error else None),
+            proc.wait(),
+        )
+        # the output is cancelled along with the command
+        output.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+        try:
+            stdout, stderr, _ = await asyncio.wait_for(output, timeout)
+        except asyncio.TimeoutError:
+            self._kill(proc)
+            await proc.wait()
+            raise CliCommandTimeout(timeout)
+        except asyncio.CancelledError:
+            self._kill(proc)
+            # reap the killed process
+            asyncio.ensure_future(proc.wait())
+            raise
+
+        return stdout, stderr
+
+    async def _read(
+        self, stream: asyncio.StreamReader, msg_type: Optional[MessageType]
+    ) -> str:
+        # output is read in chunks since a single line (e.g. json)
+        # may be longer than the stream's line limit
+        chunks = []
+        pending = b""
+
+        while True:
+            chunk = await stream.read(65536)
+            if not chunk:
+                break
+
+            chunks.append(chunk)
+            if msg_type is not None:
+                *lines, pending = (pending + chunk).split(b"\n")
+                self._log_lines(lines, msg_type)
+
+        if msg_type is not None and pending:
+            self._log_lines([pending], msg_type)
+
+        return b"".join(chunks).decode("utf-8", errors="replace")
+
+    @staticmethod
+    def _run_blocking(args, timeout, env, cwd) -> Tuple[bytes, bytes]:
+        try:
+            res = subprocess.run(
+                args,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                env=env,
+                cwd=cwd,
+                timeout=timeout,
+            )
+        except subprocess.TimeoutExpired:
+            raise CliCommandTimeout(timeout)
+
+        return res.stdout, res.stderr
+
+    def _log_lines(self, lines: List[bytes], msg_type: MessageType) -> None:
+        for line in lines:
+            text = line.decode("utf-8", errors="replace").rstrip()
+            if text:
+                self._log(text, msg_type)
+
+    @staticmethod
+    def _kill(proc: asyncio.subprocess.Process) -> None:
+        if proc.returncode is None:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
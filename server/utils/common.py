@@ -1,7 +1,9 @@
+import bisect
+import hashlib
 import logging
 import os
 import pathlib
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Type
 
 from pygls.lsp import types
 from pygls.workspace import Document, position_from_utf16
@@ -16,10 +18,51 @@ from server.ats.trees.common import (
 from server.utils.yaml_utils import format_yaml
 
 
+def load_resource_file(
+    manager: Type["ResourcesManager"],
+    resource_name: str,
+    path: str,
+    digest: str = None,
+) -> Tuple[Optional[dict], str]:
+    """Returns the details of the resource file and the digest of its content.
+    Details are not computed if the content matches the provided digest.
+    Used by the process pool"""
+    with open(path, "rb") as f:
+        content = f.read()
+
+    new_digest = hashlib.sha1(content).hexdigest()
+    if new_digest == digest:
+        return None, new_digest
+
+    resource_tree, error = parse_resource(content.decode("utf-8"))
+    return manager.get_res_details(resource_name, resource_tree, error), new_digest
+
+
+def parse_resource(source: str) -> Tuple[Optional[BaseTree], Optional[str]]:
+    try:
+        return Parser(document=source).parse(), None
+    except ParserError as e:
+        return None, e.message
+    except Exception as e:
+        return None, str(e)
+
+
 class ResourcesManager:
+    """Details of the resources of the workspace by name. Trees are not kept,
+    every resource is summarized by:
+        valid: whether the resource could be parsed
+        kind: kind of the resource
+        inputs: default values of the inputs by name (None if there is no default)
+        outputs: names of the outputs
+        completion: text inserted when the resource is added to a blueprint
+    """
+
     cache = {}
     resource_folder = ""
     resource_type = ""
+    # set while the workspace index is being built in the background,
+    # the cache is then served even if it is incomplete
+    indexing = False
 
     @staticmethod
     def build_completion_text(resource_name: str, resource_tree: BaseTree) -> str:
@@ -37,58 +80,86 @@ class ResourcesManager:
         return output
 
     @classmethod
-    def load_res_details(cls, resource_name: str, resource_source: str):
-        resource_tree = None
-        output = None
-        try:
-            resource_tree = Parser(document=resource_source).parse()
-            output = cls.build_completion_text(resource_name, resource_tree)
-        except ParserError as e:
+    def load_res_details(
+        cls, resource_name: str, resource_source: str, resource_tree=None
+    ):
+        error = None
+        if resource_tree is None:
+            resource_tree, error = parse_resource(resource_source)
+
+        cls.cache[resource_name] = cls.get_res_details(resource_name, resource_tree, error)
+
+    @classmethod
+    def get_res_details(
+        cls, resource_name: str, resource_tree: Optional[BaseTree], error: str = None
+    ) -> dict:
+        details = {
+            "valid": resource_tree is not None,
+            "kind": None,
+            "inputs": {},
+            "outputs": [],
+            "completion": None,
+        }
+
+        if resource_tree is None:
             logging.warning(
-                f"Unable to load {cls.resource_type} '{resource_name}.yaml' due to error: {e.message}"
+                f"Unable to load {cls.resource_type} '{resource_name}.yaml' due to error: {error}"
             )
+            return details
+
+        try:
+            details["kind"] = resource_tree.kind.text if resource_tree.kind else None
+            details["inputs"] = {
+                input_node.key.text: input_node.value.text if input_node.value else None
+                for input_node in resource_tree.get_inputs()
+            }
+            details["outputs"] = [out.text for out in resource_tree.get_outputs()]
+            output = cls.build_completion_text(resource_name, resource_tree)
+            details["completion"] = format_yaml(output) if output else None
         except Exception as e:
             logging.warning(
                 f"Unable to load {cls.resource_type} '{resource_name}.yaml' due to error: {str(e)}"
             )
 
-        cls.cache[resource_name] = {
-            "tree": resource_tree,
-            "completion": format_yaml(output) if output else None,
-        }
+        return details
 
     @classmethod
-    def reload_resource_details(cls, resource_name, resource_source):
-        if cls.cache:  # if there is already a cache, add this file
-            cls.load_res_details(resource_name, resource_source)
+    def reload_resource_details(cls, resource_name, resource_source, resource_tree=None):
+        if cls.cache or cls.indexing:  # if there is already a cache, add this file
+            cls.load_res_details(resource_name, resource_source, resource_tree)
 
     @classmethod
     def remove_resource_details(cls, resource_name):
-        if cls.cache:  # if there is already a cache, remove this file
+        if cls.cache or cls.indexing:  # if there is already a cache, remove this file
             if resource_name in cls.cache:
                 cls.cache.pop(resource_name)
 
     @classmethod
     def get_available_resources(cls, root_folder: str = None):
-        if cls.cache:
+        if cls.cache or cls.indexing:
             return cls.cache
         else:
             if root_folder:
-                resources_path = os.path.join(root_folder, cls.resource_folder)
-                if os.path.exists(resources_path):
-                    for folder in os.listdir(resources_path):
-                        res_dir = os.path.join(resources_path, folder)
-                        if os.path.isdir(res_dir):
-                            files = os.listdir(res_dir)
-                            if f"{folder}.yaml" in files:
-                                f = open(os.path.join(res_dir, f"{folder}.yaml"), "r")
-                                source = f.read()
-                                cls.load_res_details(folder, source)
+                for name, path in cls.find_resource_files(root_folder).items():
+                    cls.cache[name], _ = load_resource_file(cls, name, path)
 
                 return cls.cache
             else:
                 return None
 
+    @classmethod
+    def find_resource_files(cls, root_folder: str) -> Dict[str, str]:
+        """Returns paths of '<name>/<name>.yaml' files in the resource folder by name"""
+        files = {}
+        resources_path = os.path.join(root_folder, cls.resource_folder)
+        if os.path.exists(resources_path):
+            for folder in os.listdir(resources_path):
+                path = os.path.join(resources_path, folder, f"{folder}.yaml")
+                if os.path.isfile(path):
+                    files[folder] = path
+
+        return files
+
     @classmethod
     def get_available_resources_names(cls):
         if cls.cache:
@@ -99,62 +170,92 @@ class ResourcesManager:
     @classmethod
     def get_inputs(cls, resource_name):
         if resource_name in cls.cache:
-            resource_tree = cls.cache[resource_name]["tree"]
-            if resource_tree and resource_tree.inputs:
-                inputs = {}
-                for input_node in resource_tree.get_inputs():
-                    inputs[input_node.key.text] = (
-                        input_node.value.text if input_node.value else None
-                    )
-                return inputs
+            return dict(cls.cache[resource_name]["inputs"])
 
         return {}
 
     @classmethod
     def get_outputs(cls, resource_name):
         if resource_name in cls.cache:
-            res_tree = cls.cache[resource_name]["tree"]
-            outputs = [out.text for out in res_tree.get_outputs()]
-            return outputs
+            return list(cls.cache[resource_name]["outputs"])
 
         return []
 
 
-class Visitor:
-    def __init__(self, cursor_position: types.Position):
-        self.found_node = None
-        self.cursor_position = Position(
-            line=cursor_position.line, col=cursor_position.character
-        )
+class PositionIndex:
+    """Finds the deepest node containing a position.
 
-    def visit_node(self, node: YamlNode):
-        start = Position(node.start_pos[0], node.start_pos[1])
-        end = Position(node.end_pos[0], node.end_pos[1])
+    The children of every visited node are indexed by their start and end
+    positions, so the lookup costs a binary search per tree level. The
+    index is built lazily and must be dropped when the tree changes."""
 
-        if start <= self.cursor_position <= end:
-            self.found_node = node
+    def __init__(self, tree: BaseTree) -> None:
+        self.tree = tree
+        # id of node -> (children, start positions, end positions, sorted)
+        self._children: Dict[int, Tuple[list, list, list, bool]] = {}
 
-            for child in node.get_children():
-                self.visit_node(child)
+    def get_path(self, pos: types.Position) -> List[YamlNode]:
+        """Returns the found node and its parents, starting from the tree"""
+        cursor = (pos.line, pos.character)
+        node = self.tree
+        if node.start_pos is None or not node.start_pos <= cursor <= node.end_pos:
+            return []
 
+        child = self._find_child(node, cursor)
+        while child is not None:
+            node = child
+            child = self._find_child(node, cursor)
+
+        path: List[YamlNode] = []
+        while node:
+            path.append(node)
+            node = node.parent
+        path.reverse()
+        return path
+
+    def _find_child(self, node: YamlNode, cursor: Tuple[int, int]) -> Optional[YamlNode]:
+        """Returns the last child containing the cursor"""
+        entry = self._children.get(id(node))
+        if entry is None:
+            entry = self._index_children(node)
+
+        children, starts, ends, is_sorted = entry
+        if is_sorted:
+            i = bisect.bisect_right(starts, cursor) - 1
+            if i >= 0 and cursor <= ends[i]:
+                return children[i]
+            return None
+
+        for i in range(len(children) - 1, -1, -1):
+            if starts[i] <= cursor <= ends[i]:
+                return children[i]
+        return None
 
-def get_path_to_pos(tree: BaseTree, pos: Position) -> List[YamlNode]:
-    v = Visitor(cursor_position=pos)
-    tree.accept(visitor=v)
+    def _index_children(self, node: YamlNode):
+        children = list(node.get_children())
+        starts = [child.start_pos for child in children]
+        ends = [child.end_pos for child in children]
+        # with non-decreasing starts and ends the children containing
+        # a position are consecutive and the last one is found by bisection
+        is_sorted = all(
+            starts[i] <= starts[i + 1] and ends[i] <= ends[i + 1]
+            for i in range(len(children) - 1)
+        )
+        entry = (children, starts, ends, is_sorted)
+        self._children[id(node)] = entry
+        return entry
 
-    if not v.found_node:
-        return []
 
-    path: List[YamlNode] = []
-    node = v.found_node
-    while node:
-        path.insert(0, node)
-        node = node.parent
-    return path
+def get_path_to_pos(tree: BaseTree, pos: types.Position) -> List[YamlNode]:
+    return PositionIndex(tree).get_path(pos)
 
 
-def is_var_allowed(tree: BaseTree, pos: Position) -> bool:
-    path = get_path_to_pos(tree, pos)
+def is_var_allowed(
+    tree: BaseTree, pos: types.Position, path: List[YamlNode] = None
+) -> bool:
+    """Path to the position is looked up if not provided"""
+    if path is None:
+        path = get_path_to_pos(tree, pos)
 
     if not path:
         return False
@@ -181,8 +282,11 @@ def get_nearest_text_key(path: List[YamlNode], pos: Position):
         if key is not None:
             break
         else:
-            node = get_parent_node(path, pos)
-    
+            parent = get_parent_node(path, pos)
+            # the parent is found by the path, not by the node,
+            # so it is the same one when it has no key either
+            node = parent if parent is not node else None
+
     return key
 
 
@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import os
+import pickle
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type
+
+from server.utils.common import ResourcesManager, load_resource_file
+
+INDEX_FILE = "resources-index.pickle"
+INDEX_VERSION = 1
+
+# path -> ((mtime, size), digest, resource type, resource name, details)
+StoredResources = Dict[str, Tuple[Tuple[int, int], str, str, str, dict]]
+
+
+class ResourceStore:
+    """Keeps details of the indexed resources on disk between sessions.
+
+    A stored resource is reused while the modification time and size of
+    its file are unchanged, or when the digest of the content still matches
+    (e.g. the file was touched by a checkout)."""
+
+    def __init__(self, storage_path: str) -> None:
+        self.path = os.path.join(storage_path, INDEX_FILE)
+
+    def load(self) -> StoredResources:
+        try:
+            with open(self.path, "rb") as f:
+                data = pickle.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as ex:
+            logging.warning(f"Unable to load the resources index: {ex}")
+            return {}
+
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            return {}
+
+        return data["resources"]
+
+    def save(self, resources: StoredResources) -> None:
+        tmp_path = self.path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump(
+                    {"version": INDEX_VERSION, "resources": resources},
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            # readers never see a partially written index
+            os.replace(tmp_path, self.path)
+        except Exception as ex:
+            logging.warning(f"Unable to save the resources index: {ex}")
+
+
+async def index_resources(
+    root_folder: str,
+    managers: List[Type[ResourcesManager]],
+    parse: Callable[..., Awaitable[Any]],
+    report: Optional[Callable[[int, int], None]] = None,
+    store: Optional[ResourceStore] = None,
+) -> int:
+    """Fills the caches of the resource managers with all resources of the
+    workspace and returns the number of indexed files.
+
+    Files are loaded concurrently by parse(load_resource_file, ...), e.g.
+    WorkerPools.parse. Unchanged files found in the store are not parsed.
+    While the index is being built managers serve the resources loaded so
+    far. report(done, total) is called after every indexed file."""
+    managers = [manager for manager in managers if not manager.cache]
+    files = [
+        (manager, name, path)
+        for manager in managers
+        for name, path in manager.find_resource_files(root_folder).items()
+    ]
+    stored = store.load() if store else {}
+    indexed: StoredResources = {}
+
+    async def load(manager, name, path):
+        stat = os.stat(path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        record = stored.get(path)
+        if record and record[2:4] != (manager.resource_type, name):
+            record = None
+
+        if record and record[0] == stamp:
+            details, digest = record[4], record[1]
+        else:
+            details, digest = await parse(
+                load_resource_file, manager, name, path, record[1] if record else None
+            )
+            if details is None:
+                # the content is unchanged
+                details = record[4]
+
+        indexed[path] = (stamp, digest, manager.resource_type, name, details)
+        return manager, name, details
+
+    for manager in managers:
+        manager.indexing = True
+
+    done = 0
+    try:
+        for loading in asyncio.as_completed([load(*file) for file in files]):
+            try:
+                manager, name, details = await loading
+            except Exception as ex:
+                logging.warning(f"Unable to index resource: {ex}")
+            else:
+                # documents reloaded meanwhile are newer than the files
+                if name not in manager.cache:
+                    manager.cache[name] = details
+
+            done += 1
+            if report:
+                report(done, len(files))
+    finally:
+        for manager in managers:
+            manager.indexing = False
+
+    if store and managers:
+        # keep resources of managers which were already loaded
+        types = {manager.resource_type for manager in managers}
+        resources = {path: res for path, res in stored.items() if res[2] not in types}
+        resources.update(indexed)
+        store.save(resources)
+
+    return done
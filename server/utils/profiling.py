@@ -0,0 +1,129 @@
+import cProfile
+import itertools
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from typing import Callable, List, Optional
+
+# frames kept per allocation traced by tracemalloc
+TRACEMALLOC_FRAMES = 10
+# allocations written to the log when a memory session ends
+TRACEMALLOC_TOP = 20
+
+# numbers the sessions of the process, several may start in a second
+_session_numbers = itertools.count(1)
+
+
+def get_log_directory() -> str:
+    """Directory of the log file of the server (the working
+    directory if the log is not written to a file)"""
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, logging.FileHandler):
+            return os.path.dirname(handler.baseFilename)
+    return os.getcwd()
+
+
+class ProfilingSession:
+    """cProfile session of the event loop thread and of the jobs of the
+    worker threads (see WorkerPools), optionally with a tracemalloc
+    snapshot. The session ends after the number of requests (if given)
+    or when stopped, writing the .pstats and .tracemalloc files to the
+    directory.
+
+    Profiles of the worker threads are merged into the profile of the
+    event loop thread. Jobs still running when the session ends are
+    not included."""
+
+    def __init__(
+        self, directory: str, memory: bool = False, requests: Optional[int] = None
+    ) -> None:
+        self.directory = directory
+        self.memory = memory
+        self.requests = requests
+        self.name = (
+            f"torque_ls-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+            f"-{next(_session_numbers)}"
+        )
+        self.active = False
+        self._profile = cProfile.Profile()
+        self._worker_profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        # tracemalloc may be tracing already (e.g. PYTHONTRACEMALLOC)
+        self._stop_tracing = False
+
+    def start(self) -> None:
+        """Starts profiling the calling thread"""
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._stop_tracing = True
+
+        self.active = True
+        self._profile.enable()
+
+    def stop(self) -> List[str]:
+        """Stops the session, must be called by the thread which started
+        it. Returns the paths of the written files"""
+        self._profile.disable()
+        with self._lock:
+            self.active = False
+            profiles = list(self._worker_profiles)
+
+        paths = []
+        stats = pstats.Stats(self._profile)
+        for profile in profiles:
+            stats.add(profile)
+        path = os.path.join(self.directory, f"{self.name}.pstats")
+        stats.dump_stats(path)
+        paths.append(path)
+
+        if self.memory and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            if self._stop_tracing:
+                tracemalloc.stop()
+
+            path = os.path.join(self.directory, f"{self.name}.tracemalloc")
+            snapshot.dump(path)
+            paths.append(path)
+
+            top = snapshot.statistics("lineno")[:TRACEMALLOC_TOP]
+            logging.info(
+                "Top allocations:\n%s", "\n".join(str(stat) for stat in top)
+            )
+
+        logging.info("Profiling session written to %s", ", ".join(paths))
+        return paths
+
+    def request_done(self) -> bool:
+        """Counts a handled request, returns True when the number of
+        requests of the session is reached"""
+        if self.requests is None:
+            return False
+        self.requests -= 1
+        return self.requests <= 0
+
+    def wrap(self, func: Callable) -> Callable:
+        """Returns the function profiled in the thread calling it"""
+
+        def profiled(*args, **kwargs):
+            if not self.active:
+                return func(*args, **kwargs)
+
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # since Python 3.12 the profile of the session
+                # covers all the threads
+                return func(*args, **kwargs)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profile.disable()
+                with self._lock:
+                    if self.active:
+                        self._worker_profiles.append(profile)
+
+        return profiled
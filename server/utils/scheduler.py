@@ -0,0 +1,60 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional
+
+
+class DocumentScheduler:
+    """Runs a job per document after a quiet period.
+
+    Scheduling a new job for a document cancels the pending or
+    running one, so only the latest job is completed."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def schedule(
+        self,
+        uri: str,
+        job: Callable[[], Awaitable],
+        delay: Optional[float] = None,
+    ) -> asyncio.Task:
+        self.cancel(uri)
+
+        delay = self.delay if delay is None else delay
+        task = asyncio.ensure_future(self._run(job, delay))
+        self._tasks[uri] = task
+        task.add_done_callback(lambda t: self._forget(uri, t))
+
+        return task
+
+    def cancel(self, uri: str) -> None:
+        task = self._tasks.pop(uri, None)
+        if task is not None:
+            task.cancel()
+
+    def cancel_all(self) -> None:
+        for uri in list(self._tasks):
+            self.cancel(uri)
+
+    def is_scheduled(self, uri: str) -> bool:
+        return uri in self._tasks
+
+    @property
+    def pending(self) -> int:
+        return len(self._tasks)
+
+    async def _run(self, job: Callable[[], Awaitable], delay: float) -> None:
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        try:
+            await job()
+        except asyncio.CancelledError:
+            raise
+        except Exception as ex:
+            logging.exception("Scheduled job failed: %s", ex)
+
+    def _forget(self, uri: str, task: asyncio.Task) -> None:
+        if self._tasks.get(uri) is task:
+            self._tasks.pop(uri)
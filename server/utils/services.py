@@ -2,6 +2,7 @@ import pathlib
 import re
 
 import yaml
+from server.ats import yaml_loader
 from server.utils.common import ResourcesManager
 
 SERVICES = {}
@@ -24,7 +25,7 @@ class ServicesManager(ResourcesManager):
     def get_service_vars(service_dir_path: str):
         with open(service_dir_path.replace("file://", ""), "r") as stream:
             try:
-                yaml_obj = yaml.load(stream, Loader=yaml.FullLoader)
+                yaml_obj = yaml_loader.load(stream)
                 doc_type = yaml_obj.get("kind", "")
             except yaml.YAMLError:
                 return []
@@ -0,0 +1,151 @@
+import asyncio
+import bisect
+import functools
+import threading
+from contextlib import contextmanager
+from time import monotonic, perf_counter
+from typing import Callable, Dict, List, Optional
+
+# upper bounds (in seconds) of the buckets of latency histograms,
+# the last bucket has no bound
+LATENCY_BUCKETS = (
+    0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 30
+)
+
+
+class Histogram:
+    """Latencies of an operation counted in LATENCY_BUCKETS"""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets: List[int] = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def add(self, seconds: float, failed: bool = False) -> None:
+        self.count += 1
+        self.errors += failed
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def percentile(self, p: float) -> float:
+        """Upper bound of the bucket of the p-th percentile (the
+        maximum for the last bucket)"""
+        rank = p / 100 * self.count
+        seen = 0
+        for i, count in enumerate(self.buckets[:-1]):
+            seen += count
+            if seen >= rank:
+                return min(LATENCY_BUCKETS[i], self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        """Times in milliseconds"""
+        bounds = [f"<={b * 1000:g}ms" for b in LATENCY_BUCKETS] + ["more"]
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": self.total * 1000 / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(50) * 1000,
+            "p95_ms": self.percentile(95) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "max_ms": self.max * 1000,
+            "histogram": {b: c for b, c in zip(bounds, self.buckets) if c},
+        }
+
+
+class ServerStats:
+    """Latencies of handlers and stages of the server and counters of
+    events (e.g. cache hits). Records may come from worker threads.
+
+    Counters named '<name>.hit' and '<name>.miss' are reported as the
+    hit ratio of <name>."""
+
+    def __init__(self) -> None:
+        self.started = monotonic()
+        self.latencies: Dict[str, Histogram] = {}
+        self.counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float, failed: bool = False) -> None:
+        with self._lock:
+            histogram = self.latencies.get(name)
+            if histogram is None:
+                histogram = self.latencies[name] = Histogram()
+            histogram.add(seconds, failed)
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    @contextmanager
+    def timed(self, name: str):
+        start = perf_counter()
+        failed = False
+        try:
+            yield
+        except asyncio.CancelledError:
+            # cancellations are not failures (CancelledError is
+            # an Exception before Python 3.8)
+            raise
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.record(name, perf_counter() - start, failed)
+
+    def wrap(
+        self, name: str, func: Callable, done: Callable[[], None] = None
+    ) -> Callable:
+        """Returns the function (or coroutine function) recording the
+        latency of its calls and calling done after each of them. The
+        signature is kept, since pygls inspects it to pass the server"""
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                try:
+                    with self.timed(name):
+                        return await func(*args, **kwargs)
+                finally:
+                    if done is not None:
+                        done()
+
+        else:
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                try:
+                    with self.timed(name):
+                        return func(*args, **kwargs)
+                finally:
+                    if done is not None:
+                        done()
+
+        return wrapper
+
+    def hit_ratios(self) -> Dict[str, float]:
+        ratios = {}
+        for key in self.counters:
+            name, _, event = key.rpartition(".")
+            if event in ("hit", "miss") and name not in ratios:
+                hits = self.counters.get(f"{name}.hit", 0)
+                ratios[name] = hits / (hits + self.counters.get(f"{name}.miss", 0))
+        return ratios
+
+    def snapshot(self, gauges: Optional[Dict[str, int]] = None) -> dict:
+        """Stats as a JSON serializable dictionary, with the current
+        values of the gauges (e.g. queue depths)"""
+        with self._lock:
+            return {
+                "uptime": monotonic() - self.started,
+                "latencies": {
+                    name: histogram.to_dict()
+                    for name, histogram in sorted(self.latencies.items())
+                },
+                "counters": dict(sorted(self.counters.items())),
+                "hit_ratios": self.hit_ratios(),
+                "gauges": dict(gauges or {}),
+            }
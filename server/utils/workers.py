@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import multiprocessing
+import pickle
+import sys
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from server.utils.profiling import ProfilingSession
+
+PROCESS_EXECUTOR = "process"
+THREAD_EXECUTOR = "thread"
+
+
+class WorkerPools:
+    """Executors running CPU-bound work off the event loop.
+
+    Trees are built in a process pool (or in the thread pool if configured),
+    so several documents can be parsed on multiple cores. Validation needs
+    the resources cached by the server process and always runs in the
+    thread pool. Pools are created on first use.
+
+    While a profiling session is set, jobs are profiled in the thread pool,
+    parsing included."""
+
+    def __init__(
+        self, parser_executor: str = PROCESS_EXECUTOR, max_workers: Optional[int] = None
+    ) -> None:
+        self.parser_executor = parser_executor
+        self.max_workers = max_workers
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self.profiling: Optional[ProfilingSession] = None
+        # jobs submitted and not done, in both pools
+        self.pending = 0
+        self._lock = threading.Lock()
+
+    def configure(self, parser_executor: str, max_workers: Optional[int]) -> None:
+        if parser_executor not in (PROCESS_EXECUTOR, THREAD_EXECUTOR):
+            logging.warning(f"Unknown executor '{parser_executor}'")
+            parser_executor = PROCESS_EXECUTOR
+
+        if (parser_executor, max_workers) == (self.parser_executor, self.max_workers):
+            return
+
+        self.parser_executor = parser_executor
+        self.max_workers = max_workers
+        # running jobs are completed by the old pools
+        self.shutdown(wait=False)
+
+    def submit(self, func: Callable, *args) -> Future:
+        """Submits the function to the thread pool"""
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(max_workers=self.max_workers)
+        if self.profiling is not None:
+            func = self.profiling.wrap(func)
+
+        return self._track(self._threads.submit(func, *args))
+
+    async def run(self, func: Callable, *args) -> Any:
+        """Runs the function in the thread pool"""
+        return await asyncio.wrap_future(self.submit(func, *args))
+
+    async def parse(self, func: Callable, *args) -> Any:
+        """Runs the function building a tree in the configured pool.
+        Function, arguments and result must be picklable to be
+        sent to the process pool"""
+        if self.parser_executor == PROCESS_EXECUTOR and self.profiling is None:
+            try:
+                executor = self._get_processes()
+                future = self._track(executor.submit(func, *args))
+                return await asyncio.wrap_future(future)
+            except (OSError, RuntimeError, pickle.PicklingError) as ex:
+                # BrokenProcessPool is a RuntimeError
+                logging.warning(f"Process pool is not available, using threads: {ex}")
+                self._shutdown_executor(self._processes, wait=False)
+                self._processes = None
+                self.parser_executor = THREAD_EXECUTOR
+
+        return await self.run(func, *args)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._shutdown_executor(self._processes, wait)
+        self._shutdown_executor(self._threads, wait)
+        self._processes = None
+        self._threads = None
+
+    def _track(self, future: Future) -> Future:
+        with self._lock:
+            self.pending += 1
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, _: Future) -> None:
+        # called by the thread completing the job
+        with self._lock:
+            self.pending -= 1
+
+    def _get_processes(self) -> ProcessPoolExecutor:
+        if self._processes is None:
+            kwargs = {}
+            if sys.version_info >= (3, 7):
+                # forking a process running threads is not safe
+                kwargs["mp_context"] = multiprocessing.get_context("spawn")
+            self._processes = ProcessPoolExecutor(max_workers=self.max_workers, **kwargs)
+
+        return self._processes
+
+    @staticmethod
+    def _shutdown_executor(executor: Optional[Executor], wait: bool) -> None:
+        if executor is not None:
+            executor.shutdown(wait=wait)
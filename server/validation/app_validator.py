@@ -4,11 +4,12 @@ from server.validation.common import ValidationHandler
 
 
 class AppValidationHandler(ValidationHandler):
+    deprecated_properties = {"ostype": "os_type under source"}
+
     def validate(self):
-        deprecated_properties = {"ostype": "os_type under source"}
         super().validate()
         # warnings
-        self._check_for_deprecated_properties(deprecated_properties)
+        self._check_for_deprecated_properties()
         # errors
         self._validate_script_files_exist()
 
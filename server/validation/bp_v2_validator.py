@@ -1,6 +1,5 @@
 import re
-from tracemalloc import start
-from typing import List
+from typing import Dict, List, Set, Tuple, Union
 
 from server.ats.trees.blueprint_v2 import BlueprintV2OutputNode, BlueprintV2Tree, GrainNode, GrainObject, GrainSpecNode, GrainSpecScripts, ScriptObject, ScriptOutputsObject
 from server.ats.trees.common import NodeError, TextNode, YamlNode
@@ -8,8 +7,16 @@ from server.validation.common import ValidationHandler
 from pygls.workspace import Document
 from pygls.lsp.types.basic_structures import DiagnosticSeverity
 
+_EXPRESSION = re.compile(r"\{\{[^\{\}]*\}\}")
+
 
 class ExpressionValidationVisitor:
+    """Validates the {{ ... }} expressions of a tree.
+
+    Dependencies and outputs of grains are indexed by name once per
+    validation and the result of every expression is memoized by the
+    expression and the grain or output it is used in"""
+
     reserved_words = ["sandboxid"]
     prefixes = ["inputs", "grains", "params"]
     pipe_commands = ["downcase"]
@@ -17,19 +24,25 @@ class ExpressionValidationVisitor:
 
     def __init__(self, tree: BlueprintV2Tree) -> None:
         self.tree = tree
+        self.errors: List[NodeError] = []
         self.processors_map = {
             GrainNode: self._do_process_grain,
             BlueprintV2OutputNode: self._do_process_blueprint_output,
         }
-        
+
+        # by id of the grain node
+        self._deps: Dict[int, Set[str]] = {}
+        # by grain name and script type (None for the grain's outputs),
+        # output names or the error of the grain or script
+        self._outputs: Dict[Tuple[str, str], Union[Set[str], str]] = {}
+        # by expression and id of the grain or output node it is used in
+        self._results: Dict[Tuple[str, int], str] = {}
+
     def visit_node(self, node: YamlNode):
-        if isinstance(node, TextNode) and node.allow_vars:
+        if isinstance(node, TextNode) and node.allow_vars and "{{" in node.text:
             node_text = node.text
 
-            regex = re.compile("\{\{[^\{\}]*\}\}")
-            exprs = regex.finditer(node_text)
-
-            for match in exprs:
+            for match in _EXPRESSION.finditer(node_text):
                 expression = match.group()[2:-2].strip()
                 offset = match.span()
                 if node.style:
@@ -38,7 +51,7 @@ class ExpressionValidationVisitor:
                 error = self.validate_expression(expression, node)
 
                 if error:
-                    node.add_error(
+                    self.errors.append(
                         NodeError(
                             start_pos=(node.start_pos[0], node.start_pos[1] + offset[0]),
                             end_pos=(node.end_pos[0], node.start_pos[1] + offset[1]),
@@ -49,6 +62,18 @@ class ExpressionValidationVisitor:
             self.visit_node(child)
 
     def validate_expression(self, expression: str, node: YamlNode) -> str:
+        node_to_process = self._find_nearest_available_node(node)
+        key = (expression, id(node_to_process))
+        try:
+            return self._results[key]
+        except KeyError:
+            pass
+
+        error = self._validate_expression(expression, node_to_process)
+        self._results[key] = error
+        return error
+
+    def _validate_expression(self, expression: str, node_to_process: YamlNode) -> str:
         if not expression:
             return "Expression could not be empty"
 
@@ -73,7 +98,6 @@ class ExpressionValidationVisitor:
             if expr_parts[0] not in self.prefixes:
                 return f"Prefix '.{expr_parts[0]}' is not allowed"
 
-            node_to_process = self._find_nearest_available_node(node)
             if node_to_process:
                 helper_func = self.processors_map.get(type(node_to_process), None)
                 if helper_func:
@@ -92,6 +116,45 @@ class ExpressionValidationVisitor:
     def _do_process_blueprint_output(self, parts: List[str], node: GrainNode):
         return self._expression_parts_validate(parts, node)
 
+    def _get_deps(self, node: GrainNode) -> Set[str]:
+        deps = self._deps.get(id(node))
+        if deps is None:
+            deps = self._deps[id(node)] = {d["name"] for d in node.value.get_deps()}
+        return deps
+
+    def _get_outputs(self, dep_grain: str, script_type: str = None) -> Union[Set[str], str]:
+        key = (dep_grain, script_type)
+        outputs = self._outputs.get(key)
+        if outputs is None:
+            outputs = self._outputs[key] = self._read_outputs(dep_grain, script_type)
+        return outputs
+
+    def _read_outputs(self, dep_grain: str, script_type: str = None) -> Union[Set[str], str]:
+        dep_grain_node = self.tree.get_grain(dep_grain)
+
+        if dep_grain_node is None:
+            return f"Grain {dep_grain} is not defined"
+
+        dep_grain_obj: GrainObject = dep_grain_node.value
+        spec_node: GrainSpecNode = dep_grain_obj.spec if dep_grain_obj else None
+
+        if spec_node is None or spec_node.value is None:
+            return f"Grain '{dep_grain}' does not have outputs"
+
+        if script_type is None:
+            return {spec.text for spec in spec_node.value.get_outputs()}
+
+        scripts: GrainSpecScripts = spec_node.scripts.value if spec_node.scripts else None
+
+        if scripts is None:
+            return f"Scripts are not a defined in the grain '{dep_grain}'"
+        script = getattr(scripts, script_type, None)
+
+        if not script or not script.value or not isinstance(script.value, ScriptOutputsObject):
+            return f"Wrong type of the script '{script_type}'"
+
+        return {output.text for output in script.value.get_outputs()}
+
     def _expression_parts_validate(
         self, parts: List[str],
         node: YamlNode,
@@ -105,11 +168,10 @@ class ExpressionValidationVisitor:
                 dep_grain = parts[1]
 
                 if is_grain_object:
-                    refered_deps_names = [d["name"] for d in node.value.get_deps()]
                     # check grain name
                     if dep_grain == node.identifier:
                         return "Grain cannot refer to itself"
-                    elif dep_grain not in refered_deps_names:
+                    elif dep_grain not in self._get_deps(node):
                         return f"You must list referred grain '{dep_grain}' in depends-on property"
 
                 elif dep_grain not in self.tree.get_grains_names():
@@ -122,38 +184,24 @@ class ExpressionValidationVisitor:
                 grain_prop = parts[2]
                 output: str = ''
 
-                dep_grain_node = self.tree.grains.get_mapping_by_key(dep_grain)
-
-                if dep_grain_node is None:
-                    return f"Grain {dep_grain} is not defined"
-
-                spec_node: GrainSpecNode = dep_grain_node.get_value().spec
-
-                if spec_node is None or spec_node.value is None:
-                    return f"Grain '{dep_grain}' does not have outputs"
-
                 if grain_prop == "scripts":
-                    script_type = parts[3]
-                    scripts: GrainSpecScripts = spec_node.scripts.value
- 
-                    if scripts is None:
-                        return f"Scripts are not a defined in the grain '{dep_grain}'"
-                    script = getattr(scripts, script_type, None)
-
-                    if not script or not script.value or not isinstance(script.value, ScriptOutputsObject):
-                        return f"Wrong type of the script '{script_type}'"
-
-                    else:
-                        script = script.value
+                    # the grain is checked before the script is read
+                    outputs_names = self._get_outputs(dep_grain)
+                    if not isinstance(outputs_names, str):
+                        outputs_names = self._get_outputs(dep_grain, parts[3])
+                    if isinstance(outputs_names, str):
+                        return outputs_names
 
                     if parts[4] != "outputs":
                         return f"Wrong script property '{parts[5]}."
 
                     output = parts[5]
-                    outputs_names = [output.text for output in script.get_outputs()]
                 else:
+                    outputs_names = self._get_outputs(dep_grain)
+                    if isinstance(outputs_names, str):
+                        return outputs_names
+
                     output = parts[3]
-                    outputs_names = [spec.text for spec in spec_node.value.get_outputs()]
                 error_msg = f"Output '{output}' is not part of the '{dep_grain}' grain's outputs"
                 if output not in outputs_names:
                     return error_msg
@@ -166,9 +214,8 @@ class ExpressionValidationVisitor:
                 return "Not a valid expression"
 
             input_name = parts[1]
-            inputs_node = self.tree.inputs
 
-            if inputs_node is None or inputs_node.get_mapping_by_key(input_name) is None:
+            if input_name not in self.tree.get_inputs_names():
                 return f"Input '{input_name}' is not defined in a blueprint"
 
 
@@ -177,9 +224,6 @@ class BlueprintSpec2Validator(ValidationHandler):
         self.tree = tree
         super().__init__(tree, document)
 
-    def _get_grains_names(self):
-        return [node.key.text for node in self.tree.grains.nodes]
-
     def _validate_no_duplicates_in_grain_outputs(self):
         message = "Multiple declarations of output '{}'"
 
@@ -217,16 +261,8 @@ class BlueprintSpec2Validator(ValidationHandler):
     def _check_unused_blueprint_inputs(self):
         for input_node in self.tree.input_list:
             input_name = input_node.key.text
-            doc_lines = self._document.lines
-            match = []
-            
-            regex = re.compile("^(?!.*#).*\{\{\s*.inputs\.(" + input_name + ")\s*\}\}")
-
-            for line in doc_lines:
-                match += regex.findall(line)
-    
-            if not match:
 
+            if input_name not in self._variables.inputs:
                 self._add_diagnostic(
                     node = input_node.key,
                     message=f"The defined input '{input_name}' is not accessed",
@@ -234,9 +270,10 @@ class BlueprintSpec2Validator(ValidationHandler):
                 )
             
     def _validate_grain_dep_exists(self):
+        grains_names = self.tree.get_grains_names()
+
         for grain in self.tree.grain_nodes:
             grain_name = grain.key.text
-            grains_list = self._get_grains_names()
             deps = grain.value.get_deps() if grain.value else None
 
             if deps is None:
@@ -246,7 +283,7 @@ class BlueprintSpec2Validator(ValidationHandler):
                 start_pos = d["start"]
                 end_pos = d["end"]
 
-                if d["name"] not in grains_list:
+                if d["name"] not in grains_names:
                     self._add_diagnostic(
                         start_pos=(start_pos.line, start_pos.col),
                         end_pos=(end_pos.line, end_pos.col),
@@ -284,6 +321,11 @@ class BlueprintSpec2Validator(ValidationHandler):
         visitor = ExpressionValidationVisitor(self.tree)
         self.tree.accept(visitor)
 
+        for error in visitor.errors:
+            self._add_diagnostic(
+                start_pos=error.start_pos, end_pos=error.end_pos, message=error.message
+            )
+
         # warnings
         self._check_unused_blueprint_inputs()
 
@@ -18,42 +18,46 @@ from server.constants import (
 from server.utils.applications import ApplicationsManager as applications
 from server.utils.common import get_repo_root_path
 from server.utils.services import ServicesManager as services
-from server.validation.common import ValidationHandler
+from server.validation.common import LineScanner, ValidationHandler
 
 
 class BlueprintValidationHandler(ValidationHandler):
+    deprecated_properties = {
+        "availability": "bastion_availability",
+        "environmentType": None,
+    }
+    # deprecated syntax and the one to use instead
+    deprecated_syntax = {
+        "outputs\..+": "torque.[app_name|service_name].outputs.[output_name]",
+        "torque.sandboxid": "torque.environment.id",
+        "torque.publicaddress": "torque.environment.public_address",
+        "torque.virtualnetworkid": "torque.environment.virtual_network_id",
+    }
+    _syntax_scanner = LineScanner(
+        {
+            prop: "\\$\\{" + prop + "?\\}|\\$" + prop + "\\b"
+            for prop in deprecated_syntax
+        },
+        lower=True,
+    )
+
     def __init__(self, tree: BlueprintTree, document_path: str):
         self.blueprint_apps = [app.id.text for app in tree.get_applications()]
         self.blueprint_services = [srv.id.text for srv in tree.get_services()]
         super().__init__(tree, document_path)
 
     def _check_for_deprecated_syntax(self):
-        deprecated_syntax = {
-            "outputs\..+": "torque.[app_name|service_name].outputs.[output_name]",
-            "torque.sandboxid": "torque.environment.id",
-            "torque.publicaddress": "torque.environment.public_address",
-            "torque.virtualnetworkid": "torque.environment.virtual_network_id",
-        }
         message = "Deprecated syntax '{}'. Please use '{}' instead."
         line_num = 0
         for line in self._document.lines:
-            for prop in deprecated_syntax.keys():
-                for match in re.finditer(
-                    "^[^#\\n]*(\$\{" + prop + "?\}|\$" + prop + "\\b)", line.lower()
-                ):
-                    col = match.span(1)
-                    old_syntax = (
-                        match.group(1)
-                        .replace("$", "")
-                        .replace("{", "")
-                        .replace("}", "")
-                    )
-                    self._add_diagnostic(
-                        message=message.format(old_syntax, deprecated_syntax[prop]),
-                        start_pos=(line_num, col[0]),
-                        end_pos=(line_num, col[1]),
-                        diag_severity=DiagnosticSeverity.Warning,
-                    )
+            for prop, start, end, text in self._syntax_scanner.scan(line):
+                old_syntax = text.replace("$", "").replace("{", "").replace("}", "")
+                self._add_diagnostic(
+                    message=message.format(old_syntax, self.deprecated_syntax[prop]),
+                    start_pos=(line_num, start),
+                    end_pos=(line_num, end),
+                    diag_severity=DiagnosticSeverity.Warning,
+                )
 
             line_num += 1
 
@@ -97,6 +101,8 @@ class BlueprintValidationHandler(ValidationHandler):
 
     def _validate_non_existing_app_is_used(self):
         message = "The app '{}' could not be found in the /applications folder"
+        if applications.indexing:
+            return
         available_apps = applications.get_available_resources_names()
         for app in self._tree.get_applications():
             if app.id.text not in available_apps:
@@ -107,7 +113,7 @@ class BlueprintValidationHandler(ValidationHandler):
         available_apps = applications.get_available_resources()
         for app in self._tree.get_applications():
             if app.id.text in available_apps:
-                if available_apps[app.id.text]["tree"] is None:
+                if not available_apps[app.id.text]["valid"]:
                     self._add_diagnostic(app.id, message=message.format(app.id.text))
 
     def _validate_blueprint_resources_have_input_values(self):
@@ -128,6 +134,8 @@ class BlueprintValidationHandler(ValidationHandler):
 
     def _validate_non_existing_service_is_used(self):
         message = "The service '{}' could not be found in the /services folder"
+        if services.indexing:
+            return
         available_srvs = services.get_available_resources_names()
         for srv in self._tree.get_services():
             if srv.id.text not in available_srvs:
@@ -138,7 +146,7 @@ class BlueprintValidationHandler(ValidationHandler):
         available_srvs = services.get_available_resources()
         for srv in self._tree.get_services():
             if srv.id.text in available_srvs:
-                if available_srvs[srv.id.text]["tree"] is None:
+                if not available_srvs[srv.id.text]["valid"]:
                     self._add_diagnostic(srv.id, message=message.format(srv.id.text))
 
     def _validate_clouds_regions_are_valid(self):
@@ -152,7 +160,6 @@ class BlueprintValidationHandler(ValidationHandler):
     def _check_for_unused_blueprint_inputs(self):
         if self._tree.inputs:
             message = "Unused variable {}"
-            source = self._document.source
             # build a list of inputs used as "name only" to be matched with a blueprint input
             name_only_inputs = {}
 
@@ -167,22 +174,15 @@ class BlueprintValidationHandler(ValidationHandler):
                         name_only_inputs[var.key.text] = 1
             # search if used as a variable
             for input in self._tree.get_inputs():
-                if input.key.text not in name_only_inputs:
-                    found = re.findall(
-                        "^[^#\\n]*(\$\{"
-                        + input.key.text
-                        + "\}|\$"
-                        + input.key.text
-                        + "\\b)",
-                        source,
-                        re.MULTILINE,
+                if (
+                    input.key.text not in name_only_inputs
+                    and input.key.text not in self._variables.names
+                ):
+                    self._add_diagnostic(
+                        input.key,
+                        message=message.format(input.key.text),
+                        diag_severity=DiagnosticSeverity.Warning,
                     )
-                    if len(found) == 0:
-                        self._add_diagnostic(
-                            input.key,
-                            message=message.format(input.key.text),
-                            diag_severity=DiagnosticSeverity.Warning,
-                        )
 
     def _is_valid_auto_var(self, var_name):
         if var_name.lower() in PREDEFINED_TORQUE_INPUTS:
@@ -284,13 +284,10 @@ class BlueprintValidationHandler(ValidationHandler):
         # abcd/${some_var}/asfsd/${var2}
         # and highlight these portions
         message = "Variable '{}' is not defined"
-        regex = re.compile("(\$\{.+?\}|^\$.+?$)")
         try:
             if input.value:
-                iterator = regex.finditer(input.value.text)
-                for match in iterator:
-                    cur_var = match.group()
-                    pos = match.span()
+                for start, end, cur_var in self._variables.get_references(input.value):
+                    pos = (start, end)
                     if input.value.style:
                         pos = (pos[0] + 1, pos[1] + 1)
                     if cur_var.startswith("${") and cur_var.endswith("}"):
@@ -502,16 +499,12 @@ class BlueprintValidationHandler(ValidationHandler):
         try:
             # prep
             root_path = get_repo_root_path(self._document.path)
-            deprecated_properties = {
-                "availability": "bastion_availability",
-                "environmentType": None,
-            }
 
             _ = applications.get_available_resources(root_path)
             _ = services.get_available_resources(root_path)
             # warnings
             self._check_for_unused_blueprint_inputs()
-            self._check_for_deprecated_properties(deprecated_properties)
+            self._check_for_deprecated_properties()
             self._check_for_deprecated_syntax()
             # errors
             self._validate_default_value_in_possible_values()
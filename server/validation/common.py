@@ -1,5 +1,6 @@
+import functools
 import re
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from pygls.lsp.types.basic_structures import (
     Diagnostic,
@@ -9,13 +10,59 @@ from pygls.lsp.types.basic_structures import (
 )
 from pygls.workspace import Document
 from server.ats.trees.common import BaseTree, YamlNode
+from server.ats.variables import VariablesIndex
+
+
+class LineScanner:
+    """Finds rules in lines of documents, outside of comments.
+
+    Rules are regular expressions by name; for every rule found in a line
+    the scanner reports its last match before a comment. All the rules are
+    compiled into one alternation, so a line is scanned once and only the
+    lines it matches are checked rule by rule. Results are cached by line,
+    so lines which have not changed between edits are not scanned again.
+    """
+
+    def __init__(self, rules: Dict[str, str], lower: bool = False) -> None:
+        self._rules = [
+            (name, re.compile("^[^#\\n]*(" + pattern + ")"))
+            for name, pattern in rules.items()
+        ]
+        self._any = re.compile("|".join(f"(?:{pattern})" for pattern in rules.values()))
+        self._lower = lower
+        self.scan = functools.lru_cache(maxsize=4096)(self._scan)
+
+    def _scan(self, line: str) -> Tuple[Tuple[str, int, int, str], ...]:
+        """Returns the name, start, end and text of the matches in the line"""
+        if self._lower:
+            line = line.lower()
+        if not self._rules or self._any.search(line) is None:
+            return ()
+
+        matches = []
+        for name, rule in self._rules:
+            match = rule.match(line)
+            if match is not None:
+                matches.append((name, match.start(1), match.end(1), match.group(1)))
+        return tuple(matches)
 
 
 class ValidationHandler:
+    # deprecated properties and the ones to use instead, if any
+    deprecated_properties: Dict[str, Optional[str]] = {}
+
     def __init__(self, tree: BaseTree, document: Document) -> None:
         self._tree = tree
         self._diagnostics: List[Diagnostic] = []
         self._document = document
+        self._variables_index: Optional[VariablesIndex] = None
+
+    @property
+    def _variables(self) -> VariablesIndex:
+        # built once, on the first check using variables
+        if self._variables_index is None:
+            self._variables_index = VariablesIndex(self._tree)
+        return self._variables_index
 
     def _add_diagnostic(
         self,
@@ -96,26 +143,34 @@ class ValidationHandler:
                         output_node, message=message.format(output_node.text)
                     )
 
-    def _check_for_deprecated_properties(self, deprecated_properties):
+    @classmethod
+    def _get_properties_scanner(cls) -> LineScanner:
+        # compiled once per validator class
+        if "_properties_scanner" not in cls.__dict__:
+            cls._properties_scanner = LineScanner(
+                {prop: "\\b" + prop + "\\b:" for prop in cls.deprecated_properties}
+            )
+        return cls._properties_scanner
+
+    def _check_for_deprecated_properties(self):
         message_dep = "Deprecated property '{}'."
         message_replace = "Please use '{}' instead."
+        scanner = self._get_properties_scanner()
         line_num = 0
         for line in self._document.lines:
-            for prop in deprecated_properties.keys():
-                found = re.findall("^[^#\\n]*(\\b" + prop + "\\b:)", line)
-                if len(found) > 0:
-                    col = line.find(prop)
-                    message = message_dep.format(prop)
-                    if deprecated_properties[prop]:
-                        message += " " + message_replace.format(
-                            deprecated_properties[prop]
-                        )
-                    self._add_diagnostic(
-                        message=message,
-                        start_pos=(line_num, col),
-                        end_pos=(line_num, col + len(prop)),
-                        diag_severity=DiagnosticSeverity.Warning,
+            for prop, _, _, _ in scanner.scan(line):
+                col = line.find(prop)
+                message = message_dep.format(prop)
+                if self.deprecated_properties[prop]:
+                    message += " " + message_replace.format(
+                        self.deprecated_properties[prop]
                     )
+                self._add_diagnostic(
+                    message=message,
+                    start_pos=(line_num, col),
+                    end_pos=(line_num, col + len(prop)),
+                    diag_severity=DiagnosticSeverity.Warning,
+                )
             line_num += 1
 
     def validate(self):
@@ -1,5 +1,4 @@
 import logging
-import re
 import sys
 
 from pygls.lsp.types.basic_structures import DiagnosticSeverity
@@ -9,16 +8,16 @@ from server.validation.common import ValidationHandler
 
 
 class ServiceValidationHandler(ValidationHandler):
+    deprecated_properties = {"tfvars_file": "var_file under variables"}
+
     def validate(self):
         super().validate()
 
         try:
             # warnings
-            deprecated_properties = {"tfvars_file": "var_file under variables"}
-
             self._check_for_unused_service_inputs()
             self._validate_variables_file_exist()
-            self._check_for_deprecated_properties(deprecated_properties)
+            self._check_for_deprecated_properties()
 
         except Exception as ex:
             print(
@@ -37,7 +36,6 @@ class ServiceValidationHandler(ValidationHandler):
     def _check_for_unused_service_inputs(self):
         if self._tree.inputs:
             message = "Unused variable {}"
-            source = self._document.source
             name_only_var_values = []
 
             if self._tree.variables:
@@ -46,16 +44,10 @@ class ServiceValidationHandler(ValidationHandler):
                         name_only_var_values.append(var.key.text)
 
             for input in self._tree.get_inputs():
-                found = re.findall(
-                    "^[^#\\n]*(\$\{"
-                    + input.key.text
-                    + "\}|\$"
-                    + input.key.text
-                    + "\\b)",
-                    source,
-                    re.MULTILINE,
-                )
-                if len(found) == 0 and input.key.text not in name_only_var_values:
+                if (
+                    input.key.text not in self._variables.names
+                    and input.key.text not in name_only_var_values
+                ):
                     self._add_diagnostic(
                         input.key,
                         message=message.format(input.key.text),
@@ -0,0 +1,134 @@
+"""Micro-benchmark of the parser over the documents of the expected trees
+in tests/trees (demoapp_tree, no_indent and sleep_srv_tree).
+
+Run from the root of the repository:
+
+    python tests/benchmarks/bench_parser.py [--number N] [--repeat R]
+
+Prints the processed tokens per second when the tree is built from the
+already scanned tokens and when the whole document is parsed (scanning
+included). Every document is checked against its expected tree first.
+"""
+import argparse
+import os
+import sys
+import timeit
+from unittest import mock
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.dirname(TESTS_DIR), TESTS_DIR]
+
+from server.ats import yaml_loader  # noqa: E402
+from server.ats.parser import Parser  # noqa: E402
+from trees import demoapp_tree, no_indent, sleep_srv_tree  # noqa: E402
+
+FIXTURES = os.path.join(TESTS_DIR, "fixtures")
+
+
+def _read(*path):
+    with open(os.path.join(FIXTURES, *path), "r") as f:
+        return f.read()
+
+
+# documents (as in test_ast) and their expected trees
+DOCUMENTS = {
+    "demoapp": (
+        _read("applications", "demoapp-server", "demoapp-server.yaml"),
+        demoapp_tree.tree,
+    ),
+    "sleep-2": (_read("services", "sleep-2", "sleep-2.yaml"), sleep_srv_tree.tree),
+    "no_indent.simple": (
+        "kind: TerraForm\ninputs:\n- DURATION\n- PATH\nspec_version: 1",
+        no_indent.simple,
+    ),
+    "no_indent.no_indent_colon": (
+        "kind: TerraForm\ninputs:\n- DURATION:\nspec_version: 1",
+        no_indent.no_indent_colon,
+    ),
+    "no_indent.no_indent_inside_no_indent": (
+        """kind: blueprint
+applications:
+- basic-app:
+    instances: 1
+- advanced-app:
+    instances: 4
+    depends_on:
+    - basic-app
+spec_version: 1
+""",
+        no_indent.no_indent_inside_no_indent,
+    ),
+    "no_indent.empty_item_middle_no_indent": (
+        """kind: blueprint
+applications:
+- basic-app:
+    instances: 1
+-
+- advanced-app:
+spec_version: 1
+""",
+        no_indent.empty_item_middle_no_indent,
+    ),
+    "no_indent.app_no_indent_deep": (
+        """source:
+  image:
+    ami:
+    - id: ami-034a66a2fdb1a734e
+      region: eu-west-1
+      username: ubuntu
+    -
+    docker_image:
+    - name: quali/ubuntu
+      tag: elk624-python-2
+  os_type: linux
+kind: application
+spec_version: 1
+""",
+        no_indent.app_no_indent_deep,
+    ),
+}
+
+
+def _best(func, number, repeat):
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def main(argv=None):
+    args = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    args.add_argument("--number", type=int, default=200)
+    args.add_argument("--repeat", type=int, default=5)
+    opts = args.parse_args(argv)
+
+    print(f"{'document':<40}{'tokens':>8}{'build tok/s':>14}{'parse tok/s':>14}")
+    total_tokens = total_build = total_parse = 0
+    for name, (document, expected) in DOCUMENTS.items():
+        tokens = yaml_loader.scan(document)
+        tree_type = type(expected)
+
+        # scanning is replaced by the already scanned tokens
+        with mock.patch.object(yaml_loader, "scan", lambda document: tokens):
+            if Parser(document, root=tree_type()).parse() != expected:
+                raise AssertionError(f"Unexpected tree of '{name}'")
+            build = _best(
+                lambda: Parser(document, root=tree_type()).parse(),
+                opts.number,
+                opts.repeat,
+            )
+        parse = _best(lambda: Parser(document).parse(), opts.number, opts.repeat)
+
+        total_tokens += len(tokens)
+        total_build += build
+        total_parse += parse
+        print(
+            f"{name:<40}{len(tokens):>8}"
+            f"{len(tokens) / build:>14,.0f}{len(tokens) / parse:>14,.0f}"
+        )
+
+    print(
+        f"{'total':<40}{total_tokens:>8}"
+        f"{total_tokens / total_build:>14,.0f}{total_tokens / total_parse:>14,.0f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""Benchmark suite of the language server over synthetic documents (see
+generators.py): parsing, validation, the path to a position and the
+completions handler, for every kind of document.
+
+Run from the root of the repository:
+
+    python tests/benchmarks/bench_suite.py [--scale S] [--number N]
+        [--repeat R] [--output FILE] [--compare FILE] [--threshold T]
+
+Documents are written to a temporary repository, nothing is sent over
+the network. Completions are timed at the positions where they are
+returned, documents without such positions have no completions time.
+Prints the time of every operation and writes the results
+as JSON to --output. With --compare, operations slower than in the
+given results by more than the threshold are listed and the exit
+status is 1.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import timeit
+from typing import Callable, Dict, List
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.dirname(TESTS_DIR), os.path.dirname(os.path.abspath(__file__))]
+
+import generators  # noqa: E402
+from pygls.lsp.types import (  # noqa: E402
+    CompletionParams,
+    Position,
+    TextDocumentIdentifier,
+    TextDocumentItem,
+)
+from pygls.workspace import Workspace  # noqa: E402
+from server.ats import yaml_loader  # noqa: E402
+from server.ats.parser import Parser  # noqa: E402
+from server.server import TorqueLanguageServer, completions  # noqa: E402
+from server.utils.common import get_path_to_pos  # noqa: E402
+from server.utils.workers import THREAD_EXECUTOR  # noqa: E402
+from server.validation.factory import ValidatorFactory  # noqa: E402
+
+RESULTS_VERSION = 1
+# number of positions the path and completions are looked up at
+POSITIONS = 20
+
+
+def _best(func, number, repeat):
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def write_documents(root: str, scale: float) -> Dict[str, str]:
+    """Writes the benchmarked documents and returns their paths by name"""
+    size = max(1, int(20 * scale))
+    paths = generators.write_repo(
+        root,
+        applications=size,
+        services=size,
+        inputs=size,
+        resource_inputs=max(1, int(10 * scale)),
+        dependencies=3,
+    )
+
+    path = os.path.join(root, "blueprints", "generated-v2.yaml")
+    with open(path, "w") as f:
+        f.write(
+            generators.blueprint_v2(
+                grains=max(1, int(50 * scale)),
+                inputs=size,
+                expressions=4,
+                dependencies=3,
+            )
+        )
+    paths["blueprint_v2"] = path
+    return paths
+
+
+def _get_positions(source: str, count: int = POSITIONS) -> List[Position]:
+    # positions where values are typed (after the dot opening an
+    # expression, the $ of a variable or a colon) on lines spread
+    # over the document
+    lines = source.split("\n")[:-1]
+    step = max(1, len(lines) // count)
+    positions = []
+    for i in range(0, len(lines), step):
+        character = len(lines[i])
+        for marker in ("{{ .", "$", ": "):
+            index = lines[i].find(marker)
+            if index != -1:
+                character = index + len(marker)
+                break
+        positions.append(Position(line=i, character=character))
+
+    return positions[:count]
+
+
+def _get_completion_params(
+    server: TorqueLanguageServer, loop: asyncio.AbstractEventLoop, uri: str, source: str
+) -> List[CompletionParams]:
+    """Params of the completion requests at the positions of every line
+    where completions are returned, spread over the document"""
+    params = []
+    # positions where no completer applies log an error
+    logging.disable(logging.ERROR)
+    try:
+        for pos in _get_positions(source, count=source.count("\n") or 1):
+            p = CompletionParams(text_document=TextDocumentIdentifier(uri=uri), position=pos)
+            result = loop.run_until_complete(completions(server, p))
+            if result is not None and result.items:
+                params.append(p)
+    finally:
+        logging.disable(logging.NOTSET)
+
+    return params[:: max(1, len(params) // POSITIONS)][:POSITIONS]
+
+
+def _create_server(root: str, paths: Dict[str, str]) -> TorqueLanguageServer:
+    server = TorqueLanguageServer()
+    server.lsp.workspace = Workspace(f"file://{root}")
+    server.workers.configure(THREAD_EXECUTOR, 1)
+    for path in paths.values():
+        with open(path, "r") as f:
+            server.workspace.put_document(
+                TextDocumentItem(
+                    uri=f"file://{path}", language_id="yaml", version=1, text=f.read()
+                )
+            )
+    return server
+
+
+def run(scale: float, number: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    """Returns seconds per operation by document name and operation"""
+    results = {}
+
+    with tempfile.TemporaryDirectory() as root:
+        paths = write_documents(root, scale)
+        server = _create_server(root, paths)
+        loop = asyncio.new_event_loop()
+
+        for name, path in sorted(paths.items()):
+            document = server.workspace.get_document(f"file://{path}")
+            source = document.source
+            tree = Parser(source).parse()
+            positions = _get_positions(source)
+            params = _get_completion_params(server, loop, document.uri, source)
+
+            def validate():
+                # validators print some of the errors they catch
+                with contextlib.redirect_stdout(io.StringIO()):
+                    ValidatorFactory.get_validator(tree, document).validate()
+
+            def get_paths():
+                for pos in positions:
+                    get_path_to_pos(tree, pos)
+
+            async def complete():
+                for p in params:
+                    await completions(server, p)
+
+            operations: Dict[str, Callable[[], None]] = {
+                "parse": lambda: Parser(source).parse(),
+                "validate": validate,
+                "path_to_pos": get_paths,
+            }
+            if params:
+                operations["completions"] = lambda: loop.run_until_complete(complete())
+            # per call for the operations repeated at every position
+            calls = {"path_to_pos": len(positions), "completions": len(params)}
+
+            results[name] = {
+                "lines": source.count("\n"),
+                **{
+                    op: _best(func, number, repeat) / calls.get(op, 1)
+                    for op, func in operations.items()
+                },
+            }
+
+        loop.close()
+        server.workers.shutdown()
+
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+) -> List[str]:
+    """Returns the operations slower than in the baseline by more
+    than the threshold (a ratio)"""
+    regressions = []
+    for name, operations in results.items():
+        for op, seconds in operations.items():
+            base = baseline.get(name, {}).get(op)
+            if op == "lines" or not base:
+                continue
+            if seconds / base > threshold:
+                regressions.append(
+                    f"{name}.{op}: {base * 1000:.3f} ms -> {seconds * 1000:.3f} ms"
+                    f" ({seconds / base:.2f}x)"
+                )
+    return regressions
+
+
+def main(argv=None):
+    args = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    args.add_argument("--scale", type=float, default=1.0)
+    args.add_argument("--number", type=int, default=5)
+    args.add_argument("--repeat", type=int, default=5)
+    args.add_argument("--output", help="file the JSON results are written to")
+    args.add_argument("--compare", help="JSON results to compare with")
+    args.add_argument("--threshold", type=float, default=1.2)
+    opts = args.parse_args(argv)
+
+    # only the warnings and errors of the server are printed
+    logging.basicConfig(level=logging.WARNING)
+    results = run(opts.scale, opts.number, opts.repeat)
+
+    print(
+        f"{'document':<16}{'lines':>8}{'parse ms':>12}{'validate ms':>14}"
+        f"{'path ms':>10}{'complete ms':>14}"
+    )
+    for name, r in results.items():
+        complete = f"{r['completions'] * 1000:.3f}" if "completions" in r else "-"
+        print(
+            f"{name:<16}{r['lines']:>8}{r['parse'] * 1000:>12.3f}"
+            f"{r['validate'] * 1000:>14.3f}{r['path_to_pos'] * 1000:>10.3f}"
+            f"{complete:>14}"
+        )
+
+    if opts.output:
+        with open(opts.output, "w") as f:
+            json.dump(
+                {
+                    "version": RESULTS_VERSION,
+                    "python": platform.python_version(),
+                    "libyaml": yaml_loader.CFullLoader is not None,
+                    "scale": opts.scale,
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+
+    if opts.compare:
+        with open(opts.compare, "r") as f:
+            baseline = json.load(f)
+        if baseline.get("scale") != opts.scale:
+            print(f"Baseline was measured at scale {baseline.get('scale')}")
+        regressions = compare(results, baseline["results"], opts.threshold)
+        for regression in regressions:
+            print(f"Slower: {regression}")
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""Micro-benchmark of the YAML work done for every keystroke: a document is
+loaded and scanned once per version (see DocumentAnalysis).
+
+Run from the root of the repository:
+
+    python tests/benchmarks/bench_yaml.py [--number N] [--repeat R]
+
+Prints the time per keystroke with the pure Python loader of PyYAML and
+with server.ats.yaml_loader (libyaml when it is available).
+"""
+import argparse
+import glob
+import os
+import sys
+import timeit
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(TESTS_DIR))
+
+import yaml  # noqa: E402
+from server.ats import yaml_loader  # noqa: E402
+
+FIXTURES = os.path.join(TESTS_DIR, "fixtures")
+
+
+def python_keystroke(document):
+    yaml.load(document, Loader=yaml.FullLoader)
+    list(yaml.scan(document, Loader=yaml.FullLoader))
+
+
+def loader_keystroke(document):
+    yaml_loader.load(document)
+    yaml_loader.scan(document)
+
+
+def _best(func, number, repeat):
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def main(argv=None):
+    args = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    args.add_argument("--number", type=int, default=100)
+    args.add_argument("--repeat", type=int, default=5)
+    opts = args.parse_args(argv)
+
+    print(f"libyaml: {yaml_loader.CFullLoader is not None}")
+    print(f"{'document':<30}{'python ms':>12}{'loader ms':>12}{'speedup':>10}")
+    for path in sorted(glob.glob(os.path.join(FIXTURES, "**", "*.yaml"), recursive=True)):
+        with open(path, "r") as f:
+            document = f.read()
+
+        python = _best(lambda: python_keystroke(document), opts.number, opts.repeat)
+        loader = _best(lambda: loader_keystroke(document), opts.number, opts.repeat)
+        print(
+            f"{os.path.basename(path):<30}{python * 1000:>12.3f}"
+            f"{loader * 1000:>12.3f}{python / loader:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
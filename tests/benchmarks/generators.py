@@ -0,0 +1,220 @@
+"""Generators of synthetic Torque documents for the benchmarks.
+
+Documents only depend on the arguments, so results of different runs are
+comparable. Names are predictable: inputs are INPUT<i> (IN<i> in
+applications and services), applications app<i>, services srv<i> and
+grains grain<i>. write_repo() writes a blueprint with the applications
+and services it refers to in the layout of a blueprints repository.
+"""
+import os
+from typing import Dict, List
+
+
+def application(name: str = "app0", inputs: int = 10, ports: int = 5) -> str:
+    """Application (spec 1) with inputs used by its ports and compute"""
+    lines = ["spec_version: 1", "kind: application", "inputs:"]
+    lines += [f"  - IN{i}: value{i}" for i in range(inputs)]
+    lines += ["outputs:", f"  - {name}_url", "infrastructure:", "  connectivity:"]
+    lines.append("    internal:")
+    for i in range(ports):
+        lines += [
+            f"      - port{i}:",
+            f"          port: $IN{i % inputs}" if inputs else "          port: 80",
+            f"          path: /{name}/{i}",
+        ]
+    lines += [
+        "  compute:",
+        "    spec:",
+        "      aws:",
+        "        instance_type: t3.small",
+        "configuration:",
+        "  initialization:",
+        f"    script: {name}-init.sh",
+        "  start:",
+        f"    script: {name}-start.sh",
+        "  healthcheck:",
+        "    timeout: 1000",
+        f"    script: {name}-hc.sh",
+        "source:",
+        "  image:",
+        "    ami:",
+        "      - id: ami-0f2ed58082cb08a4d",
+        "        region: eu-west-1",
+        "  os_type: linux",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def service(name: str = "srv0", inputs: int = 10, outputs: int = 5) -> str:
+    """Terraform service (spec 1) passing all its inputs to the module"""
+    lines = ["spec_version: 1", "kind: TerraForm", "inputs:"]
+    lines += [f"  - IN{i}" for i in range(inputs)]
+    lines.append("outputs:")
+    lines += [f"  - out{i}" for i in range(outputs)]
+    lines += [
+        "module:",
+        f"  source: github.com/org/terraform-modules/{name}",
+        "terraform_version: 0.11.11",
+        "variables:",
+        "  values:",
+    ]
+    lines += [f"    - IN{i}: $IN{i}" for i in range(inputs)]
+    lines += ["permissions:", "  aws:", "    role_arn: PowerUserAccess"]
+    return "\n".join(lines) + "\n"
+
+
+def blueprint(
+    applications: int = 10,
+    services: int = 10,
+    inputs: int = 10,
+    resource_inputs: int = 5,
+    dependencies: int = 2,
+) -> str:
+    """Blueprint (spec 1) of applications and services taking their
+    input values from the blueprint inputs. Applications depend on the
+    first `dependencies` services, services on the preceding ones"""
+    lines = [
+        "spec_version: 1",
+        "kind: blueprint",
+        "metadata:",
+        "  description: Generated blueprint",
+        "clouds:",
+        "  - aws: eu-west-1",
+        "inputs:",
+    ]
+    for i in range(inputs):
+        if i % 2:
+            lines.append(f"  - INPUT{i}: default{i}")
+        else:
+            lines += [
+                f"  - INPUT{i}:",
+                "      display_style: normal",
+                f"      description: Input {i}",
+                f"      default_value: default{i}",
+            ]
+
+    def resource(i: int, is_app: bool) -> List[str]:
+        result = [f"  - {'app' if is_app else 'srv'}{i}:"]
+        if is_app:
+            result.append("      instances: 1")
+        if resource_inputs:
+            result.append("      input_values:")
+            for j in range(resource_inputs):
+                value = f"${{INPUT{(i + j) % inputs}}}" if inputs else f"value{j}"
+                result.append(f"        - IN{j}: {value}")
+        if is_app:
+            deps = range(min(dependencies, services))
+        else:
+            deps = range(max(0, i - dependencies), i)
+        if deps:
+            result.append("      depends_on:")
+            result += [f"        - srv{d}" for d in deps]
+        return result
+
+    if applications:
+        lines.append("applications:")
+        for i in range(applications):
+            lines += resource(i, is_app=True)
+    if services:
+        lines.append("services:")
+        for i in range(services):
+            lines += resource(i, is_app=False)
+    lines += ["debugging:", "  bastion_availability: enabled-on"]
+    return "\n".join(lines) + "\n"
+
+
+def blueprint_v2(
+    grains: int = 20,
+    inputs: int = 10,
+    expressions: int = 3,
+    dependencies: int = 2,
+    outputs: int = 3,
+) -> str:
+    """Blueprint (spec 2) of grains depending on up to `dependencies`
+    preceding grains. Every grain has `expressions` inputs referring to
+    blueprint inputs and outputs of the grains it depends on"""
+    lines = ["spec_version: 2", "description: Generated blueprint", "inputs:"]
+    for i in range(inputs):
+        lines += [f"  INPUT{i}:", "    type: string", f"    default: default{i}"]
+
+    lines.append("outputs:")
+    for i in range(min(grains, 5)):
+        lines.append(f"  url{i}:")
+        lines.append(f"    value: '{{{{ .grains.grain{i}.outputs.out0 }}}}'")
+
+    lines.append("grains:")
+    for i in range(grains):
+        deps = [f"grain{d}" for d in range(max(0, i - dependencies), i)]
+        helm = i % 2 == 1
+        lines += [f"  grain{i}:", f"    kind: {'helm' if helm else 'terraform'}"]
+        if deps:
+            lines.append(f"    depends-on: {', '.join(deps)}")
+        lines += [
+            "    spec:",
+            "      source:",
+            "        store: assets",
+            f"        path: grains/grain{i}",
+            "      host:",
+            "        name: eks",
+            "      inputs:",
+        ]
+        for j in range(expressions):
+            if deps and j % 2:
+                dep = deps[j % len(deps)]
+                value = f"{{{{ .grains.{dep}.outputs.out{j % outputs} }}}}"
+            elif inputs:
+                value = f"{{{{ .inputs.INPUT{(i + j) % inputs} | downcase }}}}"
+            else:
+                value = "{{ sandboxid }}"
+            lines.append(f"        - in{j}: '{value}'")
+        if outputs:
+            lines.append("      outputs:")
+            lines += [f"        - out{j}" for j in range(outputs)]
+        if helm:
+            lines += [
+                "      scripts:",
+                "        post-helm-install:",
+                "          source:",
+                "            store: assets",
+                "            path: scripts/post.sh",
+                "          outputs:",
+                "            - script_out",
+            ]
+    return "\n".join(lines) + "\n"
+
+
+def write_repo(
+    root: str,
+    applications: int = 10,
+    services: int = 10,
+    inputs: int = 10,
+    resource_inputs: int = 5,
+    dependencies: int = 2,
+) -> Dict[str, str]:
+    """Writes a blueprint (spec 1) and the applications (with their
+    scripts) and services it refers to under root. Returns the path of
+    a document of every kind"""
+    paths = {"blueprint": os.path.join(root, "blueprints", "generated.yaml")}
+    documents = {
+        paths["blueprint"]: blueprint(
+            applications, services, inputs, resource_inputs, dependencies
+        )
+    }
+
+    for i in range(applications):
+        path = os.path.join(root, "applications", f"app{i}", f"app{i}.yaml")
+        documents[path] = application(f"app{i}", resource_inputs)
+        for script in ("init", "start", "hc"):
+            documents[os.path.join(os.path.dirname(path), f"app{i}-{script}.sh")] = ""
+        paths.setdefault("application", path)
+    for i in range(services):
+        path = os.path.join(root, "services", f"srv{i}", f"srv{i}.yaml")
+        documents[path] = service(f"srv{i}", resource_inputs)
+        paths.setdefault("service", path)
+
+    for path, document in documents.items():
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(document)
+
+    return paths
@@ -0,0 +1,467 @@
+"""Replays an editing session against the language server started with
+`python -m server` over stdio and reports its latencies.
+
+Run from the root of the repository:
+
+    python tests/benchmarks/replay.py [--trace FILE] [--write-trace FILE]
+        [--bursts N] [--typing-delay S] [--speed X] [--settings JSON]
+        [--output FILE]
+
+The workspace is a repository of generated documents (see generators.py)
+written to a temporary folder. Without --trace a synthetic session is
+replayed: the blueprints are opened and lines are typed into them one
+character at a time, with completions requested after `{{ .` and `$`,
+code lenses requested after every line and a service changed on disk in
+between. --write-trace writes that session as a trace which can be
+edited and replayed with --trace.
+
+A trace has an event per line, the JSON object of one of:
+    {"at": S, "request": METHOD, "params": {...}}
+    {"at": S, "notify": METHOD, "params": {...}}
+    {"at": S, "write": PATH, "text": TEXT}
+where S is the number of seconds since the server was initialized and
+"{root}" in strings is replaced with the path of the workspace.
+
+Reported are the percentiles of the latency of every request method,
+the time from the last change of a document (or its opening) to the
+diagnostics published for it, and the resident memory of the server
+sampled during the session (Linux only). --output writes the results
+and the memory samples as JSON.
+"""
+import argparse
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROOT_DIR = os.path.dirname(TESTS_DIR)
+sys.path[:0] = [ROOT_DIR, os.path.dirname(os.path.abspath(__file__))]
+
+import generators  # noqa: E402
+from pygls.lsp.methods import (  # noqa: E402
+    CODE_LENS,
+    COMPLETION,
+    EXIT,
+    INITIALIZE,
+    INITIALIZED,
+    SHUTDOWN,
+    TEXT_DOCUMENT_DID_CHANGE,
+    TEXT_DOCUMENT_DID_OPEN,
+    TEXT_DOCUMENT_PUBLISH_DIAGNOSTICS,
+    WORKSPACE_CONFIGURATION,
+    WORKSPACE_DID_CHANGE_WATCHED_FILES,
+)
+
+DIAGNOSTICS = "diagnostics"
+RESULTS_VERSION = 1
+# seconds between samples of the memory of the server
+RSS_INTERVAL = 0.2
+# lines typed into the blueprints of spec 2 and spec 1, the cursor
+# stops after the text the completion is requested for
+V2_LINE = "        - typed{n}: '{{{{ .inputs.INPUT{n} | downcase }}}}'"
+V2_TRIGGER = "{{ ."
+V1_LINE = "        - IN{n}: ${{INPUT{n}}}"
+V1_TRIGGER = "$"
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Nearest-rank percentile of the values"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def _read_rss(pid: int) -> Optional[int]:
+    """Resident memory of the process in bytes"""
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+class Client:
+    """JSON-RPC client of the server process. Responses, diagnostics and
+    memory samples are collected by background threads. The server runs
+    in a temporary directory, where it writes its log"""
+
+    def __init__(self, settings: dict) -> None:
+        env = dict(os.environ, PYTHONPATH=ROOT_DIR)
+        self._cwd = tempfile.TemporaryDirectory()
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "server"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd=self._cwd.name,
+            env=env,
+        )
+        self.settings = settings
+        self.started = time.perf_counter()
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.rss: List[List[float]] = []
+        self.sent = 0
+
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._next_id = 0
+        # id -> (method, sent at, event set on response)
+        self._pending: Dict[int, tuple] = {}
+        # uri -> time of the last change not followed by diagnostics yet
+        self._changed: Dict[str, float] = {}
+        self._closed = threading.Event()
+
+        threading.Thread(target=self._read, daemon=True).start()
+        threading.Thread(target=self._sample_rss, daemon=True).start()
+
+    def request(self, method: str, params, wait: bool = False) -> None:
+        with self._lock:
+            self._next_id += 1
+            msg_id = self._next_id
+            done = threading.Event()
+            self._pending[msg_id] = (method, time.perf_counter(), done)
+        self._send({"jsonrpc": "2.0", "id": msg_id, "method": method, "params": params})
+        if wait:
+            done.wait()
+
+    def notify(self, method: str, params) -> None:
+        if method in (TEXT_DOCUMENT_DID_OPEN, TEXT_DOCUMENT_DID_CHANGE):
+            with self._lock:
+                self._changed[params["textDocument"]["uri"]] = time.perf_counter()
+        self._send({"jsonrpc": "2.0", "method": method, "params": params})
+
+    def wait(self, timeout: float) -> bool:
+        """Waits for the responses and the diagnostics of all the changes,
+        returns False on timeout"""
+        end = time.perf_counter() + timeout
+        while time.perf_counter() < end and not self._closed.is_set():
+            with self._lock:
+                if not self._pending and not self._changed:
+                    return True
+            time.sleep(0.01)
+        return False
+
+    def close(self) -> None:
+        self.request(SHUTDOWN, None, wait=True)
+        self.notify(EXIT, None)
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self._closed.set()
+        self._cwd.cleanup()
+
+    def _send(self, message: dict) -> None:
+        body = json.dumps(message).encode("utf-8")
+        # the reader thread answers the requests of the server
+        with self._write_lock:
+            self.process.stdin.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+            self.process.stdin.flush()
+            self.sent += 1
+
+    def _read(self) -> None:
+        stdout = self.process.stdout
+        while True:
+            length = None
+            while True:
+                line = stdout.readline()
+                if not line:
+                    self._closed.set()
+                    return
+                if not line.strip():
+                    break
+                name, _, value = line.decode("ascii").partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            if length is not None:
+                self._receive(json.loads(stdout.read(length)))
+
+    def _receive(self, message: dict) -> None:
+        now = time.perf_counter()
+        method = message.get("method")
+        if method is None:
+            with self._lock:
+                method, sent, done = self._pending.pop(message["id"])
+            self.latencies.setdefault(method, []).append(now - sent)
+            if "error" in message:
+                self.errors[method] = self.errors.get(method, 0) + 1
+            done.set()
+
+        elif "id" in message:
+            # requests of the server: progress tokens, registrations
+            # and the settings
+            result = [self.settings] if method == WORKSPACE_CONFIGURATION else None
+            self._send({"jsonrpc": "2.0", "id": message["id"], "result": result})
+
+        elif method == TEXT_DOCUMENT_PUBLISH_DIAGNOSTICS:
+            with self._lock:
+                changed = self._changed.pop(message["params"]["uri"], None)
+            if changed is not None:
+                self.latencies.setdefault(DIAGNOSTICS, []).append(now - changed)
+
+    def _sample_rss(self) -> None:
+        while not self._closed.is_set():
+            rss = _read_rss(self.process.pid)
+            if rss is None:
+                return
+            self.rss.append([round(time.perf_counter() - self.started, 3), rss])
+            time.sleep(RSS_INTERVAL)
+
+
+def write_workspace(root: str) -> Dict[str, str]:
+    """Writes the documents of the session and returns their paths by name"""
+    paths = generators.write_repo(root, applications=20, services=20, inputs=20)
+    paths["blueprint_v2"] = os.path.join(root, "blueprints", "generated-v2.yaml")
+    with open(paths["blueprint_v2"], "w") as f:
+        f.write(generators.blueprint_v2(grains=50, inputs=20, expressions=4))
+    return paths
+
+
+def _last_item(lines: List[str], header: str, prefix: str) -> int:
+    """Index of the last line starting with prefix in the block of lines
+    following the header"""
+    i = lines.index(header) + 1
+    while not lines[i].startswith(prefix):
+        i += 1
+    while i + 1 < len(lines) and lines[i + 1].startswith(prefix):
+        i += 1
+    return i
+
+
+def synthetic_trace(
+    root: str, paths: Dict[str, str], bursts: int, typing_delay: float
+) -> List[dict]:
+    """Events of a session typing into the blueprints. Paths are relative
+    to the {root} placeholder"""
+
+    def uri(path: str) -> str:
+        return "file://{root}/" + os.path.relpath(path, root)
+
+    def pos(line: int, character: int) -> dict:
+        return {"line": line, "character": character}
+
+    events = []
+    at = 0.5
+    documents = {}
+    for name in ("blueprint_v2", "blueprint"):
+        with open(paths[name], "r") as f:
+            text = f.read()
+        documents[name] = {"uri": uri(paths[name]), "lines": text.split("\n"), "version": 1}
+        events.append(
+            {
+                "at": at,
+                "notify": TEXT_DOCUMENT_DID_OPEN,
+                "params": {
+                    "textDocument": {
+                        "uri": documents[name]["uri"],
+                        "languageId": "yaml",
+                        "version": 1,
+                        "text": text,
+                    }
+                },
+            }
+        )
+        at += 1.0
+
+    service_path = paths["service"]
+    with open(service_path, "r") as f:
+        service = f.read()
+
+    for n in range(bursts):
+        if n % 2 == 0:
+            doc = documents["blueprint_v2"]
+            grain = n % 50
+            line = _last_item(doc["lines"], f"  grain{grain}:", "        - ")
+            text, trigger = V2_LINE.format(n=n), V2_TRIGGER
+        else:
+            doc = documents["blueprint"]
+            line = _last_item(doc["lines"], f"  - app{n % 20}:", "        - IN")
+            text, trigger = V1_LINE.format(n=n), V1_TRIGGER
+
+        # a new line after the last item, then its text a character at a time
+        changes = [(line, len(doc["lines"][line]), "\n")]
+        changes += [(line + 1, i, char) for i, char in enumerate(text)]
+        doc["lines"].insert(line + 1, text)
+
+        for row, column, char in changes:
+            doc["version"] += 1
+            events.append(
+                {
+                    "at": round(at, 3),
+                    "notify": TEXT_DOCUMENT_DID_CHANGE,
+                    "params": {
+                        "textDocument": {"uri": doc["uri"], "version": doc["version"]},
+                        "contentChanges": [
+                            {"range": {"start": pos(row, column), "end": pos(row, column)}, "text": char}
+                        ],
+                    },
+                }
+            )
+            at += typing_delay
+            if row == line + 1 and text[: column + 1].endswith(trigger):
+                events.append(
+                    {
+                        "at": round(at, 3),
+                        "request": COMPLETION,
+                        "params": {
+                            "textDocument": {"uri": doc["uri"]},
+                            "position": pos(row, column + 1),
+                        },
+                    }
+                )
+
+        at += 0.5
+        events.append(
+            {"at": round(at, 3), "request": CODE_LENS, "params": {"textDocument": {"uri": doc["uri"]}}}
+        )
+        at += 0.5
+
+        if n % 5 == 4:
+            service += f"  - typed{n}\n"
+            path = "{root}/" + os.path.relpath(service_path, root)
+            events.append({"at": round(at, 3), "write": path, "text": service})
+            events.append(
+                {
+                    "at": round(at, 3),
+                    "notify": WORKSPACE_DID_CHANGE_WATCHED_FILES,
+                    "params": {"changes": [{"uri": f"file://{path}", "type": 2}]},
+                }
+            )
+            at += 0.5
+
+    return events
+
+
+def _substitute(value, root: str):
+    if isinstance(value, str):
+        return value.replace("{root}", root)
+    if isinstance(value, list):
+        return [_substitute(v, root) for v in value]
+    if isinstance(value, dict):
+        return {k: _substitute(v, root) for k, v in value.items()}
+    return value
+
+
+def replay(
+    root: str, events: List[dict], settings: dict, speed: float, timeout: float
+) -> dict:
+    client = Client(settings)
+    client.request(
+        INITIALIZE,
+        {
+            "processId": os.getpid(),
+            "rootUri": f"file://{root}",
+            "capabilities": {"window": {"workDoneProgress": True}},
+            "initializationOptions": {},
+        },
+        wait=True,
+    )
+    client.notify(INITIALIZED, {})
+
+    start = time.perf_counter()
+    for event in events:
+        if speed:
+            delay = start + event["at"] / speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+        event = _substitute(event, root)
+        if "write" in event:
+            with open(event["write"], "w") as f:
+                f.write(event["text"])
+        elif "request" in event:
+            client.request(event["request"], event["params"])
+        else:
+            client.notify(event["notify"], event["params"])
+
+    replayed = time.perf_counter() - start
+    completed = client.wait(timeout)
+    elapsed = time.perf_counter() - start
+    client.close()
+
+    return {
+        "events": len(events),
+        "replay_seconds": replayed,
+        "total_seconds": elapsed,
+        "messages_per_second": client.sent / elapsed,
+        "completed": completed,
+        "errors": client.errors,
+        "latencies": {
+            method: {
+                "count": len(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99),
+                "max": max(values),
+            }
+            for method, values in sorted(client.latencies.items())
+        },
+        "rss": client.rss,
+    }
+
+
+def main(argv=None):
+    args = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    args.add_argument("--trace", help="trace to replay instead of the synthetic one")
+    args.add_argument("--write-trace", help="file the synthetic trace is written to")
+    args.add_argument("--bursts", type=int, default=10, help="lines typed")
+    args.add_argument(
+        "--typing-delay", type=float, default=0.08, help="seconds between characters"
+    )
+    args.add_argument(
+        "--speed", type=float, default=1.0, help="replay speed, 0 to not wait at all"
+    )
+    args.add_argument("--settings", default="{}", help="JSON of the torque settings")
+    args.add_argument("--timeout", type=float, default=60.0)
+    args.add_argument("--output", help="file the JSON results are written to")
+    opts = args.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as root:
+        paths = write_workspace(root)
+        if opts.trace:
+            with open(opts.trace, "r") as f:
+                events = [json.loads(line) for line in f if line.strip()]
+        else:
+            events = synthetic_trace(root, paths, opts.bursts, opts.typing_delay)
+        if opts.write_trace:
+            with open(opts.write_trace, "w") as f:
+                f.writelines(json.dumps(event) + "\n" for event in events)
+
+        results = replay(root, events, json.loads(opts.settings), opts.speed, opts.timeout)
+
+    print(f"{'method':<32}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for method, r in results["latencies"].items():
+        print(
+            f"{method:<32}{r['count']:>7}{r['p50'] * 1000:>10.1f}{r['p95'] * 1000:>10.1f}"
+            f"{r['p99'] * 1000:>10.1f}{r['max'] * 1000:>10.1f}"
+        )
+    print(
+        f"{results['events']} events replayed in {results['replay_seconds']:.1f} s, "
+        f"{results['messages_per_second']:.1f} messages/s"
+    )
+    if results["rss"]:
+        rss = [sample[1] / 2 ** 20 for sample in results["rss"]]
+        print(f"RSS: start {rss[0]:.1f} MB, max {max(rss):.1f} MB, end {rss[-1]:.1f} MB")
+    for method, count in results["errors"].items():
+        print(f"Errors: {method}: {count}")
+    if not results["completed"]:
+        print(f"Responses or diagnostics still pending after {opts.timeout} s")
+
+    if opts.output:
+        with open(opts.output, "w") as f:
+            json.dump({"version": RESULTS_VERSION, **results}, f, indent=2)
+
+    return 0 if results["completed"] and not results["errors"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+import asyncio
+import os
+import unittest
+from posixpath import dirname
+from unittest.mock import MagicMock
+
+import yaml
+from pygls.workspace import Document
+
+from server.ats.trees.service import ServiceTree
+from server.utils.analysis import AnalysisCache, DocumentAnalysis
+from server.utils.workers import THREAD_EXECUTOR, WorkerPools
+
+
+class TestAnalysisCache(unittest.TestCase):
+    def setUp(self) -> None:
+        path = os.path.join(
+            dirname(os.path.abspath(__file__)),
+            "fixtures",
+            "services",
+            "sleep-2",
+            "sleep-2.yaml",
+        )
+        with open(path, "r") as f:
+            self.source = f.read()
+
+        self.doc = MagicMock(uri="file:///sleep-2.yaml", version=1, source=self.source)
+        self.cache = AnalysisCache()
+        self.loop = asyncio.new_event_loop()
+        self.workers = WorkerPools(parser_executor=THREAD_EXECUTOR, max_workers=1)
+
+    def tearDown(self) -> None:
+        self.workers.shutdown()
+        self.loop.close()
+
+    def _get(self):
+        return self.loop.run_until_complete(self.cache.get_async(self.doc, self.workers))
+
+    def test_analysis_built_once_per_version(self):
+        analysis = self._get()
+
+        self.assertIsInstance(analysis.tree, ServiceTree)
+        self.assertEqual(analysis.kind, "TerraForm")
+        self.assertTrue(analysis.tokens)
+        self.assertIs(self._get(), analysis)
+
+        self.doc.version = 2
+        self.assertIsNot(self._get(), analysis)
+
+    def test_invalidate(self):
+        analysis = self._get()
+        self.cache.invalidate(self.doc.uri)
+
+        self.assertIsNot(self._get(), analysis)
+
+    def test_invalidate_while_building(self):
+        async def run():
+            build = asyncio.ensure_future(self.cache.get_async(self.doc, self.workers))
+            # the build waits for the worker
+            await asyncio.sleep(0)
+            self.cache.invalidate(self.doc.uri)
+            return await build
+
+        analysis = self.loop.run_until_complete(run())
+
+        # the closed document is not kept
+        self.assertIsInstance(analysis.tree, ServiceTree)
+        self.assertEqual(self.cache._analyses, {})
+        self.assertEqual(self.cache._locks, {})
+
+    def test_validation_releases_tree(self):
+        # validators read the document, which can't be a mock
+        doc = Document(self.doc.uri, source=self.source, version=1)
+
+        async def run():
+            analysis = await self.cache.get_async(doc, self.workers)
+            validation = asyncio.ensure_future(
+                self.cache.validate_async(analysis, doc, self.workers)
+            )
+            await asyncio.sleep(0)
+            self.assertEqual(analysis.readers, 1)
+            await validation
+            await asyncio.sleep(0)
+            return analysis
+
+        analysis = self.loop.run_until_complete(run())
+        self.assertEqual(analysis.readers, 0)
+
+    def test_ranged_change_reuses_tree(self):
+        tree = self._get().tree
+
+        self.doc.version = 2
+        self.doc.source = self.source.replace("hostname", "ip")
+        line = self.source.split("\n").index("  - hostname")
+        change = MagicMock()
+        change.range.start.line = line
+        change.range.end.line = line
+
+        self.cache.changed(self.doc.uri, [change])
+        analysis = self._get()
+
+        self.assertIs(analysis.tree, tree)
+        self.assertEqual(analysis.tree.get_outputs()[0].text, "ip")
+        self.assertIs(self._get(), analysis)
+
+    def test_changes_are_merged(self):
+        tree = self._get().tree
+        lines = self.source.split("\n")
+        line = lines.index("  - hostname")
+
+        # two edits before the analysis is requested again
+        first = MagicMock(text="\n  - ip")
+        first.range.start.line = line
+        first.range.end.line = line
+        second = MagicMock(text="port")
+        second.range.start.line = line + 1
+        second.range.end.line = line + 1
+        self.cache.changed(self.doc.uri, [first])
+        self.cache.changed(self.doc.uri, [second])
+
+        self.doc.version = 3
+        self.doc.source = "\n".join(lines[:line + 1] + ["  - port"] + lines[line + 1:])
+
+        analysis = self._get()
+
+        self.assertIs(analysis.tree, tree)
+        self.assertEqual(
+            [o.text for o in analysis.tree.get_outputs()], ["hostname", "port"]
+        )
+
+    def test_yaml_error(self):
+        analysis = DocumentAnalysis("file:///bad.yaml", 1, "kind: [TerraForm")
+
+        self.assertIsNone(analysis.tree)
+        self.assertIsNotNone(analysis.yaml_error)
+        self.assertEqual(len(analysis.validate(MagicMock())), 1)
+
+    def test_structure_error(self):
+        source = "kind: TerraForm\ninputs:\n  - DURATION\n spec_version: 1\n"
+        analysis = DocumentAnalysis("file:///bad.yaml", 1, source)
+
+        self.assertIsNone(analysis.header)
+        self.assertIsInstance(analysis.yaml_error, yaml.parser.ParserError)
+        self.assertEqual(analysis.yaml_error.problem_mark.line, 3)
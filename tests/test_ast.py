@@ -1,11 +1,24 @@
 import os
+import pickle
 import unittest
 from posixpath import dirname
 
-from server.ats.parser import Parser, ParserError
-from server.ats.trees.app import AppTree
-from server.ats.trees.blueprint import BlueprintTree
-from server.ats.trees.common import BaseTree
+from server.ats.parser import IncrementalParseError, Parser, ParserError
+from server.ats.trees.app import AppTree, PortInfoInternalNode
+from server.ats.trees.blueprint import (
+    ApplicationNode,
+    BlueprintFullInputNode,
+    BlueprintInputNode,
+    BlueprintTree,
+)
+from server.ats.trees.blueprint_v2 import GrainNode
+from server.ats.trees.common import (
+    _SLOTS_SUPPORTED,
+    BaseTree,
+    NodeError,
+    ScalarNode,
+    TextNode,
+)
 from server.ats.trees.service import ServiceTree
 from trees import (
     azuresimple_bp_tree,
@@ -16,7 +29,7 @@ from trees import (
 )
 
 
-class TestParser(unittest.TestCase):
+class ParserTestMixin:
     def setUp(self) -> None:
         self.test_dir = os.path.join((dirname(os.path.abspath(__file__))), "fixtures")
 
@@ -43,6 +56,8 @@ class TestParser(unittest.TestCase):
         tree = parser.parse()
         return tree
 
+
+class TestParser(ParserTestMixin, unittest.TestCase):
     def test_parser_resolve_tree_by_kind(self):
         cls_map = {
             "application": AppTree,
@@ -62,12 +77,95 @@ class TestParser(unittest.TestCase):
         with self.assertRaises(ParserError):
             _ = Parser(content)
 
+    def test_header_is_read_from_first_lines(self):
+        # the rest of the document is neither scanned nor read
+        doc = "spec_version: 1\nkind: TerraForm\ninputs: [\n"
+        self.assertEqual(
+            Parser.read_header(doc, []), {"spec_version": 1, "kind": "TerraForm"}
+        )
+
+        doc = "inputs:\n- PATH\nkind: TerraForm\nspec_version: 1"
+        self.assertIsInstance(Parser(doc).tree, ServiceTree)
+
     def test_parse_blueprint(self):
         doc = self._get_content("blueprints", "azure-simple")
         tree = self._parse(doc)
 
         self.assertEqual(tree, azuresimple_bp_tree.tree)
 
+    def test_tree_can_be_pickled(self):
+        doc = self._get_content("blueprints", "azure-simple")
+        tree = self._parse(doc)
+
+        self.assertEqual(pickle.loads(pickle.dumps(tree)), tree)
+
+    @unittest.skipUnless(_SLOTS_SUPPORTED, "nodes are slotted since Python 3.7")
+    def test_nodes_are_slotted(self):
+        doc = self._get_content("applications", "demoapp-server")
+        tree = self._parse(doc)
+
+        nodes = tree.get_children()
+        while nodes:
+            node = nodes.pop()
+            self.assertFalse(hasattr(node, "__dict__"), type(node))
+            nodes.extend(node.get_children())
+
+        port = tree.infrastructure.connectivity.internal.nodes[0].value
+        self.assertEqual(port.port.start_pos, (10, 10))
+        self.assertEqual(port.get_child("port"), port.port)
+
+    def test_node_schema(self):
+        schema = PortInfoInternalNode._schema
+
+        self.assertEqual(schema.attrs["port-range"], "port_range")
+        self.assertEqual(schema.attrs["port"], "port")
+        self.assertEqual(
+            schema.children, ("port", "path", "ingress_healthcheck", "port_range")
+        )
+        self.assertTrue(schema.allow_vars["port"])
+
+        schema = BlueprintInputNode._schema
+        self.assertIs(schema.resolve("value"), BlueprintFullInputNode)
+        self.assertIs(schema.resolve("value", TextNode), ScalarNode)
+        with self.assertRaises(ValueError):
+            ApplicationNode._schema.resolve("value", TextNode)
+
+    def test_errors_are_kept_by_tree(self):
+        doc = self._get_content("services", "sleep-2")
+        tree = self._parse(doc)
+
+        self.assertEqual(tree.errors, [])
+        self.assertFalse(hasattr(tree.kind, "errors"))
+
+        error = NodeError((0, 0), (0, 1), "error")
+        tree.kind.value.add_error(error)
+        self.assertEqual(tree.errors, [error])
+        self.assertIs(error.node, tree.kind.value)
+
+        copy = pickle.loads(pickle.dumps(tree))
+        self.assertEqual(copy.errors, [error])
+        self.assertIs(copy.errors[0].node, copy.kind.value)
+
+    def test_map_lookup_by_key(self):
+        doc = (
+            "spec_version: 2\n"
+            "grains:\n"
+            "  b:\n    kind: helm\n"
+            "  a:\n    kind: terraform\n"
+            "  b:\n    kind: terraform\n"
+        )
+        tree = self._parse(doc)
+
+        self.assertEqual(list(tree.get_grains_names()), ["b", "a"])
+        self.assertEqual(tree.get_grain("b").value.kind.text, "helm")
+        self.assertIsNone(tree.get_grain("c"))
+        self.assertEqual(list(tree.get_inputs_names()), [])
+
+        grain: GrainNode = tree.grains.value.add()
+        grain.get_key().text = "c"
+        self.assertIs(tree.get_grain("c"), grain)
+        self.assertEqual(pickle.loads(pickle.dumps(tree)).get_grain("c"), grain)
+
     def test_parse_app(self):
         doc = self._get_content("applications", "demoapp-server")
         tree = self._parse(doc)
@@ -212,3 +310,73 @@ spec_version: 1
         tree = self._parse(doc)
         self.assertEqual(len(tree.errors), 1)
         self.assertEqual(tree, no_child.no_child_object)
+
+
+class TestIncrementalParser(ParserTestMixin, unittest.TestCase):
+    def _edit(self, doc: str, line: int, old: str, new: str) -> str:
+        lines = doc.split("\n")
+        lines[line] = lines[line].replace(old, new)
+        return "\n".join(lines)
+
+    def _assert_reparse_equals_parse(self, doc: str, new_doc: str, start_line: int, end_line: int):
+        tree = self._parse(doc)
+        result = Parser.reparse(tree, doc, new_doc, start_line, end_line)
+
+        self.assertIs(result, tree)
+        self.assertEqual(result, self._parse(new_doc))
+        self.assertEqual(result.errors, self._parse(new_doc).errors)
+
+    def test_reparse_scalar_change(self):
+        doc = self._get_content("applications", "demoapp-server")
+        new_doc = self._edit(doc, 10, "$PORT", "${PORT}")
+
+        self._assert_reparse_equals_parse(doc, new_doc, 10, 10)
+
+    def test_reparse_shifts_following_nodes(self):
+        doc = self._get_content("applications", "demoapp-server")
+        lines = doc.split("\n")
+        new_doc = "\n".join(lines[:20] + ["    retries: 3", "    script: x.sh"] + lines[21:])
+
+        self._assert_reparse_equals_parse(doc, new_doc, 20, 20)
+
+    def test_reparse_keeps_errors_order(self):
+        doc = self._get_content("applications", "demoapp-server")
+        # unknown children before and after the edited block
+        doc = self._edit(doc, 12, "compute:", "computeE:")
+        doc = self._edit(doc, 28, "ami:", "amI:")
+        new_doc = self._edit(doc, 24, "timeout:", "timeOut:")
+
+        self._assert_reparse_equals_parse(doc, new_doc, 24, 24)
+        self.assertEqual(len(self._parse(new_doc).errors), 3)
+
+    def test_reparse_edit_at_the_end_of_document(self):
+        doc = self._get_content("services", "sleep-2").rstrip("\n")
+        lines = doc.split("\n")
+        new_doc = self._edit(doc, len(lines) - 1, "sleep-2", "sleep-3")
+
+        self._assert_reparse_equals_parse(doc, new_doc, len(lines) - 1, len(lines) - 1)
+
+    def test_reparse_renamed_map_key(self):
+        doc = "spec_version: 2\ngrains:\n  a:\n    kind: helm\n  b:\n    kind: helm\n"
+        new_doc = self._edit(doc, 4, "b:", "c:")
+        tree = self._parse(doc)
+        self.assertIsNotNone(tree.get_grain("b"))
+
+        Parser.reparse(tree, doc, new_doc, 4, 4)
+        self.assertIsNone(tree.get_grain("b"))
+        self.assertEqual(list(tree.get_grains_names()), ["a", "c"])
+
+    def test_reparse_fails_on_structure_change(self):
+        doc = self._get_content("applications", "demoapp-server")
+        tree = self._parse(doc)
+
+        with self.assertRaises(IncrementalParseError):
+            # top-level property
+            Parser.reparse(tree, doc, self._edit(doc, 0, "application", "app"), 0, 0)
+
+        with self.assertRaises(IncrementalParseError):
+            # indentation of the property is changed
+            Parser.reparse(tree, doc, self._edit(doc, 19, "  start:", "start:"), 19, 19)
+
+        with self.assertRaises(IncrementalParseError):
+            Parser.reparse(tree, doc, self._edit(doc, 10, "port:", "port: :"), 10, 10)
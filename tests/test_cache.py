@@ -0,0 +1,92 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from server.utils.cache import TTLCache
+
+
+class TestTTLCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.cache = TTLCache(ttl=10, max_stale=100)
+        self.calls = 0
+        self.now = 1000.0
+        self.clock = patch("server.utils.cache.monotonic", lambda: self.now)
+        self.clock.start()
+
+    def tearDown(self) -> None:
+        self.clock.stop()
+        self.loop.close()
+
+    async def _fetch(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return self.calls
+
+    def _get(self, key="env", **kwargs):
+        return self.loop.run_until_complete(self.cache.get(key, self._fetch, **kwargs))
+
+    def _settle(self):
+        self.loop.run_until_complete(asyncio.sleep(0.05))
+
+    def test_fresh_result_is_reused(self):
+        self.assertEqual(self._get(), 1)
+        self.now += 5
+        self.assertEqual(self._get(), 1)
+        self.assertEqual(self.calls, 1)
+
+    def test_stale_result_is_refreshed_in_background(self):
+        self._get()
+        self.now += 20
+
+        self.assertEqual(self._get(), 1)
+        self.assertEqual(self._get(), 1)
+        self._settle()
+
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(self._get(), 2)
+
+    def test_expired_result_is_fetched(self):
+        self._get()
+        self.now += 200
+
+        self.assertEqual(self._get(), 2)
+
+    def test_concurrent_requests_share_call(self):
+        async def get_all():
+            return await asyncio.gather(
+                *(self.cache.get("env", self._fetch) for _ in range(5))
+            )
+
+        self.assertEqual(self.loop.run_until_complete(get_all()), [1] * 5)
+        self.assertEqual(self.calls, 1)
+
+    def test_invalidate(self):
+        self._get("env")
+        self._get("bp")
+
+        self.cache.invalidate(lambda key: key == "env")
+
+        self.assertEqual(self._get("env"), 3)
+        self.assertEqual(self._get("bp"), 2)
+
+    def test_invalidated_call_is_not_stored(self):
+        async def invalidate_during_call():
+            call = asyncio.ensure_future(self.cache.get("env", self._fetch))
+            await asyncio.sleep(0)
+            self.cache.invalidate()
+            return await call
+
+        self.assertEqual(self.loop.run_until_complete(invalidate_during_call()), 1)
+        self.assertEqual(self._get(), 2)
+
+    def test_not_cacheable(self):
+        self._get(is_cacheable=lambda res: False)
+
+        self.assertEqual(self._get(), 2)
+
+    def test_disabled(self):
+        self.cache.ttl = 0
+        self._get()
+
+        self.assertEqual(self._get(), 2)
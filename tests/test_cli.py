@@ -0,0 +1,182 @@
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+
+from pygls.lsp.types import MessageType
+
+from server.utils.cli import (SUBPROCESS_EXECUTION, WORKER_EXECUTION,
+                              CliCommandTimeout, CliRunner, _run_module)
+
+COMMAND_MODULE = """
+import os
+import sys
+import time
+
+print(os.environ.get("TORQUE_TEST"), os.getcwd(), *sys.argv[1:])
+if "--sleep" in sys.argv:
+    time.sleep(10)
+if "--fail" in sys.argv:
+    sys.exit("bad arguments")
+"""
+
+
+class TestCliRunner(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        # child watcher of older versions needs the loop to be set
+        asyncio.set_event_loop(self.loop)
+        self.messages = []
+        self.runner = CliRunner(log=lambda msg, t: self.messages.append((msg, t)))
+
+    def tearDown(self) -> None:
+        asyncio.set_event_loop(None)
+        self.loop.close()
+
+    def _run(self, code: str, **kwargs):
+        return self.runner.run([sys.executable, "-c", code], **kwargs)
+
+    def test_output_is_returned_and_logged(self):
+        code = "import sys; print('first'); print('second'); print('oops', file=sys.stderr)"
+        stdout, stderr = self.loop.run_until_complete(self._run(code, log_output=True))
+
+        self.assertEqual(stdout.split(), ["first", "second"])
+        self.assertEqual(stderr.strip(), "oops")
+        self.assertIn(("first", MessageType.Info), self.messages)
+        self.assertIn(("second", MessageType.Info), self.messages)
+        self.assertIn(("oops", MessageType.Error), self.messages)
+
+    def test_long_line(self):
+        code = "print('x' * 200000)"
+        stdout, _ = self.loop.run_until_complete(self._run(code))
+
+        self.assertEqual(len(stdout.strip()), 200000)
+        self.assertEqual(self.messages, [])
+
+    def test_timeout(self):
+        self.runner.timeout = 0.2
+
+        with self.assertRaises(CliCommandTimeout):
+            self.loop.run_until_complete(self._run("import time; time.sleep(10)"))
+
+        self.assertEqual(self.runner.running, 0)
+
+    def test_cancel(self):
+        async def cancel():
+            task = asyncio.ensure_future(self._run("import time; time.sleep(10)"))
+            await asyncio.sleep(0.2)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            # let the killed process be reaped
+            await asyncio.sleep(0.1)
+
+        self.loop.run_until_complete(asyncio.wait_for(cancel(), 5))
+        self.assertEqual(self.runner.running, 0)
+
+    def test_concurrency_limit(self):
+        self.runner.configure(None, 2, SUBPROCESS_EXECUTION)
+        peak = []
+
+        async def run():
+            peak.append(self.runner.running)
+            await self._run("import time; time.sleep(0.1)")
+            peak.append(self.runner.running)
+
+        self.loop.run_until_complete(asyncio.gather(*(run() for _ in range(5))))
+
+        self.assertLessEqual(max(peak), 2)
+
+
+class TestCliRunnerWorker(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        # helper workers get the module path from the parent process
+        self.module_dir = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.module_dir.name, "torque_test_cmd.py"), "w") as f:
+            f.write(COMMAND_MODULE)
+        sys.path.insert(0, self.module_dir.name)
+        self.messages = []
+        self.runner = CliRunner(
+            log=lambda msg, t: self.messages.append((msg, t)), execution=WORKER_EXECUTION
+        )
+
+    def tearDown(self) -> None:
+        self.runner.shutdown()
+        sys.path.remove(self.module_dir.name)
+        self.module_dir.cleanup()
+        asyncio.set_event_loop(None)
+        self.loop.close()
+
+    def _run(self, module: str, args, **kwargs):
+        return self.loop.run_until_complete(
+            self.runner.run_module(module, args, **kwargs)
+        )
+
+    def test_helper_is_reused(self):
+        stdout, _ = self._run("torque_test_cmd", ["first"], log_output=True)
+        self.assertEqual(stdout.split()[-1], "first")
+        self.assertEqual(len(self.messages), 1)
+
+        helper = self.runner._helpers[0]
+        stdout, _ = self._run("torque_test_cmd", ["second"])
+        self.assertEqual(stdout.split()[-1], "second")
+        self.assertEqual(self.runner._helpers, [helper])
+
+    def test_exit_message(self):
+        _, stderr = self._run("torque_test_cmd", ["--fail"])
+
+        self.assertEqual(stderr.strip(), "bad arguments")
+        self.assertEqual(self.messages, [("bad arguments", MessageType.Error)])
+        self.assertEqual(len(self.runner._helpers), 1)
+
+    def test_env_and_cwd_are_isolated(self):
+        stdout, _ = self._run(
+            "torque_test_cmd", ["a", "b"], env={"TORQUE_TEST": "1"}, cwd="/"
+        )
+        self.assertEqual(stdout.split(), ["1", "/", "a", "b"])
+
+        stdout, _ = self._run("torque_test_cmd", [], env={})
+        self.assertEqual(stdout.split()[0], "None")
+
+    def test_run_module_restores_state(self):
+        argv, cwd = list(sys.argv), os.getcwd()
+
+        stdout, _ = _run_module("torque_test_cmd", ["x"], {"TORQUE_TEST": "2"}, "/")
+
+        self.assertEqual(stdout.split(), ["2", "/", "x"])
+        self.assertEqual(sys.argv, argv)
+        self.assertEqual(os.getcwd(), cwd)
+        self.assertNotIn("TORQUE_TEST", os.environ)
+
+    def test_dead_idle_helper_is_replaced(self):
+        self._run("torque_test_cmd", ["first"])
+        helper = self.runner._helpers[0]
+        helper.process.kill()
+        helper.process.join()
+
+        stdout, _ = self._run("torque_test_cmd", ["second"])
+
+        self.assertEqual(stdout.split()[-1], "second")
+        self.assertEqual(self.runner.execution, WORKER_EXECUTION)
+        self.assertEqual(len(self.runner._helpers), 1)
+        self.assertIsNot(self.runner._helpers[0], helper)
+        self.assertTrue(helper._conn.closed)
+
+    def test_timeout_stops_helper(self):
+        self.runner.timeout = 0.5
+
+        with self.assertRaises(CliCommandTimeout):
+            self._run("torque_test_cmd", ["--sleep"])
+
+        self.assertEqual(self.runner._helpers, [])
+
+    def test_subprocess_execution(self):
+        self.runner.configure(None, 2, SUBPROCESS_EXECUTION)
+        env = dict(os.environ, PYTHONPATH=self.module_dir.name)
+        stdout, _ = self._run("torque_test_cmd", ["first"], env=env)
+
+        self.assertEqual(stdout.split()[-1], "first")
+        self.assertEqual(self.runner._helpers, [])
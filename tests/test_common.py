@@ -0,0 +1,82 @@
+import os
+import unittest
+from posixpath import dirname
+
+from pygls.lsp.types import Position
+
+from server.ats.parser import Parser
+from server.utils.analysis import DocumentAnalysis
+from server.utils.common import (PositionIndex, get_nearest_text_key, get_path_to_pos,
+                                 is_var_allowed)
+
+FIXTURES = os.path.join(dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def visit(node, cursor, found=None):
+    """Reference lookup visiting the whole tree"""
+    if node.start_pos <= cursor <= node.end_pos:
+        found = node
+        for child in node.get_children():
+            found = visit(child, cursor, found)
+    return found
+
+
+class TestPositionIndex(unittest.TestCase):
+    def _read(self, *path):
+        with open(os.path.join(FIXTURES, *path), "r") as f:
+            return f.read()
+
+    def _check_all_positions(self, source):
+        tree = Parser(document=source).parse()
+        index = PositionIndex(tree)
+
+        for line, text in enumerate(source.split("\n")):
+            for col in range(len(text) + 2):
+                expected = visit(tree, (line, col))
+                path = index.get_path(Position(line=line, character=col))
+                self.assertIs(path[-1] if path else None, expected, (line, col))
+                if path:
+                    self.assertIs(path[0].parent, None)
+
+    def test_blueprint(self):
+        self._check_all_positions(self._read("blueprints", "azure-simple.yaml"))
+
+    def test_application(self):
+        self._check_all_positions(
+            self._read("applications", "demoapp-server", "demoapp-server.yaml")
+        )
+
+    def test_service(self):
+        self._check_all_positions(self._read("services", "sleep-2", "sleep-2.yaml"))
+
+    def test_analysis_reuses_index(self):
+        source = self._read("services", "sleep-2", "sleep-2.yaml")
+        analysis = DocumentAnalysis("file:///sleep-2.yaml", 1, source)
+        line = source.split("\n").index("  - hostname")
+        pos = Position(line=line, character=6)
+
+        path = analysis.get_path_to_pos(pos)
+
+        self.assertEqual(path[-1].text, "hostname")
+        self.assertIs(analysis.get_path_to_pos(pos)[-1], path[-1])
+        self.assertEqual(get_path_to_pos(analysis.tree, pos), path)
+        self.assertEqual(
+            is_var_allowed(analysis.tree, pos, path),
+            is_var_allowed(analysis.tree, pos),
+        )
+
+    def test_outside_of_tree(self):
+        tree = Parser(self._read("services", "sleep-2", "sleep-2.yaml")).parse()
+
+        self.assertEqual(get_path_to_pos(tree, Position(line=500, character=0)), [])
+
+
+class TestNearestTextKey(unittest.TestCase):
+    def test_no_key_in_path(self):
+        with open(os.path.join(FIXTURES, "blueprints", "azure-simple.yaml"), "r") as f:
+            tree = Parser(document=f.read()).parse()
+
+        # value of a cloud, neither the mapping nor its sequence has a key
+        pos = Position(line=2, character=18)
+        self.assertIsNone(get_nearest_text_key(get_path_to_pos(tree, pos), pos))
+        self.assertIsNone(get_nearest_text_key([], pos))
@@ -0,0 +1,107 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from posixpath import dirname
+
+from server.utils.applications import ApplicationsManager
+from server.utils.indexer import ResourceStore, index_resources
+from server.utils.services import ServicesManager
+
+PARSED = []
+
+
+async def parse(func, *args):
+    await asyncio.sleep(0)
+    PARSED.append(args[1])
+    return func(*args)
+
+
+class TestIndexResources(unittest.TestCase):
+    def setUp(self) -> None:
+        self.root = os.path.join(dirname(os.path.abspath(__file__)), "fixtures")
+        self.loop = asyncio.new_event_loop()
+        ApplicationsManager.cache.clear()
+        ServicesManager.cache.clear()
+        PARSED.clear()
+
+    def tearDown(self) -> None:
+        ApplicationsManager.cache.clear()
+        ServicesManager.cache.clear()
+        self.loop.close()
+
+    def _index(self, report=None, store=None):
+        return self.loop.run_until_complete(
+            index_resources(
+                self.root, [ApplicationsManager, ServicesManager], parse, report, store
+            )
+        )
+
+    def test_index(self):
+        reports = []
+        count = self._index(lambda done, total: reports.append((done, total)))
+
+        self.assertEqual(count, 2)
+        self.assertEqual(reports, [(1, 2), (2, 2)])
+        app = ApplicationsManager.cache["demoapp-server"]
+        self.assertTrue(app["valid"])
+        self.assertEqual(app["kind"], "application")
+        self.assertIn("instances: 1", app["completion"])
+        srv = ServicesManager.cache["sleep-2"]
+        self.assertEqual(srv["outputs"], ["hostname"])
+        self.assertEqual(ServicesManager.get_outputs("sleep-2"), ["hostname"])
+        self.assertFalse(ApplicationsManager.indexing)
+
+    def test_partial_index_is_served(self):
+        served = []
+
+        def report(done, total):
+            # resources are not loaded in the request while indexing
+            served.append(len(ApplicationsManager.get_available_resources(self.root)))
+            served.append(len(ServicesManager.get_available_resources(self.root)))
+
+        self._index(report)
+
+        self.assertEqual(sum(served[:2]), 1)
+        self.assertEqual(served[2:], [1, 1])
+
+    def test_loaded_resources_are_kept(self):
+        ServicesManager.cache["sleep-2"] = {"valid": False}
+
+        self.assertEqual(self._index(), 1)
+        self.assertFalse(ServicesManager.cache["sleep-2"]["valid"])
+        self.assertIn("demoapp-server", ApplicationsManager.cache)
+
+    def test_get_available_resources_without_index(self):
+        resources = ApplicationsManager.get_available_resources(self.root)
+
+        self.assertEqual(list(resources), ["demoapp-server"])
+        self.assertTrue(resources["demoapp-server"]["valid"])
+
+    def test_unchanged_files_are_not_parsed(self):
+        with tempfile.TemporaryDirectory() as storage:
+            store = ResourceStore(storage)
+            self._index(store=store)
+            self.assertEqual(sorted(PARSED), ["demoapp-server", "sleep-2"])
+            details = dict(ServicesManager.cache)
+
+            ApplicationsManager.cache.clear()
+            ServicesManager.cache.clear()
+            PARSED.clear()
+
+            self.assertEqual(self._index(store=store), 2)
+            self.assertEqual(PARSED, [])
+            self.assertEqual(ServicesManager.cache, details)
+
+            # the content is compared when the file looks modified
+            path = ServicesManager.find_resource_files(self.root)["sleep-2"]
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+            try:
+                ServicesManager.cache.clear()
+                self._index(store=store)
+            finally:
+                os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+            self.assertEqual(PARSED, ["sleep-2"])
+            self.assertEqual(ServicesManager.cache, details)
@@ -0,0 +1,83 @@
+import asyncio
+import os
+import pstats
+import tempfile
+import tracemalloc
+import unittest
+from posixpath import dirname
+
+from server.utils.analysis import build_analysis
+from server.utils.profiling import ProfilingSession
+from server.utils.workers import PROCESS_EXECUTOR, WorkerPools
+
+
+def _profiled_job():
+    return sum(range(100))
+
+
+class TestProfilingSession(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self) -> None:
+        self.loop.close()
+        self.directory.cleanup()
+
+    def _functions(self, path):
+        return {name for _, _, name in pstats.Stats(path).stats}
+
+    def test_worker_jobs_are_profiled(self):
+        path = os.path.join(
+            dirname(os.path.abspath(__file__)), "fixtures", "blueprints", "azure-simple.yaml"
+        )
+        with open(path, "r") as f:
+            source = f.read()
+
+        workers = WorkerPools(parser_executor=PROCESS_EXECUTOR, max_workers=1)
+        session = ProfilingSession(self.directory.name)
+        workers.profiling = session
+        session.start()
+        try:
+            # parsed in the thread pool while profiling
+            analysis = self.loop.run_until_complete(
+                workers.parse(build_analysis, "file:///bp.yaml", 1, source)
+            )
+            self.loop.run_until_complete(workers.run(_profiled_job))
+        finally:
+            paths = session.stop()
+            workers.shutdown()
+
+        self.assertEqual(analysis.kind, "blueprint")
+        self.assertEqual(paths, [os.path.join(self.directory.name, f"{session.name}.pstats")])
+        functions = self._functions(paths[0])
+        self.assertIn("_profiled_job", functions)
+        self.assertIn("build_analysis", functions)
+
+        # jobs after the session are not profiled
+        self.assertEqual(session.wrap(_profiled_job)(), 4950)
+        self.assertEqual(len(session._worker_profiles), 2)
+
+    def test_memory_snapshot(self):
+        was_tracing = tracemalloc.is_tracing()
+        session = ProfilingSession(self.directory.name, memory=True)
+        session.start()
+        data = [str(i) for i in range(1000)]
+        paths = session.stop()
+
+        self.assertEqual(len(data), 1000)
+        self.assertEqual(tracemalloc.is_tracing(), was_tracing)
+        self.assertEqual([os.path.splitext(p)[1] for p in paths], [".pstats", ".tracemalloc"])
+        snapshot = tracemalloc.Snapshot.load(paths[1])
+        self.assertTrue(snapshot.statistics("filename"))
+
+    def test_requests(self):
+        session = ProfilingSession(self.directory.name, requests=2)
+        self.assertFalse(session.request_done())
+        self.assertTrue(session.request_done())
+        self.assertFalse(ProfilingSession(self.directory.name).request_done())
+
+    def test_sessions_have_distinct_names(self):
+        first = ProfilingSession(self.directory.name)
+        second = ProfilingSession(self.directory.name)
+        self.assertNotEqual(first.name, second.name)
@@ -0,0 +1,45 @@
+import asyncio
+import unittest
+
+from server.utils.scheduler import DocumentScheduler
+
+
+class TestDocumentScheduler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.scheduler = DocumentScheduler(delay=0.01)
+        self.runs = []
+
+    def tearDown(self) -> None:
+        self.loop.close()
+
+    def _job(self, name: str):
+        async def job():
+            self.runs.append(name)
+
+        return job
+
+    def test_only_latest_job_runs(self):
+        async def run():
+            for i in range(5):
+                task = self.scheduler.schedule("file:///a.yaml", self._job(i))
+            self.scheduler.schedule("file:///b.yaml", self._job("b"))
+            await asyncio.sleep(0.05)
+            return task
+
+        task = self.loop.run_until_complete(run())
+
+        self.assertEqual(sorted(self.runs, key=str), [4, "b"])
+        self.assertTrue(task.done())
+        self.assertEqual(self.scheduler.pending, 0)
+
+    def test_cancel(self):
+        async def run():
+            self.scheduler.schedule("file:///a.yaml", self._job("a"), delay=0)
+            self.scheduler.cancel("file:///a.yaml")
+            await asyncio.sleep(0.01)
+
+        self.loop.run_until_complete(run())
+
+        self.assertEqual(self.runs, [])
+        self.assertFalse(self.scheduler.is_scheduled("file:///a.yaml"))
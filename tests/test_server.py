@@ -0,0 +1,80 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from pygls.lsp.types import MessageType
+from server.server import TorqueLanguageServer, _load_settings, start_profiling
+from server.utils.cli import CLI_TIMEOUT, SUBPROCESS_EXECUTION, WORKER_EXECUTION
+
+
+class TestLoadSettings(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.server = TorqueLanguageServer()
+
+    def tearDown(self) -> None:
+        self.server.workers.shutdown()
+        self.server.cli.shutdown()
+        self.loop.close()
+
+    def _load(self, settings):
+        async def get_configuration_async(params):
+            return [settings]
+
+        self.server.get_configuration_async = get_configuration_async
+        self.loop.run_until_complete(_load_settings(self.server))
+
+    def test_cli_timeout(self):
+        for value, timeout in (
+            (None, CLI_TIMEOUT),
+            ("60", CLI_TIMEOUT),
+            (True, CLI_TIMEOUT),
+            (-1, CLI_TIMEOUT),
+            (0, None),
+            (60, 60),
+            (0.5, 0.5),
+        ):
+            self._load({"cliTimeout": value})
+            self.assertEqual(self.server.cli.timeout, timeout, value)
+
+    def test_cli_execution(self):
+        self.assertEqual(self.server.cli.execution, WORKER_EXECUTION)
+        self._load({})
+        self.assertEqual(self.server.cli.execution, WORKER_EXECUTION)
+        self._load({"cliExecution": SUBPROCESS_EXECUTION})
+        self.assertEqual(self.server.cli.execution, SUBPROCESS_EXECUTION)
+
+
+class TestStartProfiling(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = TorqueLanguageServer()
+        self.server.show_message = MagicMock()
+
+    def tearDown(self) -> None:
+        self.server.stop_profiling()
+        self.server.workers.shutdown()
+
+    def test_invalid_arguments(self):
+        for arguments in (["10"], [-1], [True], [None, "5"], [None, -2], [float("nan")], [[1]]):
+            self.assertIsNone(start_profiling(self.server, arguments), arguments)
+            self.assertIsNone(self.server.profiling)
+            self.assertIsNone(self.server.workers.profiling)
+            self.assertEqual(self.server.show_message.call_args[0][1], MessageType.Error)
+
+    def test_start_command_is_not_counted(self):
+        self.server.show_message_log = MagicMock()
+        self.server.command(TorqueLanguageServer.CMD_START_PROFILING)(
+            start_profiling.__wrapped__
+        )
+        command = self.server.lsp.fm.commands[TorqueLanguageServer.CMD_START_PROFILING]
+
+        with tempfile.TemporaryDirectory() as directory:
+            with patch("server.server.get_log_directory", return_value=directory):
+                session = command([None, 1])
+            self.assertIsNotNone(self.server.profiling)
+
+            self.server._request_done()
+            self.assertIsNone(self.server.profiling)
+            self.assertEqual(os.listdir(directory), [f"{session['name']}.pstats"])
@@ -0,0 +1,106 @@
+import asyncio
+import inspect
+import json
+import unittest
+
+from server.utils.cache import TTLCache
+from server.utils.stats import Histogram, ServerStats
+
+
+class TestServerStats(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.stats = ServerStats()
+
+    def tearDown(self) -> None:
+        self.loop.close()
+
+    def test_histogram(self):
+        histogram = Histogram()
+        for ms in [0.5] * 90 + [30] * 9 + [3000]:
+            histogram.add(ms / 1000)
+
+        result = histogram.to_dict()
+        self.assertEqual(result["count"], 100)
+        self.assertEqual(result["p50_ms"], 1)
+        self.assertEqual(result["p95_ms"], 50)
+        self.assertEqual(result["p99_ms"], 50)
+        self.assertEqual(result["max_ms"], 3000)
+        self.assertEqual(result["histogram"], {"<=1ms": 90, "<=50ms": 9, "<=5000ms": 1})
+
+    def test_wrap(self):
+        def handler(ls, params):
+            if params is None:
+                raise ValueError()
+            return params
+
+        async def async_handler(ls, params):
+            await asyncio.sleep(0)
+            return params
+
+        wrapped = self.stats.wrap("sync", handler)
+        async_wrapped = self.stats.wrap("async", async_handler)
+
+        # pygls passes the server and awaits handlers by their signature
+        self.assertEqual(list(inspect.signature(wrapped).parameters), ["ls", "params"])
+        self.assertFalse(asyncio.iscoroutinefunction(wrapped))
+        self.assertTrue(asyncio.iscoroutinefunction(async_wrapped))
+
+        self.assertEqual(wrapped(None, 1), 1)
+        with self.assertRaises(ValueError):
+            wrapped(None, None)
+        self.assertEqual(self.loop.run_until_complete(async_wrapped(None, 2)), 2)
+
+        latencies = self.stats.snapshot()["latencies"]
+        self.assertEqual((latencies["sync"]["count"], latencies["sync"]["errors"]), (2, 1))
+        self.assertEqual((latencies["async"]["count"], latencies["async"]["errors"]), (1, 0))
+
+    def test_cancelled_call_is_not_an_error(self):
+        async def run():
+            task = asyncio.ensure_future(self.stats.wrap("slow", asyncio.sleep)(1))
+            await asyncio.sleep(0)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        self.loop.run_until_complete(run())
+        self.assertEqual(self.stats.latencies["slow"].count, 1)
+        self.assertEqual(self.stats.latencies["slow"].errors, 0)
+
+    def test_cancelled_timed_block_is_not_an_error(self):
+        async def timed():
+            with self.stats.timed("validation"):
+                await asyncio.sleep(1)
+
+        async def run():
+            task = asyncio.ensure_future(timed())
+            await asyncio.sleep(0)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        self.loop.run_until_complete(run())
+        # also when raised as on Python 3.7, where it is an Exception
+        with self.assertRaises(asyncio.CancelledError):
+            with self.stats.timed("validation"):
+                raise type("CancelledError", (asyncio.CancelledError, Exception), {})()
+
+        self.assertEqual(self.stats.latencies["validation"].count, 2)
+        self.assertEqual(self.stats.latencies["validation"].errors, 0)
+
+    def test_hit_ratios(self):
+        cache = TTLCache(ttl=10, stats=self.stats, name="listings")
+
+        async def fetch():
+            return 1
+
+        for key in ["a", "a", "a", "b"]:
+            self.loop.run_until_complete(cache.get(key, fetch))
+        self.stats.count("parse.incremental.miss")
+
+        snapshot = self.stats.snapshot({"validations_pending": 3})
+        self.assertEqual(
+            snapshot["counters"],
+            {"listings.hit": 2, "listings.miss": 2, "parse.incremental.miss": 1},
+        )
+        self.assertEqual(snapshot["hit_ratios"], {"listings": 0.5, "parse.incremental": 0.0})
+        self.assertEqual(snapshot["gauges"], {"validations_pending": 3})
+        json.dumps(snapshot)
@@ -29,9 +29,12 @@ from trees import (
     demoapp_tree,
     sleep_srv_tree,
 )
+from server.ats.parser import Parser
+from server.ats.variables import VariablesIndex
 from server.validation.app_validator import AppValidationHandler
+from server.validation.bp_v2_validator import ExpressionValidationVisitor
 from server.validation.bp_validatior import BlueprintValidationHandler
-from server.validation.common import ValidationHandler
+from server.validation.common import LineScanner, ValidationHandler
 from server.validation.factory import ValidatorFactory
 from server.validation.srv_validator import ServiceValidationHandler
 
@@ -63,11 +66,9 @@ class TestValidationFactory(unittest.TestCase):
                 value=ScalarNode(_text="1")
             ),
             kind=PropertyNode(
-                key=ScalarNode(
-                    start_pos=(0, 0), end_pos=(0, 4), errors=[], _text="kind"
-                ),
+                key=ScalarNode(start_pos=(0, 0), end_pos=(0, 4), _text="kind"),
                 value=ScalarNode(
-                    start_pos=(0, 6), end_pos=(0, 15), errors=[], _text="blueEprint"
+                    start_pos=(0, 6), end_pos=(0, 15), _text="blueEprint"
                 ),
             )
         )
@@ -76,6 +77,54 @@ class TestValidationFactory(unittest.TestCase):
             _ = ValidatorFactory.get_validator(tree, self.test_doc)
 
 
+class TestLineScanner(unittest.TestCase):
+    def test_scan(self):
+        scanner = LineScanner({"a": "\\ba\\b", "b": "b+"}, lower=True)
+
+        self.assertEqual(scanner.scan("x: A # a"), (("a", 3, 4, "a"),))
+        # the last match before a comment is reported
+        self.assertEqual(
+            scanner.scan("a b a bb # b"), (("a", 4, 5, "a"), ("b", 7, 8, "b"))
+        )
+        self.assertEqual(scanner.scan("# a b"), ())
+        self.assertEqual(scanner.scan("ab"), (("b", 1, 2, "b"),))
+
+        scanner.scan("x: A # a")
+        self.assertEqual(scanner.scan.cache_info().hits, 1)
+
+
+class TestVariablesIndex(unittest.TestCase):
+    def test_index(self):
+        doc = """spec_version: 1
+kind: TerraForm
+inputs:
+  - DURATION
+  - PATH
+module:
+  source: ${SOURCE}
+variables:
+  values:
+    - duration: $DURATION
+    - path: "a/${PATH}/$my-var.x"
+    - expr: "{{ .inputs.a }} {{.inputs.b | downcase}} {{ .grains.g }}"
+# $COMMENT
+"""
+        tree = Parser(doc).parse()
+        index = VariablesIndex(tree)
+
+        self.assertEqual(
+            index.names, {"SOURCE", "DURATION", "PATH", "my", "my-var"}
+        )
+        self.assertEqual(index.inputs, {"a", "b"})
+
+        values = tree.variables.value.values.value.nodes
+        self.assertEqual(
+            index.get_references(values[0].value), [(0, 9, "$DURATION")]
+        )
+        self.assertEqual(index.get_references(values[1].value), [(2, 9, "${PATH}")])
+        self.assertEqual(index.get_references(values[2].value), [])
+
+
 class TestValidationHandler(unittest.TestCase):
     def setUp(self) -> None:
         self.test_doc = MagicMock()
@@ -154,6 +203,36 @@ class TestValidationHandler(unittest.TestCase):
 
 
 class TestBlueprintValidationHandler(TestValidationHandler):
+    def test_check_for_deprecated(self):
+        self.test_doc.lines = [
+            "kind: blueprint\n",
+            "  availability: x # environmentType:\n",
+            "  value: ${Torque.SandboxId} # $outputs.a\n",
+            "  value: $outputs.a.b\n",
+        ]
+        validator = BlueprintValidationHandler(BlueprintTree(), self.test_doc)
+        validator._check_for_deprecated_properties()
+        validator._check_for_deprecated_syntax()
+        diags = validator._diagnostics
+
+        self.assertEqual(len(diags), 3)
+        self.assertEqual(
+            diags[0].message,
+            "Deprecated property 'availability'. Please use 'bastion_availability' instead.",
+        )
+        self.assertEqual(diags[0].range, self._get_range((1, 2), (1, 14)))
+        self.assertEqual(
+            diags[1].message,
+            "Deprecated syntax 'torque.sandboxid'. Please use 'torque.environment.id' instead.",
+        )
+        self.assertEqual(diags[1].range, self._get_range((2, 9), (2, 28)))
+        self.assertEqual(
+            diags[2].message,
+            "Deprecated syntax 'outputs.a.b'. "
+            "Please use 'torque.[app_name|service_name].outputs.[output_name]' instead.",
+        )
+        self.assertEqual(diags[2].range, self._get_range((3, 9), (3, 21)))
+
     def test_validate_default_value_not_in_possible_values_list(self):
         wrong_value = "ba"
 
@@ -291,3 +370,60 @@ class TestBlueprintValidationHandler(TestValidationHandler):
                         self._get_range((9, 10), (9, 15)),
                     ]
                 )
+
+
+class TestExpressionValidationVisitor(unittest.TestCase):
+    def test_expressions(self):
+        doc = """spec_version: 2
+inputs:
+  size:
+    type: string
+outputs:
+  url:
+    value: '{{ .grains.web.outputs.url }} {{ .grains.none.outputs.url }}'
+grains:
+  db:
+    kind: helm
+    spec:
+      source:
+        path: db
+      outputs:
+        - host
+      scripts:
+        post-helm-install:
+          source:
+            path: s
+          outputs:
+            - port
+  web:
+    kind: helm
+    depends-on: db
+    spec:
+      source:
+        path: web
+      inputs:
+        - host: '{{ .grains.db.outputs.host }}:{{ .grains.db.scripts.post-helm-install.outputs.port }}'
+        - same: '{{ .grains.db.outputs.host }} {{ .grains.db.outputs.user }}'
+        - size: '{{ .inputs.size | downcase }} {{ .inputs.other }} {{ .grains.web.outputs.url }}'
+        - other: '{{ .grains.db.scripts.post-helm-install }}'
+      outputs:
+        - url
+"""
+        tree = Parser(doc).parse()
+        visitor = ExpressionValidationVisitor(tree)
+        tree.accept(visitor)
+
+        self.assertEqual(
+            [(e.start_pos, e.end_pos, e.message) for e in visitor.errors],
+            [
+                ((6, 42), (6, 72), "Grain 'none' is not defined"),
+                (
+                    (29, 47),
+                    (29, 76),
+                    "Output 'user' is not part of the 'db' grain's outputs",
+                ),
+                ((30, 47), (30, 66), "Input 'other' is not defined in a blueprint"),
+                ((30, 67), (30, 96), "Grain cannot refer to itself"),
+                ((31, 18), (31, 60), "Incomplete expression"),
+            ],
+        )
@@ -0,0 +1,42 @@
+import asyncio
+import os
+import unittest
+from posixpath import dirname
+
+from server.utils.analysis import DocumentAnalysis, build_analysis
+from server.utils.workers import PROCESS_EXECUTOR, THREAD_EXECUTOR, WorkerPools
+
+
+class TestWorkerPools(unittest.TestCase):
+    def setUp(self) -> None:
+        path = os.path.join(
+            dirname(os.path.abspath(__file__)), "fixtures", "blueprints", "azure-simple.yaml"
+        )
+        with open(path, "r") as f:
+            self.source = f.read()
+
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self) -> None:
+        self.loop.close()
+
+    def _parse(self, executor: str) -> DocumentAnalysis:
+        workers = WorkerPools(parser_executor=executor, max_workers=1)
+        try:
+            return self.loop.run_until_complete(
+                workers.parse(build_analysis, "file:///bp.yaml", 1, self.source)
+            )
+        finally:
+            workers.shutdown()
+
+    def test_parse_in_threads(self):
+        analysis = self._parse(THREAD_EXECUTOR)
+        self.assertEqual(analysis.tree, DocumentAnalysis("", 1, self.source).tree)
+
+    def test_parse_in_processes(self):
+        analysis = self._parse(PROCESS_EXECUTOR)
+
+        self.assertEqual(analysis.tree, DocumentAnalysis("", 1, self.source).tree)
+        self.assertEqual(analysis.kind, "blueprint")
+        # tokens are not sent back from the process and scanned on demand
+        self.assertTrue(analysis.tokens)
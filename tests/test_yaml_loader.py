@@ -0,0 +1,175 @@
+import glob
+import io
+import os
+import unittest
+from posixpath import dirname
+from unittest import mock
+
+import yaml
+from server.ats import yaml_loader
+
+FIXTURES = os.path.join(dirname(os.path.abspath(__file__)), "fixtures")
+
+DOCUMENTS = [
+    "a:\n- x\n-\n- y\nb: 1",
+    "a: 'x'\nb: \"y\"\nc: |\n  line1\n  line2\nd: >-\n  folded\n",
+    "# comment\nkey: value # trailing\nlist: [1, 2, {a: b}]\nempty:",
+    "uni: héllo ✓ 😀\r\nnext: $VAR\r\n  ",
+    "k:\n  - a\n  -",
+    "",
+]
+
+
+def marks(tokens):
+    return [
+        (
+            type(t),
+            (t.start_mark.line, t.start_mark.column, t.start_mark.index),
+            (t.end_mark.line, t.end_mark.column, t.end_mark.index),
+            getattr(t, "value", None),
+            getattr(t, "style", None),
+        )
+        for t in tokens
+    ]
+
+
+class TestYamlLoader(unittest.TestCase):
+    def setUp(self) -> None:
+        self.documents = list(DOCUMENTS)
+        for path in glob.glob(os.path.join(FIXTURES, "**", "*.yaml"), recursive=True):
+            with open(path, "r") as f:
+                self.documents.append(f.read())
+
+    @unittest.skipIf(yaml_loader.CFullLoader is None, "libyaml is not available")
+    def test_tokens_match_python_scanner(self):
+        for doc in self.documents:
+            expected = list(yaml.scan(doc, Loader=yaml.FullLoader))
+            self.assertEqual(marks(yaml_loader.scan(doc)), marks(expected), doc)
+
+    def test_load(self):
+        for doc in self.documents:
+            expected = yaml.load(doc, Loader=yaml.FullLoader)
+            self.assertEqual(yaml_loader.load(doc), expected)
+            self.assertEqual(yaml_loader.load(io.StringIO(doc)), expected)
+
+    def test_errors_of_python_scanner(self):
+        for doc in ["a: b: c\n", "'unterminated\n"]:
+            with self.assertRaises(yaml.MarkedYAMLError) as expected:
+                yaml.load(doc, Loader=yaml.FullLoader)
+
+            with self.assertRaises(yaml.MarkedYAMLError) as scan_error:
+                yaml_loader.scan(doc)
+            with self.assertRaises(yaml.MarkedYAMLError) as load_error:
+                yaml_loader.load(doc)
+
+            self.assertEqual(str(load_error.exception), str(expected.exception))
+            self.assertEqual(str(scan_error.exception), str(expected.exception))
+
+    def test_first_error_of_the_stream(self):
+        # errors of the parser or the composer before an error of the scanner
+        for doc in [
+            "a:\n  - b\n c: d\ne: 'unterminated\n",
+            "a: *x\nb: 'unterminated\n",
+            "a: &x 1\nb: &x 2\nc: 'unterminated\n",
+            "a: 1\n---\nb: 'unterminated\n",
+        ]:
+            with self.assertRaises(yaml.MarkedYAMLError) as expected:
+                yaml.load(doc, Loader=yaml.FullLoader)
+
+            for c_loader in [yaml_loader.CFullLoader, None]:
+                with mock.patch.object(yaml_loader, "CFullLoader", c_loader):
+                    with self.assertRaises(yaml.MarkedYAMLError) as error:
+                        yaml_loader.check(doc, yaml_loader.scan(doc))
+
+                self.assertEqual(type(error.exception), type(expected.exception))
+                self.assertEqual(str(error.exception), str(expected.exception))
+
+    def test_tabs(self):
+        # accepted by libyaml, not by the Python scanner
+        doc = "key: a\tb\nclo\tuds: x\n"
+        with self.assertRaises(yaml.MarkedYAMLError) as expected:
+            yaml.load(doc, Loader=yaml.FullLoader)
+
+        with self.assertRaises(yaml.MarkedYAMLError) as error:
+            yaml_loader.scan(doc)
+        self.assertEqual(str(error.exception), str(expected.exception))
+        with self.assertRaises(yaml.MarkedYAMLError):
+            yaml_loader.load(doc)
+
+        # tabs are allowed in quoted scalars and comments
+        doc = "key: 'a\tb' # x\ty\n"
+        self.assertEqual(
+            marks(yaml_loader.scan(doc)), marks(yaml.scan(doc, Loader=yaml.FullLoader))
+        )
+        self.assertEqual(yaml_loader.load(doc), {"key": "a\tb"})
+
+    def test_without_libyaml(self):
+        doc = self.documents[0]
+        with mock.patch.object(yaml_loader, "CFullLoader", None):
+            self.assertEqual(
+                marks(yaml_loader.scan(doc)),
+                marks(yaml.scan(doc, Loader=yaml.FullLoader)),
+            )
+            self.assertEqual(yaml_loader.load(doc), {"a": ["x", None, "y"], "b": 1})
+
+    def test_check(self):
+        invalid = [
+            "a:\n  - b\n c: d\n",
+            "key: [a, b\n",
+            "a: *x\n",
+            "a: &x 1\nb: &x 2\n",
+            "a: 1\n---\nb: 2\n",
+        ]
+        for doc in self.documents:
+            yaml_loader.check(doc, yaml_loader.scan(doc))
+
+        for doc in invalid:
+            with self.assertRaises(yaml.MarkedYAMLError) as expected:
+                yaml.load(doc, Loader=yaml.FullLoader)
+
+            for c_loader in [yaml_loader.CFullLoader, None]:
+                with mock.patch.object(yaml_loader, "CFullLoader", c_loader):
+                    with self.assertRaises(yaml.MarkedYAMLError) as error:
+                        yaml_loader.check(doc, yaml_loader.scan(doc))
+
+                self.assertEqual(type(error.exception), type(expected.exception))
+                self.assertEqual(str(error.exception), str(expected.exception))
+
+    def test_read_header(self):
+        for doc in self.documents:
+            obj = yaml.load(doc, Loader=yaml.FullLoader)
+            if not isinstance(obj, dict):
+                continue
+
+            expected = {k: v for k, v in obj.items() if not isinstance(v, (dict, list))}
+            self.assertEqual(yaml_loader.read_header(yaml_loader.scan(doc)), expected)
+
+        doc = "kind: x\nkind: [a]\nspec_version: '1'\nv: &a 2\nw: *a\nempty:\n"
+        self.assertEqual(
+            yaml_loader.read_header(yaml_loader.scan(doc)),
+            {"spec_version": "1", "empty": None},
+        )
+        self.assertEqual(yaml_loader.read_header(yaml_loader.scan("- kind: x\n")), {})
+
+    def test_read_header_lines(self):
+        doc = "# header\nspec_version: 1 # v1\n\nkind: 'blueprint'\nclouds:\n  - a\nlast: 1\n"
+        self.assertEqual(
+            yaml_loader.read_header_lines(doc), {"spec_version": 1, "kind": "blueprint"}
+        )
+        self.assertEqual(
+            yaml_loader.read_header_lines("spec_version: 2-preview\r\nflag: yes"),
+            {"spec_version": "2-preview", "flag": True},
+        )
+        # plain values may continue on the next indented line
+        self.assertEqual(
+            yaml_loader.read_header_lines("spec_version: 1\nkind: app\n\n  lication\n"),
+            {"spec_version": 1},
+        )
+        self.assertEqual(yaml_loader.read_header_lines("---\nkind: blueprint\n"), {})
+
+        # '#' starts a comment only after a space
+        for doc in ["key: value#x\n", "key: value #x\n", "key: value  # x  \n"]:
+            expected = yaml.load(doc, Loader=yaml.FullLoader)
+            self.assertEqual(
+                yaml_loader.read_header_lines(doc).get("key"), expected["key"], doc
+            )
@@ -17,17 +17,15 @@ no_child_simple = BlueprintTree(
         start_pos=(0, 0),
         end_pos=(1, 0),
         parent=...,
-        errors=[],
         key=ScalarNode(
-            start_pos=(0, 0), end_pos=(0, 4), parent=..., errors=[], _text="kind"
+            start_pos=(0, 0), end_pos=(0, 4), parent=..., _text="kind"
         ),
         value=ScalarNode(
             start_pos=(0, 6),
             end_pos=(0, 15),
             parent=ScalarNode(
-                start_pos=(0, 0), end_pos=(0, 4), parent=..., errors=[], _text="kind"
+                start_pos=(0, 0), end_pos=(0, 4), parent=..., _text="kind"
             ),
-            errors=[],
             _text="blueprint",
         ),
     ),
@@ -35,12 +33,10 @@ no_child_simple = BlueprintTree(
         start_pos=(2, 0),
         end_pos=(3, 0),
         parent=...,
-        errors=[],
         key=ScalarNode(
             start_pos=(2, 0),
             end_pos=(2, 12),
             parent=...,
-            errors=[],
             _text="spec_version",
         ),
         value=ScalarNode(
@@ -50,10 +46,8 @@ no_child_simple = BlueprintTree(
                 start_pos=(2, 0),
                 end_pos=(2, 12),
                 parent=...,
-                errors=[],
                 _text="spec_version",
             ),
-            errors=[],
             _text="1",
         ),
     ),
@@ -84,17 +78,15 @@ no_child_object = BlueprintTree(
         start_pos=(0, 0),
         end_pos=(1, 0),
         parent=...,
-        errors=[],
         key=ScalarNode(
-            start_pos=(0, 0), end_pos=(0, 4), parent=..., errors=[], _text="kind"
+            start_pos=(0, 0), end_pos=(0, 4), parent=..., _text="kind"
         ),
         value=ScalarNode(
             start_pos=(0, 6),
             end_pos=(0, 15),
             parent=ScalarNode(
-                start_pos=(0, 0), end_pos=(0, 4), parent=..., errors=[], _text="kind"
+                start_pos=(0, 0), end_pos=(0, 4), parent=..., _text="kind"
             ),
-            errors=[],
             _text="blueprint",
         ),
     ),
@@ -102,12 +94,10 @@ no_child_object = BlueprintTree(
         start_pos=(6, 0),
         end_pos=(7, 0),
         parent=...,
-        errors=[],
         key=ScalarNode(
             start_pos=(6, 0),
             end_pos=(6, 12),
             parent=...,
-            errors=[],
             _text="spec_version",
         ),
         value=ScalarNode(
@@ -117,10 +107,8 @@ no_child_object = BlueprintTree(
                 start_pos=(6, 0),
                 end_pos=(6, 12),
                 parent=...,
-                errors=[],
                 _text="spec_version",
             ),
-            errors=[],
             _text="1",
         ),
     ),